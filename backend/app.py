@@ -1,16 +1,20 @@
 import os
+from datetime import datetime
 from flask import Flask
 from flask_cors import CORS
 from flask_compress import Compress
 from core.config import UPLOAD_FOLDER, MAX_CONTENT_LENGTH, SECRET_KEY, DB_NAME
 from core.extensions import scheduler, logger
-from database import init_db, cleanup_expired_uploads
+from core.metrics import init_metrics
+from core.profiling import init_profiling
+from database import init_db, cleanup_expired_uploads, sync_aerodrome_warnings
 
 from features.map import map_bp
 from features.dashboard import dashboard_bp, configure_rvr_scheduler
 from features.notam import notam_bp, configure_notam_scheduler
 from features.ogimet import ogimet_bp, configure_scheduler
 from features.documents.routes import documents_bp
+from features.common.ocr_jobs import ocr_jobs
 
 def create_app():
     app = Flask(__name__, 
@@ -27,6 +31,8 @@ def create_app():
     ]
     Compress(app)
     CORS(app)
+    init_metrics(app)
+    init_profiling(app)
 
     app.secret_key = SECRET_KEY
     app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
@@ -56,6 +62,20 @@ def create_app():
                 id='cleanup_uploads',
                 replace_existing=True
             )
+
+        ocr_jobs.resume()
+
+        if not scheduler.get_job('sync_aerodrome_warnings'):
+            scheduler.add_job(
+                func=sync_aerodrome_warnings,
+                trigger='interval',
+                seconds=30,
+                id='sync_aerodrome_warnings',
+                max_instances=1,
+                coalesce=True,
+                next_run_time=datetime.now(),
+                replace_existing=True
+            )
         
     return app
 
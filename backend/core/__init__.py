@@ -1,2 +1,2 @@
 from .config import *
-from .extensions import scheduler, logger
+from .extensions import scheduler, logger, http_session
@@ -9,62 +9,53 @@ MAX_CONTENT_LENGTH = 16 * 1024 * 1024
 
 ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'webp', 'pdf', 'doc', 'docx', 'txt', 'xlsx'}
 
-STATIONS = {
-    "VABB": "Mumbai",
-    "VANM": "Navi Mumbai",
-    "VASD": "Shirdi",
-    "VAJJ": "Juhu",
-    "VAJL": "Jalgaon",
-    "VAAU": "Aurangabad",
-    "VOND": "Nanded",
-    "VAKP": "Kolhapur",
-    "VOSR": "Sindhudurg",
-    "VASL": "Solapur",
-    "VOLT": "Latur",
-    "VOGA": "Mopa (Goa)"
-}
-
-DEFAULT_STATION = "VABB"
-
-STATION_COORDS = {
-    "VABB": [19.0886, 72.868],
-    "VANM": [18.9846, 73.0653],
-    "VASD": [19.6892, 74.3737],
-    "VAJJ": [19.097, 72.833],
-    "VAJL": [20.9619, 75.6267],
-    "VAAU": [19.863, 75.398],
-    "VOND": [19.1833, 77.3167],
-    "VAKP": [16.663, 74.288],
-    "VOSR": [16.0026, 73.5298],
-    "VASL": [17.628, 75.9348],
-    "VOLT": [18.4117, 76.4642],
-    "VOGA": [15.7442, 73.8606]
-}
-
-STATION_STATES = {
-    "VABB": "Maharashtra",
-    "VANM": "Maharashtra",
-    "VASD": "Maharashtra",
-    "VAJJ": "Maharashtra",
-    "VAJL": "Maharashtra",
-    "VAAU": "Maharashtra",
-    "VOND": "Maharashtra",
-    "VAKP": "Maharashtra",
-    "VOSR": "Maharashtra",
-    "VASL": "Maharashtra",
-    "VOLT": "Maharashtra",
-    "VOGA": "Goa"
-}
-
-STATE_BOUNDARIES = {
-    "Maharashtra": "/static/geojson/maharashtra_districts.geojson",
-    "Gujarat": "/static/geojson/india_state.geojson",  # Fallback
-    "Madhya Pradesh": "/static/geojson/india_state.geojson", # Fallback
-    "Goa": "/static/geojson/india_state.geojson" # Fallback
-}
-
-MAHARASHTRA_CENTER = [20.5, 76.0]
-MAHARASHTRA_ZOOM = 1800
+# Station metadata (ICAO, name, coordinates, state, boundary, runways, region); see core/stations.py
+STATIONS_FILE = os.path.join(BASE_DIR, 'core', 'stations.json')
+
+# Boundary GeoJSON and the precompressed TopoJSON built from it by scripts/build_geo_assets.py
+GEOJSON_DIR = os.path.join(BASE_DIR, '..', 'frontend', 'static', 'geojson')
+GEO_ASSET_DIR = os.path.join(GEOJSON_DIR, 'build')
+GEO_ASSET_MANIFEST = os.path.join(GEO_ASSET_DIR, 'manifest.json')
+GEO_ASSET_MAX_AGE = 365 * 24 * 3600
 
 MIN_OBSERVATIONS_PER_DAY = 20
 MIN_HOUR_SPREAD = 18
+
+LOG_DIR = os.path.join(BASE_DIR, 'logs')
+
+# Opt-in per-request profiling (admins only, triggered by ?_profile=1 or X-Profile: 1)
+PROFILING_ENABLED = os.environ.get("MWO_PROFILING", "0") == "1"
+PROFILE_DIR = os.path.join(LOG_DIR, 'profiles')
+PROFILE_SAMPLE_INTERVAL = 0.001
+
+# Statements slower than this are logged with their EXPLAIN QUERY PLAN
+SLOW_QUERY_THRESHOLD_MS = float(os.environ.get("MWO_SLOW_QUERY_MS", "100"))
+QUERY_STATS_MAX_STATEMENTS = 200
+
+# Aerodrome Warning app database (read-only, owned by the external app)
+AERODROME_WARNINGS_DB = '/home/mwomumbai/app/sql_app.db'
+
+# Warm headless browser reused by the RVR snapshot job, recycled after this many captures
+RVR_BROWSER_MAX_USES = 30
+
+# Live RVR source. Override MWO_RVR_URL to point the clients at a locally served copy of the page.
+RVR_URL = os.environ.get("MWO_RVR_URL", "http://rvrcamd.imd.gov.in:5000/live-rvr")
+# Optional JSON/XHR feed behind the RVR table (DataTables style {"data": [...]} or a plain list)
+RVR_DATA_URL = os.environ.get("MWO_RVR_DATA_URL")
+RVR_AIRPORT_FILTER = "Mumbai"
+RVR_HTTP_TIMEOUT = 5
+# After the HTTP tier finds no rows (e.g. the table is rendered by JavaScript) it is skipped for this long
+RVR_HTTP_RETRY_SECONDS = 30 * 60
+
+# /api/rvr/status is served from a cache refreshed in the background at this interval
+RVR_REFRESH_SECONDS = 60
+
+# Worker processes for upload OCR (news/notice drafts, NOTAM PDFs); defaults to all cores
+OCR_WORKERS = int(os.environ.get("MWO_OCR_WORKERS", os.cpu_count() or 1))
+
+# OCR text cache keyed by file SHA-256 + pipeline config; LRU-evicted above this size
+OCR_CACHE_MAX_BYTES = int(os.environ.get("MWO_OCR_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+
+# Keyset-paginated list APIs (news, notices, uploads, employees, NOTAMs): default and maximum page size
+LIST_PAGE_SIZE = 20
+LIST_PAGE_MAX = 200
@@ -1,7 +1,12 @@
 from apscheduler.schedulers.background import BackgroundScheduler
 import logging
+import requests
+from .metrics import observe_upstream_response
 
 scheduler = BackgroundScheduler()
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("mwo_app")
+
+http_session = requests.Session()
+http_session.hooks['response'].append(observe_upstream_response)
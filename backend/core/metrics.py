@@ -0,0 +1,147 @@
+import time
+from contextlib import contextmanager
+from urllib.parse import urlparse
+from flask import request, g, Response
+from prometheus_client import Counter, Histogram, generate_latest, CONTENT_TYPE_LATEST
+
+# Single gunicorn worker (see Dockerfile), so the default in-process registry
+# is the whole picture and no multiprocess collector is needed.
+
+REQUEST_COUNT = Counter(
+    'mwo_http_requests_total',
+    'HTTP requests handled, by blueprint and endpoint.',
+    ['blueprint', 'endpoint', 'method', 'status']
+)
+
+REQUEST_LATENCY = Histogram(
+    'mwo_http_request_duration_seconds',
+    'HTTP request latency, by blueprint and endpoint.',
+    ['blueprint', 'endpoint']
+)
+
+DB_QUERY_LATENCY = Histogram(
+    'mwo_db_query_duration_seconds',
+    'SQLite statement execution time, by database operation.',
+    ['operation'],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+)
+
+UPSTREAM_LATENCY = Histogram(
+    'mwo_upstream_request_duration_seconds',
+    'Outbound HTTP latency, by upstream host.',
+    ['host', 'status']
+)
+
+OCR_LATENCY = Histogram(
+    'mwo_ocr_duration_seconds',
+    'Tesseract OCR pipeline duration, by source.',
+    ['source'],
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0)
+)
+
+SELENIUM_LATENCY = Histogram(
+    'mwo_selenium_duration_seconds',
+    'Headless browser job duration, by job.',
+    ['job'],
+    buckets=(0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 45.0, 60.0, 120.0)
+)
+
+PDF_STAGE_LATENCY = Histogram(
+    'mwo_pdf_stage_duration_seconds',
+    'NOTAM PDF extraction time per page, by stage (text_layer, render, preprocess, ocr).',
+    ['stage'],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+)
+
+CACHE_REQUESTS = Counter(
+    'mwo_cache_requests_total',
+    'Cache lookups, by cache name and result (hit/miss).',
+    ['cache', 'result']
+)
+
+@contextmanager
+def track_duration(histogram, **labels):
+    """Observe the wall time of the enclosed block on the given histogram."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram.labels(**labels).observe(time.perf_counter() - start)
+
+def observe_db_query(operation, elapsed):
+    DB_QUERY_LATENCY.labels(operation=operation).observe(elapsed)
+
+def observe_upstream_response(response, *args, **kwargs):
+    """requests response hook: records time-to-response per upstream host."""
+    host = urlparse(response.url).hostname or 'unknown'
+    UPSTREAM_LATENCY.labels(host=host, status=str(response.status_code)).observe(
+        response.elapsed.total_seconds()
+    )
+    return response
+
+def observe_pdf_timings(timings):
+    """
+    Records per-page stage timings returned by parse_notam_pdf. The parser may
+    run in an OCR worker process, so the caller observes them here instead.
+    """
+    for timing in timings or []:
+        PDF_STAGE_LATENCY.labels(stage=timing['stage']).observe(timing['ms'] / 1000.0)
+
+def record_cache_lookup(cache, hit):
+    CACHE_REQUESTS.labels(cache=cache, result='hit' if hit else 'miss').inc()
+
+def ocr_run_metrics():
+    """
+    Collects OCR cache lookups and durations where they cannot be observed
+    directly: upload OCR runs in worker processes, whose registries never
+    reach /metrics. The result is returned to the parent for observe_ocr_run.
+    """
+    return {'cache_lookups': [], 'ocr_seconds': []}
+
+@contextmanager
+def collect_ocr_duration(metrics, source):
+    """track_duration for OCR_LATENCY, recorded into an ocr_run_metrics() dict."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics['ocr_seconds'].append((source, time.perf_counter() - start))
+
+def observe_ocr_run(metrics):
+    """Records what an ocr_run_metrics() dict collected, in the parent process."""
+    if not metrics:
+        return
+    for cache, hit in metrics.get('cache_lookups', []):
+        record_cache_lookup(cache, hit)
+    for source, seconds in metrics.get('ocr_seconds', []):
+        OCR_LATENCY.labels(source=source).observe(seconds)
+
+def init_metrics(app):
+    """Register request timing hooks and the /metrics scrape endpoint."""
+
+    @app.before_request
+    def _start_request_timer():
+        g._metrics_start = time.perf_counter()
+
+    @app.after_request
+    def _record_request_metrics(response):
+        start = g.pop('_metrics_start', None)
+        if start is None or request.endpoint == 'metrics':
+            return response
+
+        blueprint = request.blueprint or 'app'
+        endpoint = request.endpoint or 'unmatched'
+        REQUEST_LATENCY.labels(blueprint=blueprint, endpoint=endpoint).observe(
+            time.perf_counter() - start
+        )
+        REQUEST_COUNT.labels(
+            blueprint=blueprint,
+            endpoint=endpoint,
+            method=request.method,
+            status=str(response.status_code)
+        ).inc()
+        return response
+
+    @app.route('/metrics')
+    def metrics():
+        return Response(generate_latest(), content_type=CONTENT_TYPE_LATEST)
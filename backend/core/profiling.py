@@ -0,0 +1,140 @@
+import os
+import sys
+import time
+import pstats
+import cProfile
+import threading
+from collections import Counter
+from datetime import datetime
+from flask import request, session, g
+from .config import PROFILING_ENABLED, PROFILE_DIR, PROFILE_SAMPLE_INTERVAL
+from .extensions import logger
+
+_profile_lock = threading.Lock()
+
+DB_MODULE = os.path.join('database', 'operations.py')
+TEMPLATE_MODULE = os.path.join('flask', 'templating.py')
+
+class StackSampler(threading.Thread):
+    """
+    Samples the call stack of one thread at a fixed interval and aggregates
+    the samples in collapsed-stack form (input for flamegraph.pl / speedscope).
+    """
+
+    def __init__(self, thread_id, interval):
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+    def write_collapsed(self, path):
+        with open(path, 'w') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+def _profile_requested():
+    if not PROFILING_ENABLED or session.get('role') != 'admin':
+        return False
+    return request.args.get('_profile') == '1' or request.headers.get('X-Profile') == '1'
+
+def summarize_profile(profiler, top_n=10):
+    """Return (db_calls, template_time) extracted from a finished cProfile run."""
+    stats = pstats.Stats(profiler)
+    db_calls = []
+    template_time = {'calls': 0, 'seconds': 0.0}
+
+    for (filename, lineno, func), (cc, nc, tt, ct, callers) in stats.stats.items():
+        if filename.endswith(DB_MODULE) and not func.startswith('<') and func not in (
+            'execute', 'executescript', 'fetchone', 'fetchall', 'close', 'cursor',
+            '__del__', '_timed', '_finish', 'get_db_connection'
+        ):
+            db_calls.append({'operation': func, 'calls': nc, 'seconds': ct})
+        elif filename.endswith(TEMPLATE_MODULE) and func == 'render_template':
+            template_time = {'calls': nc, 'seconds': ct}
+
+    db_calls.sort(key=lambda c: c['seconds'], reverse=True)
+    return db_calls[:top_n], template_time
+
+def init_profiling(app):
+    """
+    Register the opt-in profiling hooks. A profiled request writes
+    <id>.prof (cProfile), <id>.collapsed (sampled stacks) and <id>.txt
+    (top DB calls and template render time) under PROFILE_DIR.
+    """
+    if not PROFILING_ENABLED:
+        return
+
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+
+    @app.before_request
+    def _start_profile():
+        if not _profile_requested() or not _profile_lock.acquire(blocking=False):
+            return
+
+        g._profile_start = time.perf_counter()
+        g._profile_sampler = StackSampler(threading.get_ident(), PROFILE_SAMPLE_INTERVAL)
+        g._profile_sampler.start()
+        g._profiler = cProfile.Profile()
+        g._profiler.enable()
+
+    @app.after_request
+    def _finish_profile(response):
+        profiler = g.pop('_profiler', None)
+        if profiler is None:
+            return response
+
+        try:
+            profiler.disable()
+            sampler = g.pop('_profile_sampler')
+            sampler.stop()
+            elapsed = time.perf_counter() - g.pop('_profile_start')
+
+            profile_id = f"{datetime.utcnow().strftime('%Y%m%d_%H%M%S_%f')}_{request.endpoint or 'unmatched'}"
+            base_path = os.path.join(PROFILE_DIR, profile_id)
+            profiler.dump_stats(f"{base_path}.prof")
+            sampler.write_collapsed(f"{base_path}.collapsed")
+
+            db_calls, template_time = summarize_profile(profiler)
+            lines = [
+                f"{request.method} {request.full_path} -> {response.status_code} in {elapsed * 1000:.1f} ms",
+                f"Template render: {template_time['seconds'] * 1000:.1f} ms over {template_time['calls']} call(s)",
+                "Top database calls:"
+            ]
+            for call in db_calls:
+                lines.append(f"  {call['operation']:<40} {call['calls']:>4} call(s) {call['seconds'] * 1000:>9.1f} ms")
+            with open(f"{base_path}.txt", 'w') as f:
+                f.write('\n'.join(lines) + '\n')
+
+            logger.info("Request profile written to %s.*\n%s", base_path, '\n'.join(lines))
+            response.headers['X-Profile-Id'] = profile_id
+        except Exception as e:
+            logger.error(f"Error writing request profile: {e}")
+        finally:
+            _profile_lock.release()
+
+        return response
+
+    @app.teardown_request
+    def _abandon_profile(exc):
+        profiler = g.pop('_profiler', None)
+        if profiler is None:
+            return
+        profiler.disable()
+        g.pop('_profile_sampler').stop()
+        _profile_lock.release()
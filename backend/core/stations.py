@@ -0,0 +1,71 @@
+import os
+import json
+from types import MappingProxyType
+from typing import NamedTuple
+from jinja2.utils import htmlsafe_json_dumps
+from markupsafe import Markup
+from core.config import STATIONS_FILE
+
+def boundary_asset(boundary):
+    """Asset name for a boundary path: '/static/geojson/maharashtra_districts.geojson' -> 'maharashtra_districts'."""
+    return os.path.splitext(os.path.basename(boundary))[0]
+
+class Station(NamedTuple):
+    icao: str
+    name: str
+    lat: float
+    lon: float
+    state: str
+    boundary: str
+    runways: tuple
+    region: str
+
+class StationRegistry:
+    """
+    Station metadata loaded once from core/stations.json.
+
+    Everything is derived at load time and read-only afterwards: lookups by
+    ICAO, the states (and boundary files) the map needs, and the JSON that
+    map.html embeds, already serialised and HTML-safe. map_boundary names the
+    boundary asset drawn under the markers: the default station's boundary
+    file without its extension, as scripts/build_geo_assets.py names it.
+    """
+
+    def __init__(self, data):
+        states = data['states']
+        self.default_icao = data['default_station']
+        self.stations = tuple(
+            Station(s['icao'], s['name'], float(s['lat']), float(s['lon']), s['state'],
+                    states[s['state']]['boundary'], tuple(s.get('runways', ())), s['region'])
+            for s in data['stations']
+        )
+        self.icaos = tuple(s.icao for s in self.stations)
+        self.by_icao = MappingProxyType({s.icao: s for s in self.stations})
+        self.names = MappingProxyType({s.icao: s.name for s in self.stations})
+
+        self.required_states = frozenset(s.state for s in self.stations)
+        self.state_boundaries = MappingProxyType({state: states[state]['boundary'] for state in self.required_states})
+
+        self.names_json = Markup(htmlsafe_json_dumps(dict(self.names)))
+        self.coords_json = Markup(htmlsafe_json_dumps({s.icao: [s.lat, s.lon] for s in self.stations}))
+
+        if self.default_icao not in self.by_icao:
+            raise ValueError(f"Default station {self.default_icao} is not in the station list")
+        self.map_boundary = boundary_asset(self.by_icao[self.default_icao].boundary)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def __contains__(self, icao):
+        return icao in self.by_icao
+
+    def get(self, icao):
+        return self.by_icao.get(icao)
+
+    def name(self, icao, default=None):
+        station = self.by_icao.get(icao)
+        return station.name if station else default
+
+station_registry = StationRegistry.load(STATIONS_FILE)
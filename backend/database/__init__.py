@@ -17,16 +17,15 @@ from .operations import (
     get_sigmet_status,
     
     create_notam_draft,
-    get_notams_by_status,
+    create_notam_drafts,
     update_notam_status,
     update_notam_text,
     delete_notam,
     get_public_active_notam,
+    get_active_notams,
     auto_expire_notams,
     
-    create_aerodrome_warning, 
-    get_active_aerodrome_warnings, 
-    get_active_warning_for_station,
+    create_aerodrome_warning,
     
     add_dynamic_button, delete_dynamic_button, get_dynamic_buttons_by_section,
     
@@ -34,3 +33,16 @@ from .operations import (
     
     get_employees, add_employee, update_employee, delete_employee
 )
+
+from .query_stats import query_stats
+from .aerodrome_warnings import (
+    get_active_aerodrome_warnings, get_active_warning_for_station,
+    get_latest_warnings_for_stations, sync_aerodrome_warnings
+)
+from .rvr_history import save_rvr_readings, get_rvr_history
+from .ocr_jobs import create_ocr_job, finish_ocr_job, get_ocr_job, get_unfinished_ocr_jobs
+from .ocr_cache import get_cached_ocr_text, save_cached_ocr_text
+from .listing import (
+    get_news_page, get_notices_page, get_admin_uploads_page, get_employees_page, get_notams_page,
+    NEWS_LISTING, NOTICE_LISTING, UPLOAD_LISTING, EMPLOYEE_LISTING, NOTAM_LISTING
+)
@@ -0,0 +1,309 @@
+import os
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from core.config import AERODROME_WARNINGS_DB
+from core.extensions import logger
+from .operations import InstrumentedConnection, get_db_connection
+
+FINAL_ALERT_STATUSES = ('FINALIZED', 'active')
+SYNC_BATCH_SIZE = 500
+
+class AerodromeWarningsSync:
+    """
+    Incrementally copies alerts from the external Aerodrome Warning app
+    database into the local, indexed aerodrome_warnings table.
+
+    The external file is only opened when its (and its WAL's) mtime/size
+    changed and PRAGMA data_version confirms a commit. New alerts are read
+    past a cursor stored in sync_state; the cursor is held back at alerts
+    that are not yet final but still valid, so they are picked up once
+    finalized. Warnings that are still valid locally are re-read by id so
+    edits and withdrawals propagate; ones deleted externally are withdrawn.
+    """
+
+    name = 'aerodrome_alerts'
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = None
+        self._signature = None
+        self._data_version = None
+
+    def _file_signature(self):
+        signature = []
+        for path in (self.db_path, self.db_path + '-wal'):
+            try:
+                st = os.stat(path)
+                signature.append((st.st_mtime_ns, st.st_size))
+            except FileNotFoundError:
+                signature.append(None)
+        return tuple(signature)
+
+    def _connection(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False, factory=InstrumentedConnection)
+            self._conn.row_factory = sqlite3.Row
+        return self._conn
+
+    def _external_changed(self):
+        """
+        (changed, signature, data_version). A change is only recorded by sync()
+        once it has been copied, so a failed sync retries it on the next run.
+        """
+        signature = self._file_signature()
+        if signature == self._signature:
+            return False, signature, self._data_version
+
+        data_version = self._connection().execute('PRAGMA data_version').fetchone()[0]
+        if data_version == self._data_version:
+            self._signature = signature
+            return False, signature, data_version
+        return True, signature, data_version
+
+    def sync(self):
+        """Copy new and changed alerts into the local table. Returns the number of rows written."""
+        if not os.path.exists(self.db_path):
+            return 0
+
+        with self._lock:
+            try:
+                changed, signature, data_version = self._external_changed()
+                if not changed:
+                    return 0
+                written = self._sync_changes()
+                self._signature, self._data_version = signature, data_version
+                return written
+            except sqlite3.Error as e:
+                logger.error(f"Error syncing external Aerodrome DB: {e}")
+                if self._conn is not None:
+                    self._conn.close()
+                    self._conn = None
+                self._signature = None
+                self._data_version = None
+                return 0
+            except Exception as e:
+                logger.error(f"Error syncing external Aerodrome DB: {e}")
+                return 0
+
+    def _sync_changes(self):
+        external = self._connection()
+        local = get_db_connection()
+        now = datetime.utcnow()
+        written = 0
+        try:
+            row = local.execute('SELECT cursor FROM sync_state WHERE name = ?', (self.name,)).fetchone()
+            cursor = row['cursor'] if row else 0
+            held_at = None
+
+            while True:
+                rows = external.execute('''
+                    SELECT id, status, content, created_at FROM alerts
+                    WHERE id > ?
+                    ORDER BY id ASC
+                    LIMIT ?
+                ''', (cursor, SYNC_BATCH_SIZE)).fetchall()
+                if not rows:
+                    break
+
+                for alert in rows:
+                    warning = _parse_alert(alert['content'], alert['created_at'])
+                    if alert['status'] in FINAL_ALERT_STATUSES:
+                        if warning:
+                            _upsert_warning(local, alert['id'], warning, 'ACTIVE')
+                            written += 1
+                    elif warning and warning['valid_to_dt'] > now and held_at is None:
+                        held_at = alert['id'] - 1
+                cursor = rows[-1]['id']
+
+            # Re-read the alerts that are still valid locally so edits and withdrawals propagate.
+            live_ids = [r['source_alert_id'] for r in local.execute('''
+                SELECT source_alert_id FROM aerodrome_warnings
+                WHERE source_alert_id IS NOT NULL AND status = 'ACTIVE' AND valid_to > ?
+            ''', (now.strftime('%Y-%m-%d %H:%M:%S'),)).fetchall()]
+            if live_ids:
+                placeholders = ','.join('?' * len(live_ids))
+                found = set()
+                for alert in external.execute(
+                    f'SELECT id, status, content, created_at FROM alerts WHERE id IN ({placeholders})', live_ids
+                ).fetchall():
+                    found.add(alert['id'])
+                    warning = _parse_alert(alert['content'], alert['created_at'])
+                    if warning:
+                        status = 'ACTIVE' if alert['status'] in FINAL_ALERT_STATUSES else 'WITHDRAWN'
+                        _upsert_warning(local, alert['id'], warning, status)
+                        written += 1
+
+                # Alerts deleted from the external app are withdrawn too.
+                deleted = [alert_id for alert_id in live_ids if alert_id not in found]
+                if deleted:
+                    placeholders = ','.join('?' * len(deleted))
+                    written += local.execute(f'''
+                        UPDATE aerodrome_warnings SET status = 'WITHDRAWN'
+                        WHERE source_alert_id IN ({placeholders})
+                    ''', deleted).rowcount
+
+            cursor = held_at if held_at is not None else cursor
+            local.execute('''
+                INSERT INTO sync_state (name, cursor, updated_at) VALUES (?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT(name) DO UPDATE SET cursor = excluded.cursor, updated_at = excluded.updated_at
+            ''', (self.name, cursor))
+            local.commit()
+            logger.info(f"Aerodrome warnings sync: {written} row(s) written, cursor at {cursor}")
+            return written
+        finally:
+            local.close()
+
+def _upsert_warning(conn, source_alert_id, warning, status):
+    conn.execute('''
+        INSERT INTO aerodrome_warnings
+        (source_alert_id, station_icao, message, valid_from, valid_to, status, created_by, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, 'Aerodrome App', ?)
+        ON CONFLICT(source_alert_id) DO UPDATE SET
+            station_icao = excluded.station_icao,
+            message = excluded.message,
+            valid_to = excluded.valid_to,
+            status = excluded.status
+    ''', (
+        source_alert_id,
+        warning['station_icao'],
+        warning['message'] or '',
+        warning['created_at'] or warning['valid_to'],
+        warning['valid_to'],
+        status,
+        warning['created_at']
+    ))
+
+def _parse_alert(content_raw, created_at):
+    """Extract airport, valid_until_iso and generated_text from one alerts.content blob."""
+    if not content_raw:
+        return None
+
+    try:
+        content = json.loads(content_raw)
+    except Exception as ex:
+        logger.error(f"JSON parse error in sync logic: {ex}")
+        return None
+    if not isinstance(content, dict):
+        return None
+
+    station_icao = content.get('airport')
+    valid_to_iso = content.get('valid_until_iso')
+    if not isinstance(station_icao, str) or not isinstance(valid_to_iso, str) or not station_icao.strip():
+        return None
+
+    try:
+        valid_to_dt = datetime.fromisoformat(valid_to_iso.replace('Z', ''))
+    except Exception as ex:
+        logger.error(f"Date parse error in sync logic: {ex}")
+        return None
+
+    return {
+        'station_icao': station_icao.strip().upper(),
+        'valid_to_dt': valid_to_dt,
+        'valid_to': valid_to_dt.strftime('%Y-%m-%d %H:%M:%S'),
+        'message': content.get('generated_text'),
+        'created_at': created_at
+    }
+
+aerodrome_warnings_sync = AerodromeWarningsSync(AERODROME_WARNINGS_DB)
+
+def sync_aerodrome_warnings():
+    """Scheduler entry point for the incremental external alerts sync."""
+    return aerodrome_warnings_sync.sync()
+
+def get_active_aerodrome_warnings():
+    """
+    Get all active aerodrome warnings, newest first, from the local table
+    that sync_aerodrome_warnings keeps up to date.
+    """
+    if not os.path.exists(AERODROME_WARNINGS_DB) and os.path.exists('met_data.db'):
+        conn = sqlite3.connect('met_data.db', factory=InstrumentedConnection)
+        conn.row_factory = sqlite3.Row
+        try:
+            now = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
+            cursor = conn.execute("SELECT * FROM aerodrome_warnings WHERE status = 'ACTIVE' AND valid_to > ?", (now,))
+            return [dict(row) for row in cursor.fetchall()]
+        finally:
+            conn.close()
+
+    conn = get_db_connection()
+    try:
+        now = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
+        cursor = conn.execute('''
+            SELECT station_icao, valid_to, message, created_at
+            FROM aerodrome_warnings
+            WHERE valid_to > ? AND status = 'ACTIVE'
+            ORDER BY created_at DESC
+        ''', (now,))
+        return [dict(row) for row in cursor.fetchall()]
+    except Exception as e:
+        logger.error(f"Error getting active aerodrome warnings: {e}")
+        return []
+    finally:
+        conn.close()
+
+def get_active_warning_for_station(station_icao, limit=None):
+    """Active warnings for one station, newest first, via the (station_icao, valid_to) index."""
+    if not os.path.exists(AERODROME_WARNINGS_DB) and os.path.exists('met_data.db'):
+        warnings = [w for w in get_active_aerodrome_warnings()
+                    if w['station_icao'].strip().upper() == station_icao.strip().upper()]
+        warnings.sort(key=lambda w: w['created_at'] or '', reverse=True)
+        return warnings[:limit] if limit else warnings
+
+    conn = get_db_connection()
+    try:
+        now = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
+        cursor = conn.execute('''
+            SELECT station_icao, valid_to, message, created_at
+            FROM aerodrome_warnings
+            WHERE station_icao = ? AND valid_to > ? AND status = 'ACTIVE'
+            ORDER BY created_at DESC
+            LIMIT ?
+        ''', (station_icao.strip().upper(), now, limit or -1))
+        return [dict(row) for row in cursor.fetchall()]
+    except Exception as e:
+        logger.error(f"Error getting aerodrome warnings for {station_icao}: {e}")
+        return []
+    finally:
+        conn.close()
+
+def get_latest_warnings_for_stations(station_codes):
+    """
+    Latest active warning for each of the given stations, in one query.
+    Stations without an active warning are omitted.
+    """
+    codes = [code.strip().upper() for code in station_codes]
+    if not codes:
+        return []
+
+    if not os.path.exists(AERODROME_WARNINGS_DB) and os.path.exists('met_data.db'):
+        latest = {}
+        for w in get_active_aerodrome_warnings():
+            key = w['station_icao'].strip().upper()
+            if key in codes and (key not in latest or (w['created_at'] or '') > (latest[key]['created_at'] or '')):
+                latest[key] = w
+        return list(latest.values())
+
+    conn = get_db_connection()
+    try:
+        now = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
+        placeholders = ','.join('?' * len(codes))
+        cursor = conn.execute(f'''
+            SELECT station_icao, valid_to, message, created_at FROM (
+                SELECT station_icao, valid_to, message, created_at,
+                       ROW_NUMBER() OVER (PARTITION BY station_icao ORDER BY created_at DESC) AS rn
+                FROM aerodrome_warnings
+                WHERE station_icao IN ({placeholders}) AND valid_to > ? AND status = 'ACTIVE'
+            )
+            WHERE rn = 1
+            ORDER BY created_at DESC
+        ''', (*codes, now))
+        return [dict(row) for row in cursor.fetchall()]
+    except Exception as e:
+        logger.error(f"Error getting latest aerodrome warnings: {e}")
+        return []
+    finally:
+        conn.close()
@@ -0,0 +1,123 @@
+from core.extensions import logger
+from .operations import get_db_connection
+
+class Listing:
+    """
+    Keyset-paginated, column-projected listing of one table.
+
+    Rows are sorted on `order` (all DESC or all ASC) with the unique id as the
+    last key, so a page continues strictly after the previous page's last row
+    and stays correct while rows are added. The cursor is that row's sort
+    values joined with '|'. Sort columns other than id are compared as
+    COALESCE(column, '') so rows with a NULL sort value are still paged (a
+    NULL never satisfies the row-value comparison). Heavy `optional` columns
+    are only selected when named in fields.
+    """
+
+    def __init__(self, table, columns, order=('id',), descending=True, optional=()):
+        self.table = table
+        self.columns = tuple(columns)
+        self.order = tuple(order) if order[-1] == 'id' else tuple(order) + ('id',)
+        self.descending = descending
+        self.optional = tuple(optional)
+
+    def cursor_for(self, row):
+        return '|'.join('' if row[column] is None else str(row[column]) for column in self.order)
+
+    def parse_cursor(self, cursor):
+        """Sort values of a cursor from cursor_for; ValueError if it is not one."""
+        values = str(cursor).rsplit('|', len(self.order) - 1)
+        if len(values) != len(self.order) or not values[-1].isdigit():
+            raise ValueError(f"Invalid cursor for {self.table}: {cursor!r}")
+        values[-1] = int(values[-1])
+        return values
+
+    @staticmethod
+    def _sort_key(column):
+        return column if column == 'id' else f"COALESCE({column}, '')"
+
+    def page(self, before=None, limit=20, fields=(), where=()):
+        """
+        Returns (rows, next_cursor); next_cursor is None on the last page.
+        where is a sequence of (sql_condition, params) pairs ANDed together.
+        Raises ValueError for a malformed before cursor.
+        """
+        columns = self.columns + tuple(c for c in self.optional if c in fields)
+        sort_keys = [self._sort_key(column) for column in self.order]
+        conditions, params = [], []
+        for condition, condition_params in where:
+            conditions.append(condition)
+            params.extend(condition_params)
+        if before:
+            placeholders = ', '.join('?' for _ in self.order)
+            conditions.append(f"({', '.join(sort_keys)}) {'<' if self.descending else '>'} ({placeholders})")
+            params.extend(self.parse_cursor(before))
+
+        conn = get_db_connection()
+        try:
+            direction = 'DESC' if self.descending else 'ASC'
+            query = f"SELECT {', '.join(columns)} FROM {self.table}"
+            if conditions:
+                query += ' WHERE ' + ' AND '.join(conditions)
+            query += ' ORDER BY ' + ', '.join(f"{key} {direction}" for key in sort_keys)
+            query += ' LIMIT ?'
+            params.append(limit + 1)
+
+            rows = [dict(row) for row in conn.execute(query, params).fetchall()]
+            next_cursor = self.cursor_for(rows[limit - 1]) if len(rows) > limit else None
+            return rows[:limit], next_cursor
+        except Exception as e:
+            logger.error(f"Error listing {self.table}: {e}")
+            return [], None
+        finally:
+            conn.close()
+
+NEWS_LISTING = Listing(
+    'news_events',
+    ('id', 'title', 'description', 'filename', 'status', 'upload_time', 'uploaded_by'),
+    order=('upload_time', 'id'), optional=('ocr_text',)
+)
+NOTICE_LISTING = Listing(
+    'notices',
+    ('id', 'title', 'message', 'filename', 'status', 'upload_time', 'uploaded_by'),
+    order=('upload_time', 'id'), optional=('ocr_text',)
+)
+UPLOAD_LISTING = Listing(
+    'admin_uploads',
+    ('id', 'filename', 'file_type', 'file_path', 'uploaded_by', 'upload_date', 'expiration_date'),
+    order=('upload_date', 'id')
+)
+EMPLOYEE_LISTING = Listing(
+    'employees',
+    ('id', 'name', 'designation', 'section', 'telephone'),
+    descending=False
+)
+NOTAM_LISTING = Listing(
+    'notams',
+    ('id', 'filename', 'final_notam_text', 'status', 'valid_from_utc', 'valid_till_utc',
+     'uploaded_by', 'upload_id', 'created_at', 'updated_at'),
+    optional=('ocr_text',)
+)
+
+def get_news_page(admin_view=False, before=None, limit=20, fields=()):
+    where = () if admin_view else [("status = 'PUBLISHED'", ())]
+    return NEWS_LISTING.page(before, limit, fields, where)
+
+def get_notices_page(admin_view=False, before=None, limit=20, fields=()):
+    where = () if admin_view else [("status = 'PUBLISHED'", ())]
+    return NOTICE_LISTING.page(before, limit, fields, where)
+
+def get_admin_uploads_page(before=None, limit=20):
+    return UPLOAD_LISTING.page(before, limit, where=[("is_deleted = 0", ())])
+
+def get_employees_page(before=None, limit=20, section=None, exclude_section=None):
+    """Employees in id order; section filters compare case-insensitively."""
+    where = []
+    if section:
+        where.append(("UPPER(section) = ?", (section.upper(),)))
+    if exclude_section:
+        where.append(("(section IS NULL OR UPPER(section) != ?)", (exclude_section.upper(),)))
+    return EMPLOYEE_LISTING.page(before, limit, where=where)
+
+def get_notams_page(status, before=None, limit=20, fields=()):
+    return NOTAM_LISTING.page(before, limit, fields, [("status = ?", (status,))])
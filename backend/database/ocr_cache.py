@@ -0,0 +1,48 @@
+from core.extensions import logger
+from .operations import get_db_connection
+
+def get_cached_ocr_text(key):
+    """Cached OCR text for a content key, or None. Touches last_used_at for LRU eviction."""
+    conn = get_db_connection()
+    try:
+        row = conn.execute('SELECT text FROM ocr_cache WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return None
+        conn.execute('UPDATE ocr_cache SET last_used_at = CURRENT_TIMESTAMP WHERE key = ?', (key,))
+        conn.commit()
+        return row['text']
+    except Exception as e:
+        logger.error(f"Error reading OCR cache: {e}")
+        return None
+    finally:
+        conn.close()
+
+def save_cached_ocr_text(key, text, max_bytes):
+    """
+    Stores OCR text under its content key, then evicts least recently used
+    entries until the cache holds at most max_bytes of text.
+    """
+    conn = get_db_connection()
+    try:
+        conn.execute('''
+            INSERT OR REPLACE INTO ocr_cache (key, text, size, created_at, last_used_at)
+            VALUES (?, ?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
+        ''', (key, text, len(text.encode('utf-8'))))
+
+        total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM ocr_cache').fetchone()[0]
+        if total > max_bytes:
+            conn.execute('''
+                DELETE FROM ocr_cache WHERE key IN (
+                    SELECT key FROM (
+                        SELECT key, SUM(size) OVER (ORDER BY last_used_at DESC, created_at DESC) AS running
+                        FROM ocr_cache
+                    ) WHERE running > ?
+                )
+            ''', (max_bytes,))
+        conn.commit()
+        return True
+    except Exception as e:
+        logger.error(f"Error writing OCR cache: {e}")
+        return False
+    finally:
+        conn.close()
@@ -0,0 +1,66 @@
+import json
+from core.extensions import logger
+from .operations import get_db_connection
+
+UNFINISHED_JOB_STATUSES = ('QUEUED',)
+
+def create_ocr_job(job_id, kind, filename, file_path, upload_id, submitted_by):
+    conn = get_db_connection()
+    try:
+        conn.execute('''
+            INSERT INTO ocr_jobs (id, kind, filename, file_path, upload_id, submitted_by, status)
+            VALUES (?, ?, ?, ?, ?, ?, 'QUEUED')
+        ''', (job_id, kind, filename, file_path, upload_id, submitted_by))
+        conn.commit()
+        return True
+    except Exception as e:
+        logger.error(f"Error creating OCR job: {e}")
+        return False
+    finally:
+        conn.close()
+
+def finish_ocr_job(job_id, status, result=None, error=None):
+    """Marks a job DONE or FAILED and stores its JSON result or error message."""
+    conn = get_db_connection()
+    try:
+        conn.execute('''
+            UPDATE ocr_jobs SET status = ?, result = ?, error = ?, updated_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+        ''', (status, json.dumps(result) if result is not None else None, error, job_id))
+        conn.commit()
+        return True
+    except Exception as e:
+        logger.error(f"Error updating OCR job {job_id}: {e}")
+        return False
+    finally:
+        conn.close()
+
+def get_ocr_job(job_id):
+    conn = get_db_connection()
+    try:
+        row = conn.execute('SELECT * FROM ocr_jobs WHERE id = ?', (job_id,)).fetchone()
+        if not row:
+            return None
+        job = dict(row)
+        job['result'] = json.loads(job['result']) if job['result'] else None
+        return job
+    except Exception as e:
+        logger.error(f"Error retrieving OCR job {job_id}: {e}")
+        return None
+    finally:
+        conn.close()
+
+def get_unfinished_ocr_jobs():
+    """Jobs that were queued when the process last stopped, oldest first."""
+    conn = get_db_connection()
+    try:
+        placeholders = ','.join('?' for _ in UNFINISHED_JOB_STATUSES)
+        cursor = conn.execute(f'''
+            SELECT * FROM ocr_jobs WHERE status IN ({placeholders}) ORDER BY created_at ASC
+        ''', UNFINISHED_JOB_STATUSES)
+        return [dict(row) for row in cursor.fetchall()]
+    except Exception as e:
+        logger.error(f"Error retrieving unfinished OCR jobs: {e}")
+        return []
+    finally:
+        conn.close()
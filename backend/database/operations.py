@@ -1,12 +1,115 @@
 import sqlite3
-import os
+import sys
+import time
 from datetime import datetime
-from core.config import DB_NAME
+from core.config import DB_NAME, SLOW_QUERY_THRESHOLD_MS
 from core.extensions import logger
+from core.metrics import observe_db_query
+from .query_stats import query_stats, normalize_sql
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """
+    Cursor that times each statement, including the fetch that drains it, and
+    reports it under the name of the operations.py function that issued it.
+    Statements slower than SLOW_QUERY_THRESHOLD_MS are logged with their plan.
+    """
+    _operation = None
+    _sql = None
+    _parameters = ()
+    _elapsed = 0.0
+    _rows = 0
+
+    def execute(self, sql, parameters=(), operation=None):
+        return self._timed(operation, sql, parameters, super().execute, sql, parameters)
+
+    def executescript(self, sql_script, operation=None):
+        self._timed(operation, sql_script, None, super().executescript, sql_script)
+        self._finish()
+        return self
+
+    def fetchone(self):
+        start = time.perf_counter()
+        row = super().fetchone()
+        self._elapsed += time.perf_counter() - start
+        if row is None:
+            self._finish()
+        else:
+            self._rows += 1
+        return row
+
+    def fetchall(self):
+        start = time.perf_counter()
+        rows = super().fetchall()
+        self._elapsed += time.perf_counter() - start
+        self._rows += len(rows)
+        self._finish()
+        return rows
+
+    def close(self):
+        self._finish()
+        super().close()
+
+    def __del__(self):
+        self._finish()
+
+    def _timed(self, operation, sql, parameters, run, *args):
+        self._finish()
+        self._operation = operation or sys._getframe(2).f_code.co_name
+        self._sql = sql
+        self._parameters = parameters
+        self._rows = 0
+        start = time.perf_counter()
+        try:
+            return run(*args)
+        finally:
+            self._elapsed = time.perf_counter() - start
+            if self.description is None:
+                self._rows = max(self.rowcount, 0)
+                self._finish()
+
+    def _finish(self):
+        if self._operation is None:
+            return
+        operation, sql, elapsed, rows = self._operation, self._sql, self._elapsed, self._rows
+        self._operation = None
+        self._elapsed = 0.0
+
+        observe_db_query(operation, elapsed)
+        query_stats.record(sql, operation, elapsed, rows)
+
+        if elapsed * 1000 >= SLOW_QUERY_THRESHOLD_MS:
+            plan = self._explain(sql, self._parameters)
+            logger.warning(
+                f"Slow query in {operation}: {elapsed * 1000:.1f} ms, {rows} row(s): "
+                f"{normalize_sql(sql)} | plan: {plan}"
+            )
+            query_stats.record_slow(sql, operation, elapsed, rows, plan)
+
+    def _explain(self, sql, parameters):
+        if parameters is None or not sql.lstrip().upper().startswith(('SELECT', 'WITH', 'UPDATE', 'DELETE', 'INSERT')):
+            return None
+        try:
+            # Base-class execute bypasses the instrumentation, so EXPLAIN is not itself recorded.
+            plan_rows = sqlite3.Connection.execute(self.connection, f"EXPLAIN QUERY PLAN {sql}", parameters).fetchall()
+            return ' | '.join(row[3] for row in plan_rows) or None
+        except sqlite3.Error as e:
+            return f"unavailable ({e})"
+
+class InstrumentedConnection(sqlite3.Connection):
+    """Connection whose shortcut execute methods go through InstrumentedCursor."""
+
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters, operation=sys._getframe(1).f_code.co_name)
+
+    def executescript(self, sql_script):
+        return self.cursor().executescript(sql_script, operation=sys._getframe(1).f_code.co_name)
 
 def get_db_connection():
     """Create a database connection to the SQLite database."""
-    conn = sqlite3.connect(DB_NAME)
+    conn = sqlite3.connect(DB_NAME, factory=InstrumentedConnection)
     conn.row_factory = sqlite3.Row
     return conn
 
@@ -125,6 +228,50 @@ def init_db():
                 created_by TEXT,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             );
+
+            CREATE TABLE IF NOT EXISTS sync_state (
+                name TEXT PRIMARY KEY,
+                cursor INTEGER NOT NULL DEFAULT 0,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            );
+
+            CREATE TABLE IF NOT EXISTS rvr_readings (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                station_icao TEXT NOT NULL,
+                runway TEXT NOT NULL,
+                captured_at DATETIME NOT NULL,
+                tdz_value INTEGER,
+                tdz_modifier TEXT,
+                mid_value INTEGER,
+                mid_modifier TEXT,
+                end_value INTEGER,
+                end_modifier TEXT,
+                trend TEXT,
+                source TEXT,
+                UNIQUE(station_icao, runway, captured_at)
+            );
+
+            CREATE TABLE IF NOT EXISTS ocr_jobs (
+                id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                filename TEXT NOT NULL,
+                file_path TEXT NOT NULL,
+                upload_id INTEGER,
+                submitted_by TEXT,
+                status TEXT NOT NULL DEFAULT 'QUEUED',
+                result TEXT,
+                error TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            );
+
+            CREATE TABLE IF NOT EXISTS ocr_cache (
+                key TEXT PRIMARY KEY,
+                text TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                last_used_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            );
         ''')
 
         try:
@@ -148,6 +295,43 @@ def init_db():
         except: pass
         try: conn.execute("ALTER TABLE dynamic_buttons ADD COLUMN upload_id INTEGER")
         except: pass
+        try: conn.execute("ALTER TABLE aerodrome_warnings ADD COLUMN source_alert_id INTEGER")
+        except: pass
+
+        conn.executescript('''
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_aerodrome_warnings_source
+                ON aerodrome_warnings(source_alert_id);
+            CREATE INDEX IF NOT EXISTS idx_aerodrome_warnings_station_valid
+                ON aerodrome_warnings(station_icao, valid_to);
+            CREATE INDEX IF NOT EXISTS idx_aerodrome_warnings_valid
+                ON aerodrome_warnings(valid_to);
+            CREATE INDEX IF NOT EXISTS idx_rvr_readings_captured
+                ON rvr_readings(station_icao, captured_at);
+            CREATE INDEX IF NOT EXISTS idx_ocr_jobs_status
+                ON ocr_jobs(status);
+            CREATE INDEX IF NOT EXISTS idx_ocr_cache_last_used
+                ON ocr_cache(last_used_at);
+            CREATE INDEX IF NOT EXISTS idx_notams_status_valid
+                ON notams(status, valid_till_utc);
+            CREATE INDEX IF NOT EXISTS idx_notams_status
+                ON notams(status);
+            DROP INDEX IF EXISTS idx_news_events_upload;
+            DROP INDEX IF EXISTS idx_news_events_status_upload;
+            DROP INDEX IF EXISTS idx_notices_upload;
+            DROP INDEX IF EXISTS idx_notices_status_upload;
+            DROP INDEX IF EXISTS idx_admin_uploads_active;
+            -- Keyed on the COALESCE(column, '') sort keys used by database/listing.py
+            CREATE INDEX IF NOT EXISTS idx_news_events_upload_key
+                ON news_events(COALESCE(upload_time, ''));
+            CREATE INDEX IF NOT EXISTS idx_news_events_status_upload_key
+                ON news_events(status, COALESCE(upload_time, ''));
+            CREATE INDEX IF NOT EXISTS idx_notices_upload_key
+                ON notices(COALESCE(upload_time, ''));
+            CREATE INDEX IF NOT EXISTS idx_notices_status_upload_key
+                ON notices(status, COALESCE(upload_time, ''));
+            CREATE INDEX IF NOT EXISTS idx_admin_uploads_active_key
+                ON admin_uploads(is_deleted, COALESCE(upload_date, ''));
+        ''')
         conn.commit()
 
         seed_employees_if_empty()
@@ -399,13 +583,28 @@ def get_sigmet_status():
     finally:
         conn.close()
 
+NOTAM_TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+def _notam_time(value):
+    """
+    valid_till_utc as stored: 'YYYY-MM-DD HH:MM:SS', whether given a datetime
+    (which sqlite3 would store with microseconds) or an ISO string ('T',
+    fractional seconds). Unparseable strings are stored as given.
+    """
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.strip())
+        except ValueError:
+            return value
+    return value.strftime(NOTAM_TIME_FORMAT) if isinstance(value, datetime) else value
+
 def create_notam_draft(filename, ocr_text, final_text, valid_till, user, upload_id=None):
     conn = get_db_connection()
     try:
         cursor = conn.execute('''
             INSERT INTO notams (filename, ocr_text, final_notam_text, valid_till_utc, uploaded_by, status, upload_id)
             VALUES (?, ?, ?, ?, ?, 'DRAFT', ?)
-        ''', (filename, ocr_text, final_text, valid_till, user, upload_id))
+        ''', (filename, ocr_text, final_text, _notam_time(valid_till), user, upload_id))
         conn.commit()
         return cursor.lastrowid
     except Exception as e:
@@ -414,20 +613,22 @@ def create_notam_draft(filename, ocr_text, final_text, valid_till, user, upload_
     finally:
         conn.close()
 
-def get_notams_by_status(status=None):
+def create_notam_drafts(filename, items, user, upload_id=None):
+    """Inserts one DRAFT per extracted NOTAM item in a single transaction; returns the new ids."""
     conn = get_db_connection()
     try:
-        query = 'SELECT * FROM notams'
-        params = []
-        if status:
-            query += ' WHERE status = ?'
-            params.append(status)
-        query += ' ORDER BY created_at DESC'
-        
-        cursor = conn.execute(query, params)
-        return [dict(row) for row in cursor.fetchall()]
+        ids = []
+        for item in items:
+            cursor = conn.execute('''
+                INSERT INTO notams (filename, ocr_text, final_notam_text, valid_till_utc, uploaded_by, status, upload_id)
+                VALUES (?, ?, ?, ?, ?, 'DRAFT', ?)
+            ''', (filename, item.get('raw_text', ''), item['formatted_text'], _notam_time(item['valid_until']), user, upload_id))
+            ids.append(cursor.lastrowid)
+        conn.commit()
+        return ids
     except Exception as e:
-        logger.error(f"Error getting NOTAMs: {e}")
+        conn.rollback()
+        logger.error(f"Error creating NOTAM drafts: {e}")
         return []
     finally:
         conn.close()
@@ -448,7 +649,7 @@ def update_notam_text(notam_id, new_text, new_date=None):
     conn = get_db_connection()
     try:
         if new_date:
-             conn.execute('UPDATE notams SET final_notam_text = ?, valid_till_utc = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ? AND status != "ARCHIVED"', (new_text, new_date, notam_id))
+             conn.execute('UPDATE notams SET final_notam_text = ?, valid_till_utc = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ? AND status != "ARCHIVED"', (new_text, _notam_time(new_date), notam_id))
         else:
              conn.execute('UPDATE notams SET final_notam_text = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ? AND status != "ARCHIVED"', (new_text, notam_id))
         
@@ -477,15 +678,14 @@ def get_public_active_notam():
     conn = get_db_connection()
     try:
 
-        now = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
         cursor = conn.execute('''
             SELECT final_notam_text, valid_till_utc 
             FROM notams 
             WHERE status = 'ACTIVE' 
-            AND valid_till_utc > ? 
+            AND julianday(valid_till_utc) > julianday('now') 
             ORDER BY created_at DESC 
             LIMIT 1
-        ''', (now,))
+        ''')
         row = cursor.fetchone()
         return dict(row) if row else None
     except Exception as e:
@@ -494,19 +694,39 @@ def get_public_active_notam():
     finally:
         conn.close()
 
+def get_active_notams():
+    """All ACTIVE NOTAMs, newest first, including ones already past valid_till_utc."""
+    conn = get_db_connection()
+    try:
+        cursor = conn.execute('''
+            SELECT id, final_notam_text, valid_till_utc, created_at
+            FROM notams
+            WHERE status = 'ACTIVE'
+            ORDER BY created_at DESC, id DESC
+        ''')
+        return [dict(row) for row in cursor.fetchall()]
+    except Exception as e:
+        logger.error(f"Error getting active NOTAMs: {e}")
+        return None
+    finally:
+        conn.close()
+
 def auto_expire_notams():
-    """Check for expired active NOTAMs and move them to ARCHIVED."""
+    """Check for expired active NOTAMs and move them to ARCHIVED. Returns the number archived."""
     conn = get_db_connection()
     try:
-        now = datetime.utcnow().isoformat()
-        conn.execute('''
+        # Compared as times, not strings: rows written before _notam_time may carry
+        # microseconds or a 'T', which sort after a seconds-truncated 'now'.
+        cursor = conn.execute('''
             UPDATE notams 
             SET status = 'ARCHIVED', updated_at = CURRENT_TIMESTAMP
-            WHERE status = 'ACTIVE' AND valid_till_utc < ?
-        ''', (now,))
+            WHERE status = 'ACTIVE' AND julianday(valid_till_utc) <= julianday('now')
+        ''')
         conn.commit()
+        return cursor.rowcount
     except Exception as e:
         logger.error(f"Error expiring NOTAMs: {e}")
+        return 0
     finally:
         conn.close()
 
@@ -525,87 +745,6 @@ def create_aerodrome_warning(station_icao, message, valid_from, valid_to, create
     finally:
         conn.close()
 
-def get_active_aerodrome_warnings():
-    """
-    Get all active aerodrome warnings from the EXTERNAL Aerodrome App database.
-    Path: /home/mwomumbai/app/sql_app.db
-    """
-    
-    EXTERNAL_DB_PATH = '/home/mwomumbai/app/sql_app.db'
-
-    if not os.path.exists(EXTERNAL_DB_PATH):
-
-        if os.path.exists('met_data.db'):
-            conn = sqlite3.connect('met_data.db')
-            conn.row_factory = sqlite3.Row
-            now = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
-            cursor = conn.execute("SELECT * FROM aerodrome_warnings WHERE status = 'ACTIVE' AND valid_to > ?", (now,))
-            return [dict(row) for row in cursor.fetchall()]
-        return []
-
-    try:
-        import json
-        conn = sqlite3.connect(EXTERNAL_DB_PATH)
-        conn.row_factory = sqlite3.Row
-
-        cursor = conn.execute('''
-            SELECT * FROM alerts 
-            WHERE status IN ('FINALIZED', 'active')
-            ORDER BY created_at DESC
-        ''')
-        
-        rows = cursor.fetchall()
-        active_warnings = []
-        now = datetime.utcnow()
-        
-        for row in rows:
-            data = dict(row)
-            content_raw = data.get('content')
-            if not content_raw:
-                continue
-                
-            try:
-                content = json.loads(content_raw)
-                
-                station_icao = content.get('airport')
-                valid_to_iso = content.get('valid_until_iso')
-                message = content.get('generated_text')
-                
-                if not station_icao or not valid_to_iso:
-                    continue
-
-                try:
-                    
-                    valid_to_dt = datetime.fromisoformat(valid_to_iso.replace('Z', ''))
-                    
-                    if valid_to_dt > now:
-                        
-                        active_warnings.append({
-                            'station_icao': station_icao,
-                            'valid_to': valid_to_dt.strftime('%Y-%m-%d %H:%M:%S'),
-                            'message': message,
-                            'created_at': data.get('created_at')
-                        })
-                except Exception as ex:
-                    logger.error(f"Date parse error in sync logic: {ex}")
-                    
-            except Exception as ex:
-                logger.error(f"JSON parse error in sync logic: {ex}")
-                
-        return active_warnings
-        
-    except Exception as e:
-        logger.error(f"Error accessing external Aerodrome DB: {e}")
-        return []
-    finally:
-        if 'conn' in locals():
-            conn.close()
-
-def get_active_warning_for_station(station_icao):
-    """Filter from the consolidated active warnings list."""
-    all_warnings = get_active_aerodrome_warnings()
-    return [w for w in all_warnings if w['station_icao'].strip().upper() == station_icao.strip().upper()]
-
 def add_dynamic_button(section, label, btn_type, url=None, file_path=None, upload_id=None):
     """
     Adds a new dynamic button/link to a sidebar section.
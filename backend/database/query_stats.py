@@ -0,0 +1,78 @@
+import re
+import threading
+from collections import deque
+from datetime import datetime
+from functools import lru_cache
+from core.config import QUERY_STATS_MAX_STATEMENTS
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r'\b\d+(?:\.\d+)?\b')
+_WHITESPACE = re.compile(r'\s+')
+
+@lru_cache(maxsize=512)
+def normalize_sql(sql):
+    """Collapse whitespace and replace literals so equivalent statements group together."""
+    sql = _STRING_LITERAL.sub('?', sql)
+    sql = _NUMBER_LITERAL.sub('?', sql)
+    return _WHITESPACE.sub(' ', sql).strip()
+
+class QueryStats:
+    """
+    Aggregated per-statement timings plus a short history of slow statements.
+    Keeps at most max_statements entries, evicting the cheapest when full.
+    """
+
+    def __init__(self, max_statements=QUERY_STATS_MAX_STATEMENTS, slow_history=50):
+        self.max_statements = max_statements
+        self._lock = threading.Lock()
+        self._statements = {}
+        self._slow = deque(maxlen=slow_history)
+
+    def record(self, sql, operation, elapsed, rows):
+        key = normalize_sql(sql)
+        with self._lock:
+            entry = self._statements.get(key)
+            if entry is None:
+                if len(self._statements) >= self.max_statements:
+                    cheapest = min(self._statements, key=lambda k: self._statements[k]['total_seconds'])
+                    del self._statements[cheapest]
+                entry = self._statements[key] = {
+                    'sql': key,
+                    'operation': operation,
+                    'calls': 0,
+                    'rows': 0,
+                    'total_seconds': 0.0,
+                    'max_seconds': 0.0
+                }
+            entry['operation'] = operation
+            entry['calls'] += 1
+            entry['rows'] += max(rows, 0)
+            entry['total_seconds'] += elapsed
+            entry['max_seconds'] = max(entry['max_seconds'], elapsed)
+
+    def record_slow(self, sql, operation, elapsed, rows, plan):
+        with self._lock:
+            self._slow.append({
+                'sql': normalize_sql(sql),
+                'operation': operation,
+                'seconds': elapsed,
+                'rows': rows,
+                'plan': plan,
+                'at_utc': datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
+            })
+
+    def top(self, n=20, order_by='total_seconds'):
+        with self._lock:
+            entries = [dict(e) for e in self._statements.values()]
+            slow = list(self._slow)
+        for e in entries:
+            e['avg_seconds'] = e['total_seconds'] / e['calls'] if e['calls'] else 0.0
+        entries.sort(key=lambda e: e.get(order_by, 0), reverse=True)
+        return {'statements': entries[:n], 'slow': slow[::-1]}
+
+    def reset(self):
+        with self._lock:
+            self._statements.clear()
+            self._slow.clear()
+
+query_stats = QueryStats()
@@ -0,0 +1,125 @@
+import re
+import math
+from core.extensions import logger
+from .operations import get_db_connection
+
+RVR_TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+POSITIONS = ('TDZ', 'MID', 'END')
+
+def _group_by_runway(readings):
+    """Folds per-sensor records (runway, position, value, modifier, trend) into one row per runway."""
+    rows = {}
+    for reading in readings:
+        runway = re.sub(r'^RWY(?:MID|END)?', '', reading.get('runway', '').upper())
+        position = reading.get('position')
+        if not runway or position not in POSITIONS:
+            continue
+        row = rows.setdefault(runway, {'trend': None})
+        row['trend'] = row['trend'] or reading.get('trend')
+        row[position] = (reading.get('value'), reading.get('modifier'))
+    return rows
+
+def save_rvr_readings(readings, captured_at, source=None, station_icao='VABB'):
+    """
+    Appends one row per runway for a parsed RVR capture.
+    readings is the record list returned by fetch_live_rvr.
+    """
+    rows = _group_by_runway(readings)
+    if not rows:
+        return 0
+
+    captured = captured_at.strftime(RVR_TIME_FORMAT)
+    conn = get_db_connection()
+    try:
+        conn.executemany('''
+            INSERT OR IGNORE INTO rvr_readings
+            (station_icao, runway, captured_at, tdz_value, tdz_modifier, mid_value, mid_modifier,
+             end_value, end_modifier, trend, source)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', [
+            (station_icao, runway, captured,
+             *row.get('TDZ', (None, None)), *row.get('MID', (None, None)), *row.get('END', (None, None)),
+             row['trend'], source)
+            for runway, row in rows.items()
+        ])
+        conn.commit()
+        return len(rows)
+    except Exception as e:
+        logger.error(f"Error saving RVR readings: {e}")
+        return 0
+    finally:
+        conn.close()
+
+def get_rvr_history(start_dt, end_dt, runway=None, max_points=500, station_icao='VABB'):
+    """
+    RVR readings between start_dt and end_dt, oldest first.
+
+    When a runway has more than max_points readings in the range they are
+    downsampled into equal time buckets, keeping the lowest (worst) value
+    per sensor with that sample's modifier, so low-visibility dips survive
+    and an "M50" stays an "M50". Each bucket also carries the trend of its
+    last sample and its number of samples. Raw rows are returned otherwise.
+    """
+    start, end = start_dt.strftime(RVR_TIME_FORMAT), end_dt.strftime(RVR_TIME_FORMAT)
+    runway_clause = "AND runway = ?" if runway else ""
+    params = [station_icao, start, end] + ([runway] if runway else [])
+
+    conn = get_db_connection()
+    try:
+        count = conn.execute(f'''
+            SELECT MAX(n) FROM (
+                SELECT COUNT(*) AS n FROM rvr_readings
+                WHERE station_icao = ? AND captured_at >= ? AND captured_at <= ? {runway_clause}
+                GROUP BY runway
+            )
+        ''', params).fetchone()[0] or 0
+
+        if count <= max_points:
+            cursor = conn.execute(f'''
+                SELECT runway, captured_at, tdz_value, tdz_modifier, mid_value, mid_modifier,
+                       end_value, end_modifier, trend, 1 AS samples
+                FROM rvr_readings
+                WHERE station_icao = ? AND captured_at >= ? AND captured_at <= ? {runway_clause}
+                ORDER BY runway, captured_at
+            ''', params)
+            return {"bucket_seconds": None, "points": [dict(row) for row in cursor.fetchall()]}
+
+        bucket = max(1, math.ceil((end_dt - start_dt).total_seconds() / max_points))
+        # Per sensor, rank 1 is the bucket's lowest value (an M reading before an equal plain one)
+        ranks = ',\n'.join(
+            f"ROW_NUMBER() OVER (PARTITION BY runway, bucket ORDER BY {p}_value IS NULL, {p}_value, "
+            f"{p}_modifier IS NOT 'M') AS {p}_rank"
+            for p in ('tdz', 'mid', 'end')
+        )
+        worst = ',\n'.join(
+            f"MAX(CASE WHEN {p}_rank = 1 THEN {p}_value END) AS {p}_value, "
+            f"MAX(CASE WHEN {p}_rank = 1 THEN {p}_modifier END) AS {p}_modifier"
+            for p in ('tdz', 'mid', 'end')
+        )
+        cursor = conn.execute(f'''
+            WITH bucketed AS (
+                SELECT runway, captured_at, tdz_value, tdz_modifier, mid_value, mid_modifier,
+                       end_value, end_modifier, trend,
+                       (strftime('%s', captured_at) - strftime('%s', ?)) / ? AS bucket
+                FROM rvr_readings
+                WHERE station_icao = ? AND captured_at >= ? AND captured_at <= ? {runway_clause}
+            ), ranked AS (
+                SELECT *, {ranks},
+                       ROW_NUMBER() OVER (PARTITION BY runway, bucket ORDER BY captured_at DESC) AS recency
+                FROM bucketed
+            )
+            SELECT runway,
+                   datetime(strftime('%s', ?) + bucket * ?, 'unixepoch') AS captured_at,
+                   {worst},
+                   MAX(CASE WHEN recency = 1 THEN trend END) AS trend,
+                   COUNT(*) AS samples
+            FROM ranked
+            GROUP BY runway, bucket
+            ORDER BY runway, captured_at
+        ''', [start, bucket] + params + [start, bucket])
+        return {"bucket_seconds": bucket, "points": [dict(row) for row in cursor.fetchall()]}
+    except Exception as e:
+        logger.error(f"Error retrieving RVR history: {e}")
+        return {"bucket_seconds": None, "points": []}
+    finally:
+        conn.close()
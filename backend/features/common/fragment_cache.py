@@ -0,0 +1,73 @@
+import re
+import threading
+from core.metrics import record_cache_lookup
+
+FRAGMENT_MARKER = re.compile(r'<!--fragment:(\w+)-->')
+
+class FragmentCache:
+    """
+    Rendered HTML kept in memory per (content kind, variant).
+
+    Each content kind ('news', 'notices', 'buttons') has a version number that
+    writes bump through invalidate(); a cached fragment is served only while
+    the version it was rendered at is still current. Page shells are cached
+    per variant (role, user) with FRAGMENT_MARKER placeholders, pre-split so
+    assembling a page is a single join.
+    """
+
+    MAX_SHELLS = 64
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._versions = {}
+        self._fragments = {}
+        self._shells = {}
+
+    def invalidate(self, *kinds):
+        with self._lock:
+            for kind in kinds:
+                self._versions[kind] = self._versions.get(kind, 0) + 1
+
+    def fragment(self, kind, variant, render):
+        """Cached render() output for (kind, variant), re-rendered after invalidate(kind)."""
+        key = (kind, variant)
+        with self._lock:
+            version = self._versions.get(kind, 0)
+            cached = self._fragments.get(key)
+        hit = cached is not None and cached[0] == version
+        record_cache_lookup(f'fragment_{kind}', hit)
+        if hit:
+            return cached[1]
+
+        value = render()
+        with self._lock:
+            # A write during render() bumped the version; keep the result for this request only.
+            if self._versions.get(kind, 0) == version:
+                self._fragments[key] = (version, value)
+        return value
+
+    def page(self, variant, render_shell, fragments):
+        """
+        Joins the cached shell for variant with fragments (name -> html).
+        render_shell() must return the page with a FRAGMENT_MARKER for each name.
+        """
+        with self._lock:
+            parts = self._shells.get(variant)
+        record_cache_lookup('page_shell', parts is not None)
+        if parts is None:
+            parts = FRAGMENT_MARKER.split(render_shell())
+            with self._lock:
+                if len(self._shells) >= self.MAX_SHELLS:
+                    self._shells.clear()
+                self._shells[variant] = parts
+
+        out = []
+        for index, part in enumerate(parts):
+            out.append(fragments[part] if index % 2 else part)
+        return ''.join(out)
+
+    @staticmethod
+    def marker(name):
+        return f'<!--fragment:{name}-->'
+
+fragment_cache = FragmentCache()
@@ -4,27 +4,98 @@ import pytesseract
 from PIL import Image
 import io
 import re
+import hashlib
+from core.config import OCR_CACHE_MAX_BYTES
+from core.metrics import ocr_run_metrics, collect_ocr_duration
+from database import get_cached_ocr_text, save_cached_ocr_text
+
+# Identifies the preprocessing + Tesseract settings in OCR cache keys; change it when either changes.
+IMAGE_OCR_PIPELINE = "gray|fit3508|adaptive-denoise(2,6,nlm11)|otsu|--oem 3 --psm 3"
+
+# Long side of an A4 page at 300 DPI; larger captures (phone photos) are scaled down to it.
+MAX_OCR_LONG_SIDE = 3508
+# Estimated noise sigma thresholds: below LIGHT no filter, below HEAVY a median blur, else NL-means.
+NOISE_SIGMA_LIGHT = 2.0
+NOISE_SIGMA_HEAVY = 6.0
+
+_NOISE_KERNEL = np.array([[1, -2, 1], [-2, 4, -2], [1, -2, 1]], dtype=np.float32)
+
+def ocr_cache_key(filepath, pipeline):
+    """SHA-256 of the file bytes plus the pipeline description."""
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    digest.update(b'\0' + pipeline.encode())
+    return digest.hexdigest()
+
+def load_cached_ocr(key, source, metrics):
+    """Cached text for key, or None; the lookup is noted in metrics (see ocr_run_metrics)."""
+    text = get_cached_ocr_text(key)
+    metrics['cache_lookups'].append((f'ocr_{source}', text is not None))
+    return text
+
+def store_cached_ocr(key, text):
+    save_cached_ocr_text(key, text, OCR_CACHE_MAX_BYTES)
+
+def estimate_noise(gray):
+    """Immerkaer's fast noise sigma estimate for a grayscale image."""
+    height, width = gray.shape
+    if height < 3 or width < 3:
+        return 0.0
+    response = np.abs(cv2.filter2D(gray.astype(np.float32), -1, _NOISE_KERNEL))[1:-1, 1:-1]
+    return float(response.sum() * np.sqrt(0.5 * np.pi) / (6.0 * (width - 2) * (height - 2)))
+
+def downscale_for_ocr(gray, max_long_side=MAX_OCR_LONG_SIDE):
+    scale = max_long_side / max(gray.shape)
+    if scale >= 1:
+        return gray
+    return cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+
+def denoise_for_ocr(gray):
+    """Picks the cheapest filter the estimated noise level allows."""
+    sigma = estimate_noise(gray)
+    if sigma < NOISE_SIGMA_LIGHT:
+        return gray
+    if sigma < NOISE_SIGMA_HEAVY:
+        return cv2.medianBlur(gray, 3)
+    # A smaller search window than the 21px default is roughly 4x faster with little loss on text.
+    return cv2.fastNlMeansDenoising(gray, None, 10, 7, 11)
 
 def preprocess_image(filepath):
-    img = cv2.imread(filepath)
+    img = cv2.imread(filepath, cv2.IMREAD_GRAYSCALE)
     if img is None:
         raise ValueError("Could not load image")
 
-    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    gray = downscale_for_ocr(img)
 
-    denoised = cv2.fastNlMeansDenoising(gray, None, 10, 7, 21)
+    denoised = denoise_for_ocr(gray)
 
     _, thresh = cv2.threshold(denoised, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
 
     return Image.fromarray(thresh)
 
-def extract_text_from_image(filepath):
+def extract_text_from_image(filepath, metrics=None):
+    """
+    OCR text of an image upload; cache lookups and OCR time are added to
+    metrics when given (see ocr_run_metrics).
+    """
+    if metrics is None:
+        metrics = ocr_run_metrics()
     try:
-        pil_img = preprocess_image(filepath)
-        
-        custom_config = r'--oem 3 --psm 3'
-        text = pytesseract.image_to_string(pil_img, config=custom_config)
-        return text.strip()
+        cache_key = ocr_cache_key(filepath, IMAGE_OCR_PIPELINE)
+        cached = load_cached_ocr(cache_key, 'upload', metrics)
+        if cached is not None:
+            return cached
+
+        with collect_ocr_duration(metrics, 'upload'):
+            pil_img = preprocess_image(filepath)
+
+            custom_config = r'--oem 3 --psm 3'
+            text = pytesseract.image_to_string(pil_img, config=custom_config)
+        text = text.strip()
+        store_cached_ocr(cache_key, text)
+        return text
     except Exception as e:
         print(f"OCR Error: {e}")
         return ""
@@ -0,0 +1,130 @@
+import os
+import uuid
+import atexit
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from core.config import OCR_WORKERS
+from core.extensions import logger
+from core.metrics import observe_pdf_timings, observe_ocr_run
+from database import (
+    create_ocr_job, finish_ocr_job, get_unfinished_ocr_jobs,
+    create_news_draft, create_notice_draft, create_notam_drafts
+)
+from .ocr_worker import run_image_ocr, run_notam_parse
+from .fragment_cache import fragment_cache
+
+def _save_text_draft(create_draft, content):
+    def finish(job, result):
+        observe_ocr_run(result.get('metrics'))
+        draft_id = create_draft(job['filename'], result['ocr_text'], result['summary'],
+                                job['submitted_by'], job['upload_id'])
+        if not draft_id:
+            raise RuntimeError("Database Save Failed")
+        fragment_cache.invalidate(content)
+        return {'id': draft_id, 'summary': result['summary'], 'ocr_text': result['ocr_text'],
+                'filename': job['filename']}
+    return finish
+
+def _save_notam_draft(job, result):
+    observe_pdf_timings(result.get('timings'))
+    observe_ocr_run(result.get('metrics'))
+    if not result.get('success'):
+        raise RuntimeError("Failed to parse PDF content")
+    notam_ids = create_notam_drafts(job['filename'], result['items'], job['submitted_by'], job['upload_id'])
+    if not notam_ids:
+        raise RuntimeError("Database Save Failed")
+    return {'id': notam_ids[0], 'ids': notam_ids, 'count': len(notam_ids),
+            'text': result['formatted_text'], 'status': 'DRAFT',
+            'timings': result.get('timings', [])}
+
+# kind -> (function run in a worker process, parent-side step that saves the draft)
+JOB_KINDS = {
+    'news': (run_image_ocr, _save_text_draft(create_news_draft, 'news')),
+    'notices': (run_image_ocr, _save_text_draft(create_notice_draft, 'notices')),
+    'notam': (run_notam_parse, _save_notam_draft),
+}
+
+class OcrJobQueue:
+    """
+    Runs upload OCR in a pool of worker processes so requests return at once.
+
+    Jobs are persisted in ocr_jobs; the worker only computes the OCR result and
+    the parent saves the draft and marks the job DONE or FAILED. Workers come
+    from a forkserver (spawn on platforms without it) so they never inherit
+    the scheduler's threads or re-run app startup.
+    """
+
+    def __init__(self, max_workers):
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def _pool(self):
+        with self._lock:
+            if self._executor is None:
+                methods = multiprocessing.get_all_start_methods()
+                context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+                if 'forkserver' in methods:
+                    context.set_forkserver_preload(['features.common.ocr_worker'])
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context)
+            return self._executor
+
+    def _reset_pool(self, broken):
+        with self._lock:
+            if self._executor is broken:
+                self._executor = None
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def submit(self, kind, filename, file_path, upload_id, submitted_by):
+        """Queues OCR for a saved upload and returns the job id, or None if it could not be recorded."""
+        job = {
+            'id': uuid.uuid4().hex, 'kind': kind, 'filename': filename, 'file_path': file_path,
+            'upload_id': upload_id, 'submitted_by': submitted_by
+        }
+        if not create_ocr_job(job['id'], kind, filename, file_path, upload_id, submitted_by):
+            return None
+        self._dispatch(job)
+        return job['id']
+
+    def _dispatch(self, job):
+        work, _ = JOB_KINDS[job['kind']]
+        pool = self._pool()
+        try:
+            future = pool.submit(work, job['file_path'])
+        except BrokenProcessPool:
+            logger.warning("OCR worker pool was broken, restarting it")
+            self._reset_pool(pool)
+            future = self._pool().submit(work, job['file_path'])
+        future.add_done_callback(lambda f: self._finished(job, f))
+
+    def _finished(self, job, future):
+        _, save = JOB_KINDS[job['kind']]
+        try:
+            result = save(job, future.result())
+            finish_ocr_job(job['id'], 'DONE', result=result)
+        except Exception as e:
+            logger.error(f"OCR job {job['id']} ({job['kind']}) failed: {e}")
+            finish_ocr_job(job['id'], 'FAILED', error=str(e))
+            executor = self._executor
+            if isinstance(e, BrokenProcessPool) and executor is not None:
+                self._reset_pool(executor)
+
+    def resume(self):
+        """Re-dispatches jobs left queued by a previous run."""
+        for job in get_unfinished_ocr_jobs():
+            if job['kind'] not in JOB_KINDS or not os.path.exists(job['file_path']):
+                finish_ocr_job(job['id'], 'FAILED', error="Upload no longer available")
+                continue
+            logger.info(f"Resuming OCR job {job['id']} ({job['kind']})")
+            self._dispatch(job)
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+ocr_jobs = OcrJobQueue(OCR_WORKERS)
+atexit.register(ocr_jobs.shutdown)
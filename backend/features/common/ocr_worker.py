@@ -0,0 +1,16 @@
+"""
+Functions executed inside the OCR worker processes.
+Results go back to the parent, which writes drafts and job status and
+observes the metrics collected here (this process's registry is never scraped).
+"""
+from core.metrics import ocr_run_metrics
+from .ocr import extract_text_from_image, generate_summary
+
+def run_image_ocr(filepath):
+    metrics = ocr_run_metrics()
+    ocr_text = extract_text_from_image(filepath, metrics)
+    return {'ocr_text': ocr_text, 'summary': generate_summary(ocr_text), 'metrics': metrics}
+
+def run_notam_parse(filepath):
+    from features.notam.parser import parse_notam_pdf
+    return parse_notam_pdf(filepath)
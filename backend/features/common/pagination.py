@@ -0,0 +1,26 @@
+from flask import request, jsonify, render_template, abort, make_response
+from core.config import LIST_PAGE_SIZE, LIST_PAGE_MAX
+
+def page_args(listing):
+    """
+    (before cursor, limit, extra fields) from ?before=, ?limit= and ?fields=a,b.
+    A before cursor that is not one of listing's aborts the request with a 400.
+    """
+    limit = max(1, min(request.args.get('limit', LIST_PAGE_SIZE, type=int), LIST_PAGE_MAX))
+    fields = tuple(f.strip() for f in request.args.get('fields', '').split(',') if f.strip())
+    before = request.args.get('before') or None
+    if before:
+        try:
+            listing.parse_cursor(before)
+        except ValueError:
+            abort(make_response(jsonify({'error': 'Invalid cursor'}), 400))
+    return before, limit, fields
+
+def page_response(rows, next_cursor, template=None, **context):
+    """
+    {'items', 'next'} as JSON, or with ?format=html the rows rendered through
+    template (the same partial the page uses for its first page) as {'html', 'next'}.
+    """
+    if template and request.args.get('format') == 'html':
+        return jsonify({'html': render_template(template, **context), 'next': next_cursor})
+    return jsonify({'items': rows, 'next': next_cursor})
@@ -1,9 +1,12 @@
 from .routes import dashboard_bp
 from .rvr_image_service import capture_rvr_snapshot
+from .services import refresh_rvr_status
+from core.config import RVR_REFRESH_SECONDS
+from datetime import datetime
 from apscheduler.triggers.interval import IntervalTrigger
 
 def configure_rvr_scheduler(scheduler):
-    """Registers the RVR screenshot job."""
+    """Registers the RVR screenshot job and the /api/rvr/status refresher."""
     if not scheduler.get_job('rvr_screenshot_job'):
         scheduler.add_job(
             func=capture_rvr_snapshot,
@@ -14,3 +17,15 @@ def configure_rvr_scheduler(scheduler):
             coalesce=True,
             replace_existing=True
         )
+
+    if not scheduler.get_job('rvr_status_job'):
+        scheduler.add_job(
+            func=refresh_rvr_status,
+            trigger=IntervalTrigger(seconds=RVR_REFRESH_SECONDS),
+            id='rvr_status_job',
+            name='Refresh Live RVR Status',
+            max_instances=1,
+            coalesce=True,
+            next_run_time=datetime.now(),
+            replace_existing=True
+        )
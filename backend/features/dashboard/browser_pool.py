@@ -0,0 +1,71 @@
+import atexit
+import threading
+import logging
+from contextlib import contextmanager
+from selenium.common.exceptions import WebDriverException
+
+logger = logging.getLogger("mwo_app")
+
+class BrowserPool:
+    """
+    Keeps one warm WebDriver session for periodic jobs instead of launching
+    a browser per run. The session is health-checked before each use and
+    recycled after max_uses runs or whenever a run raises.
+    """
+
+    def __init__(self, factory, max_uses):
+        self.factory = factory
+        self.max_uses = max_uses
+        self._lock = threading.Lock()
+        self._driver = None
+        self._uses = 0
+
+    @contextmanager
+    def session(self):
+        with self._lock:
+            driver = self._ensure_driver()
+            try:
+                yield driver
+            except Exception:
+                self._discard()
+                raise
+
+            self._uses += 1
+            if self._uses >= self.max_uses:
+                logger.info(f"Recycling headless browser after {self._uses} uses")
+                self._discard()
+
+    def close(self):
+        with self._lock:
+            self._discard()
+
+    def _ensure_driver(self):
+        if self._driver is not None and not self._healthy():
+            logger.warning("Headless browser failed health check, restarting it")
+            self._discard()
+
+        if self._driver is None:
+            self._driver = self.factory()
+            self._uses = 0
+        return self._driver
+
+    def _healthy(self):
+        try:
+            self._driver.execute_script("return 1")
+            return True
+        except WebDriverException:
+            return False
+
+    def _discard(self):
+        if self._driver is not None:
+            try:
+                self._driver.quit()
+            except Exception:
+                pass
+        self._driver = None
+        self._uses = 0
+
+def create_pool(factory, max_uses):
+    pool = BrowserPool(factory, max_uses)
+    atexit.register(pool.close)
+    return pool
@@ -1,25 +1,56 @@
 from flask import Blueprint, render_template, request, jsonify
-from datetime import datetime, timedelta, time
-from core.config import STATIONS, DEFAULT_STATION
+from datetime import datetime, timedelta, time, timezone
+from core.stations import station_registry
 from core.extensions import logger
-from database import get_observations, get_latest_observation, get_active_warning_for_station
+from database import get_observations, get_latest_observation, get_active_warning_for_station, get_rvr_history
 from features.ogimet.services import fetch_station_data
-from .services import validate_day_completeness, format_observations, fetch_live_rvr
+from .services import validate_day_completeness, format_observations, rvr_status_cache
 
 dashboard_bp = Blueprint('dashboard', __name__)
 
 @dashboard_bp.route('/api/rvr/status')
 def get_rvr_status():
-    result = fetch_live_rvr()
-    return jsonify(result)
+    return jsonify(rvr_status_cache.get())
+
+def _parse_utc(value):
+    """ISO timestamp from a query string as naive UTC; offsets are converted, 'Z' is accepted."""
+    dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if dt.tzinfo:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
+
+@dashboard_bp.route('/api/rvr/history')
+def get_rvr_history_api():
+    """
+    Stored RVR readings, e.g. /api/rvr/history?runway=27&from=2026-01-05T00:00&to=2026-01-05T12:00
+    Defaults to the last 24 hours; long ranges are downsampled to at most `points` buckets per runway.
+    """
+    try:
+        end_dt = _parse_utc(request.args['to']) if request.args.get('to') else datetime.utcnow()
+        start_dt = _parse_utc(request.args['from']) if request.args.get('from') else end_dt - timedelta(hours=24)
+        max_points = min(max(request.args.get('points', 500, type=int), 10), 2000)
+    except ValueError as e:
+        return jsonify({"status": "error", "message": f"Invalid parameter: {e}"}), 400
+
+    if start_dt >= end_dt:
+        return jsonify({"status": "error", "message": "'from' must be before 'to'"}), 400
+
+    runway = request.args.get('runway', '').upper().replace('RWY', '').strip() or None
+    history = get_rvr_history(start_dt, end_dt, runway=runway, max_points=max_points)
+    return jsonify({
+        "status": "ok",
+        "runway": runway,
+        "from": start_dt.isoformat() + 'Z',
+        "to": end_dt.isoformat() + 'Z',
+        **history
+    })
 
 @dashboard_bp.route('/api/warnings/<station_code>')
 def get_station_warnings(station_code):
     try:
-        warnings = get_active_warning_for_station(station_code)
+        warnings = get_active_warning_for_station(station_code, limit=1)
         if warnings:
-            # Return the most recent active warning
-            latest_warning = warnings[0] # List is sorted by created_at DESC in get_active_aerodrome_warnings
+            latest_warning = warnings[0]
             return jsonify({
                 "active": True,
                 "message": latest_warning['message'],
@@ -33,17 +64,17 @@ def get_station_warnings(station_code):
 
 @dashboard_bp.route('/dashboard/<station_code>')
 def dashboard(station_code):
-    if station_code not in STATIONS:
+    if station_code not in station_registry:
         return "Station not found", 404
     
     return render_template('dashboard.html', 
-                         stations=STATIONS,
+                         stations=station_registry.names,
                          selected_station=station_code,
-                         station_name=STATIONS[station_code])
+                         station_name=station_registry.name(station_code))
 
 @dashboard_bp.route('/api/data')
 def get_data():
-    station = request.args.get('station', DEFAULT_STATION)
+    station = request.args.get('station', station_registry.default_icao)
     
     today = datetime.utcnow().date()
     
@@ -65,7 +96,7 @@ def get_data():
     }
     
     response_data = {
-        "station": STATIONS.get(station, station),
+        "station": station_registry.name(station, station),
         "station_code": station,
         "generated_at_utc": datetime.utcnow().isoformat(),
         "today_live": today_data,
@@ -113,7 +144,7 @@ def get_status():
         "stations": {}
     }
     
-    for icao, name in STATIONS.items():
+    for icao, name in station_registry.names.items():
         station_status = {
             "name": name,
             "days": []
@@ -194,7 +225,7 @@ def get_latest(station_code):
 
 @dashboard_bp.route('/api/live_data')
 def get_live_data():
-    station = request.args.get('station', DEFAULT_STATION)
+    station = request.args.get('station', station_registry.default_icao)
     today = datetime.utcnow().date()
     
     today_start = datetime.combine(today, time(0, 0, 0))
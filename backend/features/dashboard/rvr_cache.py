@@ -0,0 +1,61 @@
+import threading
+from datetime import datetime
+from core.extensions import logger
+from core.metrics import record_cache_lookup
+
+class RvrStatusCache:
+    """
+    Latest live RVR result, produced by a background refresher.
+    Readers only copy the cached result; at most one refresh runs at a time,
+    and a failed refresh keeps serving the last good readings.
+    """
+
+    def __init__(self, fetch):
+        self.fetch = fetch
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._result = None
+        self._updated_at = None
+        self._last_error = None
+
+    def refresh(self):
+        """Run one fetch unless another is already in flight. Returns False if skipped."""
+        if not self._refresh_lock.acquire(blocking=False):
+            return False
+        try:
+            result = self.fetch()
+            with self._lock:
+                if result.get('status') == 'ok' or self._result is None:
+                    self._result = result
+                    self._updated_at = datetime.utcnow()
+                self._last_error = None if result.get('status') == 'ok' else result.get('message')
+            return True
+        except Exception as e:
+            logger.error(f"RVR status refresh failed: {e}")
+            with self._lock:
+                self._last_error = str(e)
+            return True
+        finally:
+            self._refresh_lock.release()
+
+    def get(self):
+        with self._lock:
+            result, updated_at, last_error = self._result, self._updated_at, self._last_error
+
+        record_cache_lookup('rvr_status', result is not None)
+        if result is None:
+            return {
+                "status": "pending",
+                "data": [],
+                "message": "RVR data not yet available",
+                "source": None,
+                "updated_at_utc": None,
+                "age_seconds": None
+            }
+
+        response = dict(result)
+        response['updated_at_utc'] = updated_at.isoformat() + 'Z'
+        response['age_seconds'] = round((datetime.utcnow() - updated_at).total_seconds(), 1)
+        if last_error:
+            response['last_error'] = last_error
+        return response
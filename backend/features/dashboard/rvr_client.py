@@ -0,0 +1,135 @@
+import re
+import time
+from bs4 import BeautifulSoup
+from core.config import RVR_URL, RVR_DATA_URL, RVR_AIRPORT_FILTER, RVR_HTTP_TIMEOUT, RVR_HTTP_RETRY_SECONDS
+from core.extensions import logger, http_session
+from .rvr_screenshot import _parse_rvr_row
+from .rvr_ocr import RUNWAY_HEADER, PREFIXED_RUNWAY_CELL
+
+# A runway value in the column a header names as the runway ("27", "RWY 27", "09L")
+RUNWAY_CELL = re.compile(r'^(?:RWY)?\s*\d{2}[LRC]?$', re.IGNORECASE)
+
+def fetch_rvr_http():
+    """
+    Lightweight RVR fetch over HTTP, no browser or OCR.
+    Reads the JSON feed behind the table when RVR_DATA_URL is configured,
+    otherwise parses the rows already present in the page HTML.
+    Returns the _parse_ocr_output record list, or [] if nothing usable was
+    found (including when no row names RVR_AIRPORT_FILTER), so the caller
+    falls through to the screenshot tier.
+    """
+    start_time = time.time()
+    try:
+        if RVR_DATA_URL:
+            response = http_session.get(RVR_DATA_URL, timeout=RVR_HTTP_TIMEOUT)
+            response.raise_for_status()
+            rows = _rows_from_json(response.json())
+        else:
+            response = http_session.get(RVR_URL, timeout=RVR_HTTP_TIMEOUT)
+            response.raise_for_status()
+            rows = _rows_from_html(response.text)
+    except Exception as e:
+        logger.warning(f"RVR HTTP fetch failed: {e}")
+        return []
+
+    data = parse_rvr_rows(rows)
+    logger.info(f"RVR HTTP fetch finished in {time.time() - start_time:.2f}s. Extracted {len(data)} rows.")
+    return data
+
+class RvrHttpTier:
+    """
+    fetch_rvr_http, skipped for RVR_HTTP_RETRY_SECONDS after it comes back
+    empty. The live page renders its table with JavaScript, so without
+    RVR_DATA_URL the HTTP tier finds nothing; re-probing only occasionally
+    keeps it from costing up to RVR_HTTP_TIMEOUT on every refresh while
+    still noticing if the page or feed starts serving rows.
+    """
+
+    def __init__(self, fetch, retry_seconds):
+        self.fetch = fetch
+        self.retry_seconds = retry_seconds
+        self._skip_until = 0
+
+    def __call__(self):
+        if time.monotonic() < self._skip_until:
+            return []
+
+        data = self.fetch()
+        if data:
+            self._skip_until = 0
+        else:
+            logger.info(f"RVR HTTP tier found no rows, skipping it for {self.retry_seconds}s")
+            self._skip_until = time.monotonic() + self.retry_seconds
+        return data
+
+rvr_http_tier = RvrHttpTier(fetch_rvr_http, RVR_HTTP_RETRY_SECONDS)
+
+def parse_rvr_rows(rows):
+    """Records for the RVR_AIRPORT_FILTER rows of (cells, runway column or None) pairs."""
+    data = []
+    for cells, column in _filter_airport(rows):
+        data.extend(_parse_rvr_row(_from_runway_cell(cells, column)))
+    return data
+
+def _runway_column(cells):
+    return next((i for i, cell in enumerate(cells) if RUNWAY_HEADER.match(cell)), None)
+
+def _rows_from_html(html):
+    """
+    (cells, runway column) for each data row. The column comes from the
+    table's header row (th cells, or a td row naming RWY/RUNWAY); tables
+    without one give None.
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    rows = []
+    for table in soup.find_all('table'):
+        column = None
+        for tr in table.find_all('tr'):
+            headers = [th.get_text(' ', strip=True) for th in tr.find_all('th')]
+            cells = [td.get_text(' ', strip=True) for td in tr.find_all('td')]
+            if headers and not cells:
+                column = _runway_column(headers)
+                continue
+            if column is None and _runway_column(cells) is not None and not any(map(RUNWAY_CELL.match, cells)):
+                column = _runway_column(cells)
+                continue
+            if cells:
+                rows.append((cells, column))
+    return rows
+
+def _rows_from_json(payload):
+    if isinstance(payload, dict):
+        payload = payload.get('data') or payload.get('rows') or []
+
+    rows = []
+    for item in payload:
+        column = None
+        if isinstance(item, dict):
+            lowered = {str(k).lower(): v for k, v in item.items()}
+            if any(k in lowered for k in ('tdz', 'mid', 'end')):
+                item = [lowered.get('airport', ''), lowered.get('runway', lowered.get('rwy', '')),
+                        lowered.get('tdz', ''), lowered.get('mid', ''), lowered.get('end', '')]
+                column = 1
+            else:
+                item = list(item.values())
+        rows.append((['' if v is None else str(v).strip() for v in item], column))
+    return rows
+
+def _filter_airport(rows):
+    """Mirror the page's search box: keep only rows naming RVR_AIRPORT_FILTER (none if no row does)."""
+    needle = RVR_AIRPORT_FILTER.lower()
+    return [(cells, column) for cells, column in rows if any(needle in cell.lower() for cell in cells)]
+
+def _from_runway_cell(cells, column):
+    """
+    The row from its runway cell on: the header's runway column when known,
+    else the first cell explicitly prefixed RWY. [] if neither is a runway.
+    """
+    if column is not None:
+        if column < len(cells) and RUNWAY_CELL.match(cells[column]):
+            return [cells[column].replace(' ', '')] + cells[column + 1:]
+        return []
+    for i, cell in enumerate(cells):
+        if PREFIXED_RUNWAY_CELL.match(cell):
+            return [cell.replace(' ', '')] + cells[i + 1:]
+    return []
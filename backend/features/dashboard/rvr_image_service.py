@@ -8,11 +8,12 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
-from core.config import UPLOAD_FOLDER
+from core.config import UPLOAD_FOLDER, RVR_BROWSER_MAX_USES, RVR_URL
+from core.metrics import SELENIUM_LATENCY
+from .browser_pool import create_pool
 
 logger = logging.getLogger("mwo_app")
 
-RVR_URL = "http://rvrcamd.imd.gov.in:5000/live-rvr"
 SCREENSHOT_PATH = os.path.join(os.getcwd(), '..', 'frontend', 'static', 'rvr', 'latest_rvr.png')
 TEMP_SCREENSHOT_PATH = os.path.join(os.getcwd(), '..', 'frontend', 'static', 'rvr', 'temp_rvr.png')
 
@@ -46,42 +47,43 @@ def get_driver():
 
     return webdriver.Chrome(service=service, options=options)
 
+rvr_browser = create_pool(get_driver, RVR_BROWSER_MAX_USES)
+
 def capture_rvr_snapshot():
     """
     Captures a screenshot of the RVR table and saves it atomically.
-    Designed to be run by a background scheduler.
+    Designed to be run by a background scheduler; reuses the warm browser
+    session in rvr_browser and only reloads the page.
     """
-    driver = None
     try:
         start_time = time.time()
         logger.info("Starting RVR Screenshot Task...")
-        
-        driver = get_driver()
 
-        driver.set_page_load_timeout(30)
-        driver.get(RVR_URL)
+        with rvr_browser.session() as driver:
+            driver.set_page_load_timeout(30)
+            driver.get(RVR_URL)
 
-        wait = WebDriverWait(driver, 15)
+            wait = WebDriverWait(driver, 15)
 
-        try:
-            search_box = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, "input[type='search']")))
-            search_box.clear()
-            search_box.send_keys("Mumbai")
+            try:
+                search_box = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, "input[type='search']")))
+                search_box.clear()
+                search_box.send_keys("Mumbai")
 
-            wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "table.table tbody tr")))
-            time.sleep(1) 
-            
-        except Exception as e:
-            logger.warning(f"Search interaction failed, capturing default view: {e}")
+                wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "table.table tbody tr")))
+                time.sleep(1) 
+                
+            except Exception as e:
+                logger.warning(f"Search interaction failed, capturing default view: {e}")
 
-        try:
+            try:
 
-            target = driver.find_element(By.TAG_NAME, "body")
-        except Exception as e:
-            logger.error(f"Could not find body element: {e}")
-            return
+                target = driver.find_element(By.TAG_NAME, "body")
+            except Exception as e:
+                logger.error(f"Could not find body element: {e}")
+                return
 
-        target.screenshot(TEMP_SCREENSHOT_PATH)
+            target.screenshot(TEMP_SCREENSHOT_PATH)
 
         if os.path.exists(TEMP_SCREENSHOT_PATH) and os.path.getsize(TEMP_SCREENSHOT_PATH) > 0:
             
@@ -91,14 +93,8 @@ def capture_rvr_snapshot():
             logger.error("Screenshot file was empty or not created.")
 
         elapsed = time.time() - start_time
+        SELENIUM_LATENCY.labels(job='rvr_snapshot').observe(elapsed)
         logger.info(f"RVR Screenshot Task completed in {elapsed:.2f}s")
         
     except Exception as e:
         logger.error(f"RVR Screenshot Task Failed: {e}")
-
-    finally:
-        if driver:
-            try:
-                driver.quit()
-            except:
-                pass
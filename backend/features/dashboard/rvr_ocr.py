@@ -0,0 +1,347 @@
+import re
+import hashlib
+import threading
+import cv2
+import numpy as np
+import pytesseract
+from PIL import Image
+from core.config import RVR_AIRPORT_FILTER
+from core.metrics import OCR_LATENCY, track_duration, record_cache_lookup
+
+TABLE_OCR_CONFIG = r'--oem 3 --psm 6'
+ROW_OCR_CONFIG = r'--oem 3 --psm 7'
+# Value cells (runway, TDZ/MID/END, trend); header and airport cells are read without a whitelist
+CELL_OCR_CONFIG = r'--oem 3 --psm 6 -c tessedit_char_whitelist=0123456789PM-/LRCNUD'
+CELL_TEXT_OCR_CONFIG = r'--oem 3 --psm 6'
+
+RUNWAY_CELL = re.compile(r'[A-Z]*(\d{2}[LRC]?)')
+# Header cells naming the runway, airport and trend columns; shared with rvr_client
+RUNWAY_HEADER = re.compile(r'^(?:RWY|RUNWAY)\b', re.IGNORECASE)
+AIRPORT_HEADER = re.compile(r'^(?:AIRPORT|STATION)\b', re.IGNORECASE)
+TREND_HEADER = re.compile(r'^TREND\b', re.IGNORECASE)
+# Without a header only an explicitly prefixed cell is taken as the runway,
+# so a serial-number or ID column is never mistaken for one.
+PREFIXED_RUNWAY_CELL = re.compile(r'^RWY\s*(\d{2}[LRC]?)$', re.IGNORECASE)
+# Rows searched for the header row
+HEADER_SEARCH_ROWS = 3
+CELL_GAP = 12
+MIN_COLUMN_GAP = 15
+
+def _digest(arr):
+    return hashlib.sha1(str(arr.shape).encode() + arr.tobytes()).hexdigest()
+
+def _row_bands(arr, pad=2):
+    """
+    (top, bottom) pixel ranges of the text lines in a binarised table image.
+    Full-width rules count as separators and the constant ink of vertical
+    cell borders is subtracted, so grid lines do not merge rows together.
+    """
+    dark = (arr == 0).sum(axis=1)
+    is_rule = dark > 0.8 * arr.shape[1]
+    baseline = dark[~is_rule].min() if (~is_rule).any() else 0
+    ink_rows = np.flatnonzero((dark > baseline) & ~is_rule)
+    if ink_rows.size == 0:
+        return []
+
+    bands = []
+    start = prev = ink_rows[0]
+    for y in ink_rows[1:]:
+        if y != prev + 1:
+            bands.append((max(start - pad, 0), min(prev + pad + 1, arr.shape[0])))
+            start = y
+        prev = y
+    bands.append((max(start - pad, 0), min(prev + pad + 1, arr.shape[0])))
+    return bands
+
+class TableOcrGate:
+    """
+    Skips Tesseract when the binarised RVR table image has not changed.
+
+    An unchanged capture (exact hash) reuses the previously parsed rows.
+    Otherwise the image is split into text-line bands; bands seen before
+    reuse their cached text and only changed bands are OCR'd. When most
+    bands changed, one full-table OCR pass is cheaper than many per-line
+    passes and is used instead.
+    """
+
+    def __init__(self, max_cached_bands=256):
+        self.max_cached_bands = max_cached_bands
+        self._lock = threading.Lock()
+        self._last_digest = None
+        self._last_data = None
+        self._band_text = {}
+
+    def cached_result(self, image):
+        """Return (digest, previous parsed rows or None) for a binarised PIL image."""
+        arr = np.asarray(image.convert('L'))
+        digest = _digest(arr)
+        with self._lock:
+            hit = digest == self._last_digest and self._last_data is not None
+            record_cache_lookup('rvr_ocr', hit)
+            return digest, (self._last_data if hit else None)
+
+    def ocr(self, image):
+        """OCR a binarised PIL image, reusing cached text for unchanged row bands."""
+        arr = np.asarray(image.convert('L'))
+        bands = _row_bands(arr)
+        band_keys = [_digest(arr[top:bottom]) for top, bottom in bands]
+
+        with self._lock:
+            missing = [i for i, key in enumerate(band_keys) if key not in self._band_text]
+
+        if not bands or len(missing) * 2 > len(bands):
+            with track_duration(OCR_LATENCY, source='rvr'):
+                return pytesseract.image_to_string(image, config=TABLE_OCR_CONFIG)
+
+        texts = {}
+        with track_duration(OCR_LATENCY, source='rvr_rows'):
+            for i in missing:
+                top, bottom = bands[i]
+                texts[band_keys[i]] = pytesseract.image_to_string(
+                    Image.fromarray(arr[top:bottom]), config=ROW_OCR_CONFIG
+                ).strip()
+
+        with self._lock:
+            if len(self._band_text) + len(texts) > self.max_cached_bands:
+                self._band_text.clear()
+            self._band_text.update(texts)
+            band_text = dict(self._band_text, **texts)
+
+        return '\n'.join(band_text[key] for key in band_keys)
+
+    def remember(self, digest, image, text, data):
+        """Record a successful parse so identical captures and rows are reused."""
+        with self._lock:
+            self._last_digest = digest
+            self._last_data = data
+        if text is None:
+            return
+
+        arr = np.asarray(image.convert('L'))
+        bands = _row_bands(arr)
+        lines = [line for line in text.split('\n') if line.strip()]
+        with self._lock:
+            # A full-table pass lines up with the bands when Tesseract found one line per band.
+            if len(lines) == len(bands):
+                for (top, bottom), line in zip(bands, lines):
+                    self._band_text[_digest(arr[top:bottom])] = line.strip()
+
+def _line_positions(mask, axis, min_fraction):
+    """Centre coordinates of ruled lines in a line mask, merging adjacent pixel rows/cols."""
+    coverage = (mask > 0).sum(axis=axis)
+    length = mask.shape[axis]
+    hits = np.flatnonzero(coverage >= min_fraction * length)
+    positions = []
+    for group in np.split(hits, np.flatnonzero(np.diff(hits) > 1) + 1):
+        if group.size:
+            positions.append(int(group.mean()))
+    return positions
+
+def _gap_positions(ink, min_gap):
+    """Midpoints of blank runs at least min_gap long in a 1-D ink profile, plus both edges."""
+    blank = np.concatenate(([True], ink == 0, [True]))
+    edges = np.flatnonzero(np.diff(blank.astype(np.int8)))
+    # edges alternate ink-start / ink-end (in padded coordinates)
+    starts, ends = edges[0::2], edges[1::2]
+    positions = [0]
+    for prev_end, next_start in zip(ends[:-1], starts[1:]):
+        if next_start - prev_end >= min_gap:
+            positions.append(int((prev_end + next_start) // 2))
+    positions.append(len(ink))
+    return positions
+
+def locate_cells(arr):
+    """
+    Finds the table grid of a binarised image (0 = ink) as (row_edges, col_edges).
+    Ruled lines are picked out with morphological opening; tables drawn
+    without vertical rules fall back to whitespace gaps between text columns.
+    """
+    ink = (arr == 0).astype(np.uint8) * 255
+    height, width = ink.shape
+
+    horizontal = cv2.morphologyEx(ink, cv2.MORPH_OPEN, cv2.getStructuringElement(cv2.MORPH_RECT, (max(width // 4, 1), 1)))
+    vertical = cv2.morphologyEx(ink, cv2.MORPH_OPEN, cv2.getStructuringElement(cv2.MORPH_RECT, (1, max(height // 8, 1))))
+
+    row_edges = _line_positions(horizontal, 1, 0.5)
+    col_edges = _line_positions(vertical, 0, 0.3)
+
+    text_only = cv2.subtract(ink, cv2.bitwise_or(horizontal, vertical))
+    if len(row_edges) < 3:
+        bands = _row_bands(255 - text_only, pad=0)
+        row_edges = [0] + [int((prev[1] + nxt[0]) // 2) for prev, nxt in zip(bands, bands[1:])] + [height]
+    if len(col_edges) < 3:
+        # Titles and footers span several columns, so split each row on its own
+        # whitespace and keep the layout shared by the rows with the most cells.
+        per_row = [_gap_positions(text_only[top:bottom].sum(axis=0), MIN_COLUMN_GAP)
+                   for top, bottom in zip(row_edges, row_edges[1:])]
+        widest = max(len(edges) for edges in per_row)
+        col_edges = np.median([edges for edges in per_row if len(edges) == widest], axis=0).astype(int).tolist()
+
+    return sorted(set(row_edges)), sorted(set(col_edges))
+
+class RvrCellReader:
+    """
+    Grid-aware RVR table OCR.
+
+    Cells are located once per layout (keyed by image size, since the page
+    renders the same table every capture) and cached, together with the
+    runway, airport and trend columns named by the header row. The wanted
+    cells are cropped, stacked into a single strip and recognised in one
+    Tesseract call; word boxes are mapped back to their cells by position.
+    """
+
+    def __init__(self, max_layouts=8):
+        self.max_layouts = max_layouts
+        self._lock = threading.Lock()
+        self._layouts = {}
+        self._headers = {}
+
+    def layout(self, arr):
+        key = arr.shape
+        with self._lock:
+            cells = self._layouts.get(key)
+        record_cache_lookup('rvr_cells', cells is not None)
+        if cells is None:
+            cells = locate_cells(arr)
+            with self._lock:
+                if len(self._layouts) >= self.max_layouts:
+                    self._layouts.clear()
+                self._layouts[key] = cells
+        return cells
+
+    def forget(self, shape):
+        """Drops a cached layout, e.g. when the page changed and it no longer yields rows."""
+        with self._lock:
+            self._layouts.pop(shape, None)
+            self._headers.pop(shape, None)
+
+    def header(self, arr):
+        """
+        (header row, runway column, airport column, trend column) from the
+        first of the top rows with a cell naming RWY/RUNWAY, or None if there
+        is no such row. The airport and trend columns are None when unnamed.
+        """
+        key = arr.shape
+        with self._lock:
+            if key in self._headers:
+                return self._headers[key]
+
+        rows = self.read_cells(arr, lambda r, c: r < HEADER_SEARCH_ROWS, CELL_TEXT_OCR_CONFIG)
+        header = None
+        for r, cells in enumerate(rows[:HEADER_SEARCH_ROWS]):
+            # A data row's "RWY 27" names a runway, not the column
+            if any(PREFIXED_RUNWAY_CELL.match(cell) for cell in cells):
+                continue
+            runway = _find_column(cells, RUNWAY_HEADER)
+            if runway is not None:
+                header = (r, runway, _find_column(cells, AIRPORT_HEADER), _find_column(cells, TREND_HEADER))
+                break
+
+        with self._lock:
+            self._headers[key] = header
+        return header
+
+    def read_cells(self, arr, wanted=None, config=CELL_OCR_CONFIG):
+        """
+        OCR the cells for which wanted(row, column) is true (all by default)
+        in one Tesseract pass; returns a list of rows of cell strings.
+        """
+        row_edges, col_edges = self.layout(arr)
+        crops, spans = [], []
+        offset = CELL_GAP
+        for r, (top, bottom) in enumerate(zip(row_edges, row_edges[1:])):
+            for c, (left, right) in enumerate(zip(col_edges, col_edges[1:])):
+                if wanted is not None and not wanted(r, c):
+                    continue
+                crop = arr[top + 1:bottom - 1, left + 1:right - 1]
+                if crop.size == 0 or not (crop == 0).any():
+                    continue
+                crops.append(crop)
+                spans.append((offset, offset + crop.shape[0], r, c))
+                offset += crop.shape[0] + CELL_GAP
+
+        rows = [[''] * (len(col_edges) - 1) for _ in range(len(row_edges) - 1)]
+        if not crops:
+            return rows
+
+        strip = np.full((offset, max(c.shape[1] for c in crops) + 2 * CELL_GAP), 255, dtype=np.uint8)
+        for crop, (top, bottom, _, _) in zip(crops, spans):
+            strip[top:bottom, CELL_GAP:CELL_GAP + crop.shape[1]] = crop
+
+        with track_duration(OCR_LATENCY, source='rvr_cells'):
+            words = pytesseract.image_to_data(Image.fromarray(strip), config=config,
+                                              output_type=pytesseract.Output.DICT)
+
+        for text, top, height in zip(words['text'], words['top'], words['height']):
+            text = text.strip()
+            if not text:
+                continue
+            centre = top + height / 2
+            for span_top, span_bottom, r, c in spans:
+                if span_top - CELL_GAP / 2 <= centre < span_bottom + CELL_GAP / 2:
+                    rows[r][c] = f"{rows[r][c]} {text}".strip()
+                    break
+        return rows
+
+    def read(self, image, parse_row):
+        """
+        Parses RVR records for RVR_AIRPORT_FILTER from a binarised PIL image.
+        The runway column is the one the header row names; the three columns
+        after it are TDZ, MID and END, followed by the trend. Without a header
+        only RWY-prefixed cells are taken as runways, as in rvr_client, so a
+        serial-number column is never read as one. Rows whose airport cell
+        does not name RVR_AIRPORT_FILTER are dropped. parse_row is
+        rvr_screenshot._parse_rvr_row.
+        """
+        arr = np.asarray(image.convert('L'))
+        if arr.mean() < 128:
+            arr = 255 - arr
+
+        header = self.header(arr)
+        data = [record for cells in (self._header_rows(arr, header) if header else self._prefixed_rows(arr))
+                for record in parse_row(cells)]
+
+        if not data:
+            self.forget(arr.shape)
+        return data
+
+    def _header_rows(self, arr, header):
+        """[runway, TDZ, MID, END, trend] for each airport row under the header."""
+        header_row, runway, airport, trend = header
+        trend = runway + 4 if trend is None else trend
+        values = self.read_cells(arr, lambda r, c: r > header_row and (runway <= c <= runway + 3 or c == trend))
+        airports = None
+        if airport is not None:
+            airports = self.read_cells(arr, lambda r, c: r > header_row and c == airport, CELL_TEXT_OCR_CONFIG)
+
+        rows = []
+        for r, cells in enumerate(values):
+            if r <= header_row or runway >= len(cells):
+                continue
+            cells = [cell.replace(' ', '') for cell in cells]
+            if airports is not None and not _names_airport(airports[r][airport]):
+                continue
+            match = RUNWAY_CELL.fullmatch(cells[runway])
+            if match:
+                trend_cell = cells[trend] if trend < len(cells) else ''
+                rows.append([match.group(1)] + [v or '---' for v in cells[runway + 1:runway + 4]] + [trend_cell])
+        return rows
+
+    def _prefixed_rows(self, arr):
+        """The same rows for a table without a header: airport rows with an RWY-prefixed cell."""
+        rows = []
+        for cells in self.read_cells(arr, config=CELL_TEXT_OCR_CONFIG):
+            if not any(_names_airport(cell) for cell in cells):
+                continue
+            for i, cell in enumerate(cells):
+                match = PREFIXED_RUNWAY_CELL.match(cell)
+                if match:
+                    rows.append([match.group(1)] + [v or '---' for v in cells[i + 1:i + 5]])
+                    break
+        return rows
+
+def _find_column(cells, pattern):
+    return next((i for i, cell in enumerate(cells) if pattern.match(cell.strip())), None)
+
+def _names_airport(cell):
+    return RVR_AIRPORT_FILTER.lower() in cell.lower()
@@ -1,68 +1,62 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-import pytesseract
-from PIL import Image, ImageOps, ImageEnhance
+from PIL import Image
 import io
 import re
+from core.config import RVR_URL
 from core.extensions import logger
+from core.metrics import SELENIUM_LATENCY
+from .rvr_ocr import TableOcrGate, RvrCellReader
+from .rvr_image_service import rvr_browser
 import time
 
-from selenium.webdriver.chrome.service import Service
+# Reuses the last parse when the thresholded table image is unchanged between captures.
+table_ocr_gate = TableOcrGate()
+# Grid-aware per-cell OCR; keeps the located cell layout across captures.
+rvr_cell_reader = RvrCellReader()
 
 def fetch_rvr_screenshot():
     """
     Strict Screenshot-Only RVR Fetcher.
-    Selenium -> Screenshot -> OCR -> Parse.
+    Selenium -> Screenshot -> OCR -> Parse, in the warm rvr_browser session
+    shared with the snapshot job rather than a browser launched per call.
     """
-    options = Options()
-    options.binary_location = "/usr/bin/chromium"
-    options.add_argument("--headless")
-    options.add_argument("--disable-gpu")
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
-    options.add_argument("--window-size=1920,1080")
-    options.add_argument("--disable-images")
-    options.add_argument("--page-load-strategy=eager") 
-    options.add_argument("--blink-settings=imagesEnabled=false")
-    
-    driver = None
     try:
         start_time = time.time()
         logger.info("Starting Screenshot-Only RVR Fetch...")
-        service = Service("/usr/bin/chromedriver")
-        driver = webdriver.Chrome(service=service, options=options)
 
-        driver.set_page_load_timeout(30) 
-        try:
-            driver.get("http://rvrcamd.imd.gov.in:5000/live-rvr")
-        except:
-            logger.warning("Page load timeout (continuing to check DOM)...")
+        with rvr_browser.session() as driver:
+            driver.set_page_load_timeout(30) 
+            try:
+                driver.get(RVR_URL)
+            except:
+                logger.warning("Page load timeout (continuing to check DOM)...")
 
-        wait = WebDriverWait(driver, 15)
-        
-        try:
+            wait = WebDriverWait(driver, 15)
             
-            search_box = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, "input[type='search']")))
-            search_box.clear()
-            search_box.send_keys("Mumbai")
-            
-            wait.until(EC.presence_of_element_located((By.XPATH, "//td[contains(text(), '27') or contains(text(), '14') or contains(text(), '09') or contains(text(), '32')]")))
-            time.sleep(2) 
-        except Exception as e:
-            logger.warning(f"Search/Filter interaction failed: {e}")
-
-        png_data = None
-        try:
-            
-            table = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "table.table, table.dataTable")))
-            png_data = table.screenshot_as_png
-        except Exception as e:
-            logger.warning(f"Specific table selection failed: {e}. Capturing full body.")
-            body = driver.find_element(By.TAG_NAME, "body")
-            png_data = body.screenshot_as_png
+            try:
+                
+                search_box = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, "input[type='search']")))
+                search_box.clear()
+                search_box.send_keys("Mumbai")
+                
+                wait.until(EC.presence_of_element_located((By.XPATH, "//td[contains(text(), '27') or contains(text(), '14') or contains(text(), '09') or contains(text(), '32')]")))
+                time.sleep(2) 
+            except Exception as e:
+                logger.warning(f"Search/Filter interaction failed: {e}")
+
+            png_data = None
+            try:
+                
+                table = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "table.table, table.dataTable")))
+                png_data = table.screenshot_as_png
+            except Exception as e:
+                logger.warning(f"Specific table selection failed: {e}. Capturing full body.")
+                body = driver.find_element(By.TAG_NAME, "body")
+                png_data = body.screenshot_as_png
+
+        SELENIUM_LATENCY.labels(job='rvr_status').observe(time.time() - start_time)
 
         image = Image.open(io.BytesIO(png_data))
         
@@ -75,11 +69,30 @@ def fetch_rvr_screenshot():
         
         image = image.point(lambda x: 0 if x < 140 else 255, '1')
 
-        custom_config = r'--oem 3 --psm 6'
-        text = pytesseract.image_to_string(image, config=custom_config)
-        logger.info(f"OCR Content Snippet: {text[:100]}...")
+        digest, cached = table_ocr_gate.cached_result(image)
+        if cached is not None:
+            logger.info(f"RVR table unchanged since last capture, skipped OCR ({time.time() - start_time:.2f}s).")
+            return {
+                "status": "ok",
+                "data": [dict(row) for row in cached],
+                "message": "Extracted via screenshot OCR (unchanged table, OCR skipped)",
+                "source": "SCREENSHOT"
+            }
+
+        text = None
+        try:
+            data = rvr_cell_reader.read(image, _parse_rvr_row)
+        except Exception as e:
+            logger.warning(f"Per-cell RVR OCR failed, falling back to full-table OCR: {e}")
+            data = []
 
-        data = _parse_ocr_output(text)
+        if not data:
+            text = table_ocr_gate.ocr(image)
+            logger.info(f"OCR Content Snippet: {text[:100]}...")
+            data = _parse_ocr_output(text)
+
+        if data:
+            table_ocr_gate.remember(digest, image, text, data)
         
         elapsed = time.time() - start_time
         logger.info(f"Pipeline finished in {elapsed:.2f}s. Extracted {len(data)} rows.")
@@ -100,11 +113,6 @@ def fetch_rvr_screenshot():
         msg = str(e)
         logger.error(f"Screenshot Pipeline Critical Failure: {e}")
         return _error_response(f"Pipeline Failed: {msg}")
-        
-    finally:
-        if driver:
-            try: driver.quit()
-            except: pass
 
 def _error_response(msg):
     return {
@@ -123,82 +131,90 @@ def _parse_ocr_output(text):
     data = []
     lines = text.split('\n')
 
-    rwy_pattern = re.compile(r'\b(?:\d{2}[A-Z]?)\b')
-    
     for line in lines:
         line = line.strip()
         if not line: continue
 
         if "RWY" in line.upper() and "TDZ" in line.upper(): continue
         
-        parts = line.split()
-        if len(parts) < 2: continue 
+        data.extend(_parse_rvr_row(line.split()))
 
-        rwy_candidate = parts[0].upper().replace("RWY", "")
-        if not re.match(r'^\d{2}[A-Z]?$', rwy_candidate):
-            continue
-            
-        rwy_id = f"RWY{rwy_candidate}"
+    return data
 
-        readings = parts[1:]
+def _parse_rvr_row(parts):
+    """
+    Parses one RVR table row given as cells/tokens: runway, TDZ, MID, END.
+    Shared by the OCR path and the HTTP client (rvr_client).
+    """
+    if len(parts) < 2: return []
 
-        def parse_sensor(token, default_name):
-            
-            raw = token.upper().replace('M', '').strip()
-
-            if '---' in raw or '///' in raw or raw == '':
-                return {
-                    "runway": rwy_id, 
-
-                    "value": None,
-                    "modifier": None,
-                    "unit": "m",
-                    "status": "NO_DATA"
-                }
-
-            modifier = None
-            value = None
-
-            if raw.startswith('P') or raw.startswith('M'):
-                modifier = raw[0]
-                val_str = raw[1:]
-            else:
-                val_str = raw
-
-            if val_str.isdigit():
-                value = int(val_str)
-                return {
-                    "runway": default_name if default_name else rwy_id, 
-                    "value": value,
-                    "modifier": modifier,
-                    "unit": "m",
-                    "status": "OK"
-                }
-
-            return None 
-
-        row_sensors = []
-
-        if len(readings) > 0:
-            parsed = parse_sensor(readings[0], rwy_id) 
+    rwy_candidate = parts[0].upper().replace("RWY", "")
+    if not re.match(r'^\d{2}[A-Z]?$', rwy_candidate):
+        return []
+        
+    rwy_id = f"RWY{rwy_candidate}"
+
+    readings = parts[1:]
+    trend = next((t.upper() for t in readings if t.upper() in ('N', 'U', 'D')), None)
+
+    def parse_sensor(token, default_name, position):
+        
+        raw = token.upper().replace('M', '').strip()
+
+        if '---' in raw or '///' in raw or raw == '':
+            return {
+                "runway": rwy_id, 
+
+                "value": None,
+                "modifier": None,
+                "unit": "m",
+                "status": "NO_DATA",
+                "position": position,
+                "trend": trend
+            }
+
+        modifier = None
+        value = None
+
+        if raw.startswith('P') or raw.startswith('M'):
+            modifier = raw[0]
+            val_str = raw[1:]
+        else:
+            val_str = raw
+
+        if val_str.isdigit():
+            value = int(val_str)
+            return {
+                "runway": default_name if default_name else rwy_id, 
+                "value": value,
+                "modifier": modifier,
+                "unit": "m",
+                "status": "OK",
+                "position": position,
+                "trend": trend
+            }
+
+        return None 
+
+    row_sensors = []
+
+    if len(readings) > 0:
+        parsed = parse_sensor(readings[0], rwy_id, "TDZ") 
+        if parsed: row_sensors.append(parsed)
+
+    if len(readings) > 1:
+        
+        if readings[1] in ['N', 'U', 'D', 'n', 'u', 'd']:
+            pass 
+        else:
+            parsed = parse_sensor(readings[1], f"RWYMID{rwy_candidate}", "MID") 
             if parsed: row_sensors.append(parsed)
 
-        if len(readings) > 1:
-            
-            if readings[1] in ['N', 'U', 'D', 'n', 'u', 'd']:
-                pass 
-            else:
-                parsed = parse_sensor(readings[1], f"RWYMID{rwy_candidate}") 
-                if parsed: row_sensors.append(parsed)
-
-        if len(readings) > 2:
-            if readings[2] in ['N', 'U', 'D', 'n', 'u', 'd']:
-                pass
-            else:
-                parsed = parse_sensor(readings[2], f"RWYEND{rwy_candidate}")
-                if parsed: row_sensors.append(parsed)
-
-        if row_sensors:
-            data.extend(row_sensors)
+    if len(readings) > 2:
+        if readings[2] in ['N', 'U', 'D', 'n', 'u', 'd']:
+            pass
+        else:
+            parsed = parse_sensor(readings[2], f"RWYEND{rwy_candidate}", "END")
+            if parsed: row_sensors.append(parsed)
 
-    return data
+    return row_sensors
@@ -7,7 +7,9 @@ import pytesseract
 from PIL import Image
 import io
 import time
+from core.config import RVR_URL
 from core.extensions import logger
+from core.metrics import OCR_LATENCY, SELENIUM_LATENCY, track_duration
 
 from selenium.webdriver.chrome.service import Service
 
@@ -27,11 +29,12 @@ def fetch_rvr_fallback():
     driver = None
     try:
         logger.info("Starting Selenium RVR fallback...")
+        start_time = time.time()
         service = Service("/usr/bin/chromedriver")
         driver = webdriver.Chrome(service=service, options=options)
 
         driver.set_page_load_timeout(10)
-        driver.get("http://rvrcamd.imd.gov.in:5000/live-rvr")
+        driver.get(RVR_URL)
 
         wait = WebDriverWait(driver, 5)
 
@@ -50,13 +53,16 @@ def fetch_rvr_fallback():
              
             png_data = driver.get_screenshot_as_png()
 
+        SELENIUM_LATENCY.labels(job='rvr_fallback').observe(time.time() - start_time)
+
         image = Image.open(io.BytesIO(png_data))
         
         image = image.convert('L')
         
         image = image.point(lambda x: 0 if x < 128 else 255, '1')
 
-        text = pytesseract.image_to_string(image)
+        with track_duration(OCR_LATENCY, source='rvr_fallback'):
+            text = pytesseract.image_to_string(image)
         logger.debug(f"OCR Output: {text}")
 
         data = parse_ocr_text(text)
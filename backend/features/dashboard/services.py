@@ -1,16 +1,41 @@
 from datetime import datetime, timedelta
 from core.config import MIN_OBSERVATIONS_PER_DAY, MIN_HOUR_SPREAD
 from core.extensions import logger
+from database import save_rvr_readings
 from .rvr_screenshot import fetch_rvr_screenshot
+from .rvr_client import rvr_http_tier
+from .rvr_cache import RvrStatusCache
 
 def fetch_live_rvr(station_code="VABB"):
     """
     Fetch live RVR data.
-    Method: STRICT SCREENSHOT ONLY (Selenium + OCR).
+    Tier 1: HTTP + HTML/JSON parsing (rvr_client), skipped for a while once it yields nothing.
+    Tier 2: screenshot in the pooled browser + OCR, only when tier 1 yields nothing.
     """
+    data = rvr_http_tier()
+    if data:
+        return {
+            "status": "ok",
+            "data": data,
+            "message": "Extracted from page data",
+            "source": "HTTP"
+        }
 
     return fetch_rvr_screenshot()
 
+def fetch_and_record_rvr():
+    """fetch_live_rvr, appending successful readings to the rvr_readings history."""
+    result = fetch_live_rvr()
+    if result.get('status') == 'ok':
+        save_rvr_readings(result['data'], datetime.utcnow(), source=result.get('source'))
+    return result
+
+rvr_status_cache = RvrStatusCache(fetch_and_record_rvr)
+
+def refresh_rvr_status():
+    """Scheduler entry point: refresh the cached /api/rvr/status result."""
+    rvr_status_cache.refresh()
+
 def validate_day_completeness(observations):
     """
     Validate if a day has sufficient data coverage for the full 24-hour period.
@@ -1,7 +1,8 @@
 import os
 from flask import Blueprint, render_template, request, jsonify, session, send_from_directory, current_app, redirect, url_for
 from werkzeug.utils import secure_filename
-from core.config import UPLOAD_FOLDER, ALLOWED_EXTENSIONS, STATIONS
+from core.config import UPLOAD_FOLDER, ALLOWED_EXTENSIONS
+from core.stations import station_registry
 from datetime import datetime
 from database.operations import track_admin_upload, delete_admin_upload_by_path
 
@@ -61,8 +62,8 @@ def list_documents(module_type, section):
                          module_type=module_type, 
                          section=section,
                          title=f"{module_type.upper()} - {section.title()}",
-                         stations=STATIONS,
-                         default_station="VABB")
+                         stations=station_registry.names,
+                         default_station=station_registry.default_icao)
 
 @documents_bp.route('/api/documents/upload/<module_type>/<section>', methods=['POST'])
 def upload_document(module_type, section):
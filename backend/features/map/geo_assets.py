@@ -0,0 +1,78 @@
+import os
+import json
+import threading
+from flask import url_for
+from core.config import GEO_ASSET_MANIFEST
+from core.extensions import logger
+
+# Preferred first; each variant is written next to the identity file by scripts/build_geo_assets.py
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+class GeoAssets:
+    """
+    The manifest written by scripts/build_geo_assets.py, re-read whenever the
+    file changes on disk so a rebuild is picked up without a restart.
+    """
+
+    def __init__(self, manifest_path):
+        self.manifest_path = manifest_path
+        self.directory = os.path.dirname(manifest_path)
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._entries = {}
+        self._files = frozenset()
+
+    def _load(self):
+        try:
+            mtime = os.stat(self.manifest_path).st_mtime
+        except OSError:
+            return {}, frozenset()
+
+        with self._lock:
+            if mtime != self._mtime:
+                try:
+                    with open(self.manifest_path) as f:
+                        entries = json.load(f)
+                    self._entries = entries
+                    self._files = frozenset(entry['file'] for entry in entries.values())
+                    self._mtime = mtime
+                except (OSError, ValueError, KeyError) as e:
+                    logger.error(f"Error reading geo asset manifest: {e}")
+            return self._entries, self._files
+
+    def url(self, name):
+        """Content-hashed URL of the built asset for name (a GeoJSON file stem), or None."""
+        entry = self._load()[0].get(name)
+        return url_for('map.get_geo_asset', filename=entry['file']) if entry else None
+
+    def levels(self, name):
+        """
+        Built levels of detail for name, coarsest first: the <name>-lod<i> entries
+        and the full-resolution asset as the finest (tolerance 0).
+        """
+        entries = self._load()[0]
+        levels = [entry for asset_name, entry in entries.items()
+                  if asset_name == name or entry.get('lod_of') == name]
+        return sorted(levels, key=lambda entry: -entry.get('tolerance', 0))
+
+    @staticmethod
+    def pick_level(levels, resolution):
+        """The coarsest level whose tolerance fits within resolution (degrees per pixel)."""
+        for entry in levels:
+            if entry.get('tolerance', 0) <= resolution:
+                return entry
+        return levels[-1]
+
+    def negotiate(self, filename, accept_encodings):
+        """
+        (file to send, Content-Encoding or None) for a manifest file, picking the
+        first precompressed variant the client accepts; None if filename is unknown.
+        """
+        if filename not in self._load()[1]:
+            return None
+        for encoding, suffix in ENCODINGS:
+            if accept_encodings[encoding] and os.path.exists(os.path.join(self.directory, filename + suffix)):
+                return filename + suffix, encoding
+        return filename, None
+
+geo_assets = GeoAssets(GEO_ASSET_MANIFEST)
@@ -1,78 +1,178 @@
 import os
-from flask import Blueprint, render_template, request, jsonify, session, redirect, url_for, send_from_directory, current_app
+import math
+from flask import Blueprint, render_template, render_template_string, request, jsonify, session, redirect, url_for, send_from_directory, current_app
+from markupsafe import Markup
 from datetime import datetime, timedelta
 from werkzeug.utils import secure_filename
-from core.config import (
-    STATIONS, STATION_COORDS, MAHARASHTRA_CENTER, MAHARASHTRA_ZOOM,
-    UPLOAD_FOLDER, ALLOWED_EXTENSIONS
-)
-from features.common.ocr import extract_text_from_image, generate_summary
+from jinja2.utils import htmlsafe_json_dumps
+from core.config import (UPLOAD_FOLDER, ALLOWED_EXTENSIONS, LIST_PAGE_SIZE, GEOJSON_DIR, GEO_ASSET_MAX_AGE,
+                         QUERY_STATS_MAX_STATEMENTS)
+from core.stations import station_registry
+from core.extensions import logger
+from features.common.ocr_jobs import ocr_jobs
+from features.common.pagination import page_args, page_response
+from features.common.fragment_cache import fragment_cache
+from .geo_assets import geo_assets
 from database import (
-    add_news_item, get_news_items, delete_news_item,
-    create_news_draft, publish_news,
-    add_notice_item, get_notice_items, delete_notice_item,
-    create_notice_draft, publish_notice,
+    add_news_item, get_news_page, delete_news_item,
+    publish_news,
+    add_notice_item, get_notices_page, delete_notice_item,
+    publish_notice,
     get_sigmet_status,
     add_dynamic_button, delete_dynamic_button, get_dynamic_buttons_by_section,
-    track_admin_upload, get_admin_uploads, delete_admin_upload,
-    get_employees, add_employee, update_employee, delete_employee,
-    get_active_aerodrome_warnings
+    track_admin_upload, get_admin_uploads_page, delete_admin_upload,
+    get_employees_page, add_employee, update_employee, delete_employee,
+    get_active_aerodrome_warnings, get_latest_warnings_for_stations,
+    get_ocr_job, query_stats,
+    NEWS_LISTING, NOTICE_LISTING, UPLOAD_LISTING, EMPLOYEE_LISTING
 )
-from .services import get_required_state_boundaries
 
 map_bp = Blueprint('map', __name__)
 
+# Boundary asset drawn under the station markers on the index map (the default station's boundary)
+MAP_BOUNDARY = station_registry.map_boundary
+
 def allowed_file(filename):
     return '.' in filename and \
            filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
 @map_bp.route('/api/map/india_state')
-def get_india_state():
-    accept_encoding = request.headers.get('Accept-Encoding', '')
-    
-    static_dir = os.path.join(current_app.root_path, '../frontend/static/geojson')
-    
-    if 'gzip' in accept_encoding and os.path.exists(os.path.join(static_dir, 'india_state.geojson.gz')):
-        response = send_from_directory(static_dir, 'india_state.geojson.gz')
-        response.headers['Content-Encoding'] = 'gzip'
-        response.headers['Content-Type'] = 'application/geo+json'
-        return response
-    
-    return send_from_directory(static_dir, 'india_state.geojson')
+@map_bp.route('/api/map/boundary')
+def get_map_boundary():
+    """
+    The map boundary: a redirect to its built, precompressed TopoJSON, or the
+    raw GeoJSON when scripts/build_geo_assets.py has not been run.
+    """
+    built_url = geo_assets.url(MAP_BOUNDARY)
+    if built_url:
+        return redirect(built_url)
+    return send_from_directory(GEOJSON_DIR, f'{MAP_BOUNDARY}.geojson', mimetype='application/geo+json')
+
+@map_bp.route('/api/map/geo/<filename>')
+def get_geo_asset(filename):
+    """
+    Content-hashed TopoJSON from scripts/build_geo_assets.py, sent as the
+    precompressed variant the client accepts (nginx does the same for this path).
+    """
+    negotiated = geo_assets.negotiate(filename, request.accept_encodings)
+    if negotiated is None:
+        return jsonify({'error': 'Not found'}), 404
+
+    served, encoding = negotiated
+    response = send_from_directory(geo_assets.directory, served, mimetype='application/json',
+                                   max_age=GEO_ASSET_MAX_AGE)
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.headers['Cache-Control'] = f'public, max-age={GEO_ASSET_MAX_AGE}, immutable'
+    response.headers['Vary'] = 'Accept-Encoding'
+    return response
+
+def _positive(value):
+    number = float(value)
+    if not math.isfinite(number) or number <= 0:
+        raise ValueError(f"Expected a positive number, got {value!r}")
+    return number
+
+def _requested_resolution():
+    """
+    Degrees per screen pixel from ?resolution=, or ?bbox=west,south,east,north&width=px;
+    None if absent. Raises ValueError for anything that is not a positive, finite resolution.
+    """
+    if 'resolution' in request.args:
+        return _positive(request.args['resolution'])
+    if 'bbox' in request.args:
+        bbox = request.args['bbox'].split(',')
+        if len(bbox) != 4:
+            raise ValueError(f"bbox needs 4 values, got {len(bbox)}")
+        west, south, east, north = (float(value) for value in bbox)
+        if not all(map(math.isfinite, (west, south, east, north))):
+            raise ValueError("bbox values must be finite")
+        return _positive(abs(east - west) / _positive(request.args.get('width', 1024)))
+    return None
+
+@map_bp.route('/api/map/lod/<name>')
+def get_geo_lod(name):
+    """
+    Levels of detail built for name by scripts/build_geo_assets.py --lod.
+    Without a resolution, lists them (coarsest first) so the client can switch
+    on zoom; with one, redirects to the coarsest level fine enough for it.
+    """
+    levels = geo_assets.levels(name)
+    if not levels:
+        return jsonify({'error': 'Not found'}), 404
+
+    try:
+        resolution = _requested_resolution()
+    except ValueError:
+        return jsonify({'error': 'Invalid resolution or bbox'}), 400
+
+    if resolution is None:
+        return jsonify({
+            'name': name,
+            'levels': [{'tolerance': entry.get('tolerance', 0), 'bytes': entry['bytes'],
+                        'url': url_for('map.get_geo_asset', filename=entry['file'])} for entry in levels]
+        })
+    return redirect(url_for('map.get_geo_asset', filename=geo_assets.pick_level(levels, resolution)['file']))
+
+BUTTON_SECTIONS = ('operational', 'external', 'olbs', 'resources')
+INDEX_FRAGMENTS = ('news', 'notices', 'buttons_json', 'geojson_url', 'geo_lod_url') + tuple(f'buttons_{section}' for section in BUTTON_SECTIONS)
+
+def _render_news_block(admin_view):
+    news_items, news_next = get_news_page(admin_view=admin_view, limit=LIST_PAGE_SIZE)
+    return render_template('includes/news_block.html', news_items=news_items, news_next=news_next)
+
+def _render_notices_block(admin_view):
+    notice_items, notice_next = get_notices_page(admin_view=admin_view, limit=LIST_PAGE_SIZE)
+    return render_template('includes/notices_block.html', notice_items=notice_items, notice_next=notice_next)
+
+def _render_button_blocks():
+    buttons = get_dynamic_buttons_by_section()
+    blocks = {f'buttons_{section}': render_template('includes/sidebar_buttons.html', section=section,
+                                                    buttons=buttons.get(section, []))
+              for section in BUTTON_SECTIONS}
+    blocks['buttons_json'] = render_template_string('{{ buttons | tojson }}', buttons=buttons)
+    return blocks
+
+def _render_index_shell():
+    return render_template('map.html', 
+                         station_names_json=station_registry.names_json,
+                         station_coords_json=station_registry.coords_json,
+                         fragments={name: Markup(fragment_cache.marker(name)) for name in INDEX_FRAGMENTS})
 
 @map_bp.route('/')
 def index():
-    required_states, state_boundaries = get_required_state_boundaries()
-    
-    is_expanded = len(required_states) > 1 or "Maharashtra" not in required_states
-    
+    """
+    Assembled from memory: the page shell is cached per (role, user) and the
+    news, notices and button blocks per content version (see FragmentCache).
+    """
     admin_view = session.get('role') == 'admin'
-    news_items = get_news_items(admin_view=admin_view)
-    notice_items = get_notice_items(admin_view=admin_view)
-    
-    return render_template('map.html', 
-                         stations=STATIONS, 
-                         station_coords=STATION_COORDS,
-                         required_states=list(required_states),
-                         state_boundaries=state_boundaries,
-                         is_expanded=is_expanded,
-                         map_center=MAHARASHTRA_CENTER,
-                         map_zoom=MAHARASHTRA_ZOOM,
-                         news_items=news_items,
-                         notice_items=notice_items,
-                         dynamic_buttons=get_dynamic_buttons_by_section())
+    fragments = {
+        'news': fragment_cache.fragment('news', admin_view, lambda: _render_news_block(admin_view)),
+        'notices': fragment_cache.fragment('notices', admin_view, lambda: _render_notices_block(admin_view)),
+    }
+    fragments.update(fragment_cache.fragment('buttons', None, _render_button_blocks))
+    # Looked up per request: the hashed file names change whenever the assets are rebuilt.
+    fragments['geojson_url'] = htmlsafe_json_dumps(geo_assets.url(MAP_BOUNDARY) or url_for('map.get_map_boundary'))
+    lod_built = len(geo_assets.levels(MAP_BOUNDARY)) > 1
+    fragments['geo_lod_url'] = htmlsafe_json_dumps(url_for('map.get_geo_lod', name=MAP_BOUNDARY) if lod_built else None)
+    return fragment_cache.page((session.get('role'), session.get('user')), _render_index_shell, fragments)
 
 @map_bp.route('/head')
 def head_profile():
-    employees = get_employees()
-    head = next((e for e in employees if e['section'] and e['section'].upper() == 'HEAD'), None)
-    return render_template('head.html', head=head)
+    heads, _ = get_employees_page(limit=1, section='HEAD')
+    return render_template('head.html', head=heads[0] if heads else None)
 
 @map_bp.route('/employees')
 def employee_list():
-    all_employees = get_employees()
-    employees = [e for e in all_employees if not (e['section'] and e['section'].upper() == 'HEAD')]
-    return render_template('employees.html', employees=employees)
+    employees, employees_next = get_employees_page(limit=LIST_PAGE_SIZE, exclude_section='HEAD')
+    return render_template('employees.html', employees=employees, employees_next=employees_next)
+
+@map_bp.route('/api/employees')
+def list_employees():
+    before, limit, _ = page_args(EMPLOYEE_LISTING)
+    employees, next_cursor = get_employees_page(before, limit, request.args.get('section'),
+                                                request.args.get('exclude_section'))
+    return page_response(employees, next_cursor, 'includes/employee_cards.html', employees=employees)
 
 @map_bp.route('/api/employees/add', methods=['POST'])
 def add_employee_route():
@@ -167,6 +267,20 @@ def get_sigmet_status_api():
         "last_checked": status['updated_at']
     })
 
+@map_bp.route('/api/news')
+def list_news():
+    """Keyset-paged news; ocr_text only with ?fields=ocr_text. Admins also get drafts."""
+    before, limit, fields = page_args(NEWS_LISTING)
+    items, next_cursor = get_news_page(session.get('role') == 'admin', before, limit, fields)
+    return page_response(items, next_cursor, 'includes/news_items.html', items=items)
+
+@map_bp.route('/api/notices')
+def list_notices():
+    """Keyset-paged notices; ocr_text only with ?fields=ocr_text. Admins also get drafts."""
+    before, limit, fields = page_args(NOTICE_LISTING)
+    items, next_cursor = get_notices_page(session.get('role') == 'admin', before, limit, fields)
+    return page_response(items, next_cursor, 'includes/notice_items.html', items=items)
+
 @map_bp.route('/api/news/upload', methods=['POST'])
 def upload_news():
     if session.get('role') != 'admin':
@@ -198,6 +312,7 @@ def upload_news():
         upload_id = track_admin_upload(filename, file_type, f"{subfolder}/{filename}", session.get('user'))
     
         if add_news_item(title, description, filename, session.get('user'), upload_id):
+            fragment_cache.invalidate('news')
             return jsonify({'status': 'success', 'message': 'News uploaded successfully'})
         else:
             return jsonify({'status': 'error', 'message': 'Database error'}), 500
@@ -221,18 +336,14 @@ def upload_news_draft():
     upload_id = track_admin_upload(filename, 'image', f"{subfolder}/{filename}", session.get('user'))
     
     try:
-        ocr_text = extract_text_from_image(path)
-        summary = generate_summary(ocr_text)
-        
-        draft_id = create_news_draft(filename, ocr_text, summary, session.get('user'), upload_id)
-        if draft_id:
+        job_id = ocr_jobs.submit('news', filename, path, upload_id, session.get('user'))
+        if job_id:
             return jsonify({
                 'success': True,
-                'id': draft_id,
-                'summary': summary,
-                'ocr_text': ocr_text,
+                'job_id': job_id,
+                'status': 'QUEUED',
                 'filename': filename
-            })
+            }), 202
     except Exception as e:
         logger.error(f"News Draft Error: {e}")
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -244,6 +355,7 @@ def publish_news_route(item_id):
     if session.get('role') != 'admin': return jsonify({'error': 'Unauthorized'}), 403
     data = request.json
     if publish_news(item_id, data.get('title'), data.get('description')):
+        fragment_cache.invalidate('news')
         return jsonify({'success': True})
     return jsonify({'success': False, 'error': 'Update Failed'})
 
@@ -251,6 +363,7 @@ def publish_news_route(item_id):
 def delete_news(item_id):
     if session.get('role') != 'admin': return jsonify({'error': 'Unauthorized'}), 403
     delete_news_item(item_id)
+    fragment_cache.invalidate('news')
     return redirect(url_for('map.index'))
 
 @map_bp.route('/api/notices/post', methods=['POST'])
@@ -285,6 +398,7 @@ def post_notice():
             upload_id = track_admin_upload(filename, file_type, f"{subfolder}/{filename}", session.get('user'))
         
         if add_notice_item(title, message, filename, session.get('user'), upload_id):
+            fragment_cache.invalidate('notices')
             return jsonify({'status': 'success', 'message': 'Notice posted successfully'})
         else:
             return jsonify({'status': 'error', 'message': 'Database error'}), 500
@@ -306,28 +420,42 @@ def upload_notice_draft():
     upload_id = track_admin_upload(filename, 'image', f"{subfolder}/{filename}", session.get('user'))
     
     try:
-        ocr_text = extract_text_from_image(path)
-        summary = generate_summary(ocr_text)
-        
-        draft_id = create_notice_draft(filename, ocr_text, summary, session.get('user'), upload_id)
-        if draft_id:
+        job_id = ocr_jobs.submit('notices', filename, path, upload_id, session.get('user'))
+        if job_id:
             return jsonify({
                 'success': True,
-                'id': draft_id,
-                'summary': summary,
-                'ocr_text': ocr_text,
+                'job_id': job_id,
+                'status': 'QUEUED',
                 'filename': filename
-            })
+            }), 202
     except Exception as e:
         logger.error(f"Notice Draft Error: {e}")
         return jsonify({'success': False, 'error': str(e)}), 500
     return jsonify({'success': False, 'error': 'Failed'}), 500
 
+@map_bp.route('/api/ocr/jobs/<job_id>')
+def ocr_job_status(job_id):
+    """Polled by the admin page after a draft upload; result holds the draft once DONE."""
+    if session.get('role') != 'admin': return jsonify({'error': 'Unauthorized'}), 403
+    job = get_ocr_job(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify({
+        'id': job['id'],
+        'kind': job['kind'],
+        'status': job['status'],
+        'result': job['result'],
+        'error': job['error'],
+        'created_at': job['created_at'],
+        'updated_at': job['updated_at']
+    })
+
 @map_bp.route('/api/notices/publish/<int:item_id>', methods=['POST'])
 def publish_notice_route(item_id):
     if session.get('role') != 'admin': return jsonify({'error': 'Unauthorized'}), 403
     data = request.json
     if publish_notice(item_id, data.get('title'), data.get('message')):
+        fragment_cache.invalidate('notices')
         return jsonify({'success': True})
     return jsonify({'success': False, 'error': 'Update Failed'})
 
@@ -335,6 +463,7 @@ def publish_notice_route(item_id):
 def delete_notice(item_id):
     if session.get('role') != 'admin': return jsonify({'error': 'Unauthorized'}), 403
     delete_notice_item(item_id)
+    fragment_cache.invalidate('notices')
     return redirect(url_for('map.index'))
 
 @map_bp.route('/uploads/<type>/<filename>')
@@ -353,6 +482,14 @@ def get_active_warnings_api():
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@map_bp.route('/api/warnings/latest')
+def get_latest_warnings_api():
+    try:
+        warnings = get_latest_warnings_for_stations(station_registry.icaos)
+        return jsonify({'success': True, 'data': warnings})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 @map_bp.route('/api/buttons/add', methods=['POST'])
 def add_button_api():
     if session.get('role') != 'admin':
@@ -382,6 +519,7 @@ def add_button_api():
             upload_id = track_admin_upload(unique_filename, 'misc', f"misc/{unique_filename}", session.get('user'))
         
         add_dynamic_button(section, label, btn_type, url, file_path, upload_id)
+        fragment_cache.invalidate('buttons')
         return jsonify({'success': True})
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
@@ -393,6 +531,7 @@ def delete_button_api(btn_id):
     
     try:
         delete_dynamic_button(btn_id)
+        fragment_cache.invalidate('buttons')
         return jsonify({'success': True})
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
@@ -402,8 +541,17 @@ def admin_uploads_view():
     if session.get('role') != 'admin':
         return redirect(url_for('map.index'))
         
-    uploads = get_admin_uploads(session.get('user'))
-    return render_template('admin_uploads.html', uploads=uploads)
+    uploads, uploads_next = get_admin_uploads_page(limit=LIST_PAGE_SIZE)
+    return render_template('admin_uploads.html', uploads=uploads, uploads_next=uploads_next)
+
+@map_bp.route('/api/uploads')
+def list_admin_uploads():
+    if session.get('role') != 'admin':
+        return jsonify({'success': False, 'error': 'Unauthorized'}), 403
+
+    before, limit, _ = page_args(UPLOAD_LISTING)
+    uploads, next_cursor = get_admin_uploads_page(before, limit)
+    return page_response(uploads, next_cursor, 'includes/upload_rows.html', uploads=uploads)
 
 @map_bp.route('/admin/uploads/delete/<int:upload_id>', methods=['POST'])
 def delete_admin_upload_route(upload_id):
@@ -424,3 +572,15 @@ def delete_admin_upload_route(upload_id):
     except Exception as e:
         logger.error(f"Error deleting upload: {e}")
         return jsonify({'success': False, 'error': str(e)})
+
+@map_bp.route('/admin/db/queries')
+def admin_query_stats():
+    if session.get('role') != 'admin':
+        return jsonify({'success': False, 'error': 'Unauthorized'}), 403
+
+    limit = max(1, min(request.args.get('limit', 20, type=int), QUERY_STATS_MAX_STATEMENTS))
+    order_by = request.args.get('order_by', 'total_seconds')
+    if order_by not in ('total_seconds', 'avg_seconds', 'max_seconds', 'calls', 'rows'):
+        return jsonify({'success': False, 'error': 'Invalid order_by'}), 400
+
+    return jsonify({'success': True, 'data': query_stats.top(limit, order_by)})
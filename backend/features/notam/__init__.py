@@ -1,6 +1,8 @@
 from .routes import notam_bp
-from .services import check_expired_notams
+from .services import check_expired_notams, active_notams
 
 def configure_notam_scheduler(scheduler):
+    # Expiry itself is exact (one-shot jobs scheduled by the cache); the hourly
+    # run only picks up NOTAMs changed outside the admin API.
+    active_notams.attach(scheduler)
     scheduler.add_job(func=check_expired_notams, trigger="interval", minutes=60)
-
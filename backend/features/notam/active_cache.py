@@ -0,0 +1,115 @@
+import re
+import threading
+from datetime import datetime, timezone
+from core.extensions import logger
+from core.metrics import record_cache_lookup
+from database import get_active_notams, auto_expire_notams
+from .extractor import extract_item
+
+EXPIRY_JOB_PREFIX = 'notam_expiry_'
+
+def _parse_valid_till(value):
+    """valid_till_utc is stored as 'YYYY-MM-DD HH:MM:SS' (or with a 'T' when edited by hand)."""
+    try:
+        return datetime.fromisoformat(str(value))
+    except (TypeError, ValueError):
+        return None
+
+def _normalize_runway(runway):
+    return re.sub(r'^(?:RWY|RUNWAY)[\s-]*', '', runway.strip().upper())
+
+class ActiveNotamCache:
+    """
+    The ACTIVE NOTAM set, held in memory for the public endpoints.
+
+    reload() archives whatever is past valid_till_utc, re-reads the ACTIVE
+    rows and schedules a one-shot job at each NOTAM's valid_till_utc that
+    reloads again, so NOTAMs are archived the moment they expire. Admin
+    writes call reload() directly; readers never touch the database.
+    Equipment and runways are extracted from each NOTAM's text on load
+    so the feed can be filtered without re-parsing.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+        self._notams = None
+        self._scheduler = None
+
+    def attach(self, scheduler):
+        """Uses scheduler for the expiry jobs and loads the initial set."""
+        self._scheduler = scheduler
+        self.reload()
+
+    def reload(self):
+        with self._reload_lock:
+            archived = auto_expire_notams()
+            if archived:
+                logger.info(f"Archived {archived} expired NOTAM(s)")
+
+            rows = get_active_notams()
+            if rows is None:
+                return False
+
+            notams = []
+            for row in rows:
+                valid_till = _parse_valid_till(row['valid_till_utc'])
+                if valid_till is None:
+                    logger.warning(f"NOTAM {row['id']} has an unreadable valid_till_utc: {row['valid_till_utc']!r}")
+                    continue
+                fields = extract_item((row['final_notam_text'] or '').upper())
+                row['equipment'], row['runways'] = fields['equipment'], fields['runways']
+                notams.append((valid_till, row))
+
+            with self._lock:
+                self._notams = notams
+            if self._scheduler is not None:
+                self._schedule_expiries(notams)
+            return True
+
+    def _schedule_expiries(self, notams):
+        # A NOTAM already past its validity is hidden by _current(); a date job in
+        # the past would fire at once and reload in a loop until it is archived.
+        now = datetime.utcnow()
+        wanted = {f"{EXPIRY_JOB_PREFIX}{row['id']}": valid_till for valid_till, row in notams if valid_till > now}
+        for job in self._scheduler.get_jobs():
+            if job.id.startswith(EXPIRY_JOB_PREFIX) and job.id not in wanted:
+                job.remove()
+        for job_id, valid_till in wanted.items():
+            self._scheduler.add_job(
+                func=self.reload,
+                trigger='date',
+                run_date=valid_till.replace(tzinfo=timezone.utc),
+                id=job_id,
+                name='Archive expired NOTAM',
+                misfire_grace_time=None,
+                replace_existing=True
+            )
+
+    def _current(self):
+        with self._lock:
+            notams = self._notams
+
+        record_cache_lookup('active_notam', notams is not None)
+        now = datetime.utcnow()
+        return [row for valid_till, row in notams or [] if valid_till > now]
+
+    def get(self):
+        """The newest ACTIVE NOTAM still within its validity, or None."""
+        current = self._current()
+        return current[0] if current else None
+
+    def feed(self, runway=None, equipment=None):
+        """
+        All ACTIVE NOTAMs still within their validity, newest first.
+        runway matches exactly ('27', 'RWY 27'); equipment is a
+        case-insensitive substring of the extracted equipment ('RVR', 'ils').
+        """
+        current = self._current()
+        if runway:
+            runway = _normalize_runway(runway)
+            current = [row for row in current if runway in row['runways']]
+        if equipment:
+            equipment = equipment.strip().upper()
+            current = [row for row in current if equipment in row['equipment']]
+        return current
@@ -0,0 +1,138 @@
+import re
+from datetime import datetime, timedelta
+
+# Rule tables are checked in order against the upper-cased item text; first match wins.
+STATUS_RULES = [
+    (re.compile(r'\bUNSERVICEABLE\b|\bU/S\b|\bOUT OF SERVICE\b'), "UNSERVICEABLE"),
+]
+DEFAULT_STATUS = "STATUS UNKNOWN"
+
+EQUIPMENT_RULES = [
+    (re.compile(r'\bDRISHTI\b|\bRVR\b'), "DRISHTI (RVR)"),
+    (re.compile(r'\bILS\b'), "ILS"),
+]
+DEFAULT_EQUIPMENT = "EQUIPMENT"
+
+RUNWAY_PATTERNS = [
+    re.compile(r'METPARK[\s-]*(\d{2})'),
+    re.compile(r'(?:RWY|RUNWAY)[\s-]*(\d{2}[LR]?)'),
+]
+
+def _alpha_validity(m):
+    time_raw, day_raw, month_raw, year_raw = m.groups()
+    try:
+        end = datetime.strptime(f"{day_raw} {month_raw} {year_raw} {time_raw}", "%d %b %Y %H%M")
+    except ValueError:
+        end = None
+    return f"{time_raw}Z {day_raw}{month_raw}{year_raw}", end
+
+def _numeric_validity(m):
+    time_raw, day_raw, month_raw, year_raw = m.groups()
+    try:
+        end = datetime.strptime(f"{day_raw} {month_raw} {year_raw} {time_raw}", "%d %m %Y %H%M")
+        month_abbr = end.strftime('%b').upper()
+    except ValueError:
+        end, month_abbr = None, month_raw
+    return f"{time_raw}Z {day_raw}{month_abbr}{year_raw}", end
+
+ALPHA_DATE = r'(\d{4})(?:Z|UTC)?\s+(\d{1,2})\s*([A-Z]{3})\s*(\d{4})'
+
+# pattern -> converter returning (validity_str, datetime or None). The value is
+# the end of validity: an explicit TO/TILL date wins, and a WEF/FROM date is a
+# start time, never taken as the expiry.
+VALIDITY_RULES = [
+    (re.compile(r'\b(?:TO|TILL|UNTIL|UPTO)\s+' + ALPHA_DATE), _alpha_validity),
+    (re.compile(r'TILL\s+(\d{4})\s*UTC\s+OF\s+(\d{2})/(\d{2})/(\d{4})'), _numeric_validity),
+    (re.compile(r'(?<!WEF )(?<!FROM )\b' + ALPHA_DATE), _alpha_validity),
+]
+
+# Where a new NOTAM starts in a multi-NOTAM document: an ICAO series number
+# (A1234/26) or, failing that, a "NOTAM" heading. Only markers at the start of
+# a line count, so a NOTAM that cites another ("REPLACES A1200/26") or uses the
+# word in its body ("THIS NOTAM SUPERSEDES") stays one item.
+ITEM_ID = re.compile(r'^[ \t]*[A-Z]\d{4}/\d{2}\b', re.MULTILINE)
+ITEM_HEADING = re.compile(r'^[ \t]*NOTAM\b', re.MULTILINE)
+
+INLINE_SPACE = re.compile(r'[ \t]+')
+
+def normalize_text(text):
+    """
+    Collapses runs of spaces and tabs and drops blank lines, keeping the line
+    breaks split_items needs to find line-start markers.
+    """
+    lines = (INLINE_SPACE.sub(' ', line).strip() for line in text.splitlines())
+    return '\n'.join(line for line in lines if line)
+
+def split_items(upper_text):
+    """
+    Splits an upper-cased document into per-NOTAM chunks; a single chunk if no
+    markers repeat. Text before the first marker (letterhead, summary title)
+    stays with the first chunk.
+    """
+    for marker in (ITEM_ID, ITEM_HEADING):
+        starts = [m.start() for m in marker.finditer(upper_text)]
+        if len(starts) >= 2:
+            bounds = [0] + starts[1:] + [len(upper_text)]
+            return [upper_text[a:b].strip() for a, b in zip(bounds, bounds[1:])]
+    return [upper_text.strip()]
+
+def _first_rule(rules, text, default):
+    for pattern, value in rules:
+        if pattern.search(text):
+            return value
+    return default
+
+def _validity(text):
+    for pattern, convert in VALIDITY_RULES:
+        m = pattern.search(text)
+        if m:
+            return convert(m)
+    return "", None
+
+def extract_item(text):
+    """Fields of one NOTAM chunk (already upper-cased). validity_end is None if no date was found."""
+    runways = []
+    for pattern in RUNWAY_PATTERNS:
+        runways.extend(pattern.findall(text))
+    runways = sorted(set(runways))
+    validity_str, validity_end = _validity(text)
+
+    return {
+        "equipment": _first_rule(EQUIPMENT_RULES, text, DEFAULT_EQUIPMENT),
+        "status": _first_rule(STATUS_RULES, text, DEFAULT_STATUS),
+        "runways": runways,
+        "validity_str": validity_str,
+        "valid_until": validity_end,
+        "raw_text": text,
+    }
+
+def _is_notam(item):
+    return (item["status"] != DEFAULT_STATUS or item["equipment"] != DEFAULT_EQUIPMENT
+            or item["runways"] or item["valid_until"])
+
+def format_notam(item):
+    rwy_str = " ".join(f"RWY {r}" for r in item["runways"])
+    return re.sub(r'\s+', ' ', f"NOTAM {item['status']} {item['equipment']} {rwy_str} TILL {item['validity_str']}").strip()
+
+def extract_notams(text, now=None):
+    """
+    Rule-table NOTAM extraction: upper-cases once, splits the document into
+    items and extracts equipment, runways, status and validity for each.
+    Chunks matching no rule (cover pages, signatures) are dropped unless
+    nothing else is left. Items without a date inherit the document's first
+    validity, else default to 24 hours from now.
+    """
+    upper = text.upper()
+    items = [extract_item(chunk) for chunk in split_items(upper)]
+    items = [item for item in items if _is_notam(item)] or items[:1]
+
+    fallback_str, fallback_end = _validity(upper)
+    if fallback_end is None:
+        fallback_end = (now or datetime.utcnow()) + timedelta(hours=24)
+        fallback_str = fallback_end.strftime("%H%MZ %d%b%Y").upper()
+
+    for item in items:
+        if item["valid_until"] is None:
+            item["valid_until"], item["validity_str"] = fallback_end, fallback_str
+        item["formatted_text"] = format_notam(item)
+    return items
@@ -1,15 +1,24 @@
-import re
-import io
 import os
+import time
 import logging
-from datetime import datetime, timedelta
-from pypdf import PdfReader
+from concurrent.futures import ThreadPoolExecutor
+import cv2
 import fitz  
+import numpy as np
 import pytesseract
 from PIL import Image
+from core.metrics import ocr_run_metrics, collect_ocr_duration
+from .extractor import extract_notams, normalize_text
+from features.common.ocr import ocr_cache_key, load_cached_ocr, store_cached_ocr
 
 logger = logging.getLogger(__name__)
 
+# Identifies the text-extraction settings in OCR cache keys; change it when _extract_text or _perform_ocr changes.
+NOTAM_TEXT_PIPELINE = "fitz-text|ocr:pages2,dpi300,gray,gauss5,otsu|--oem 3 --psm 6|lines"
+
+OCR_DPI = 300
+OCR_MAX_PAGES = 2
+
 TESSERACT_PATHS = [
     r'C:\Program Files\Tesseract-OCR\tesseract.exe',
     r'C:\Program Files (x86)\Tesseract-OCR\tesseract.exe',
@@ -31,25 +40,80 @@ def _get_tesseract_cmd():
 def parse_notam_pdf(filepath):
     """
     Parses a NOTAM PDF file. 
-    1. Tries standard text extraction.
-    2. If text is empty/insufficient, tries OCR.
+    1. Tries the PyMuPDF text layer.
+    2. If text is empty/insufficient, OCRs the rendered pages in parallel.
+    Extracted text is cached by file hash, so re-uploads skip both steps.
+    Each NOTAM found in the document is returned under "items";
+    per-page stage timings under "timings" and OCR cache/duration metrics
+    under "metrics", for the caller to observe (see observe_ocr_run).
     """
+    metrics = ocr_run_metrics()
     try:
         
         logger.info(f"Parsing PDF: {filepath}")
-        text = ""
-        try:
-            
-            with open(filepath, 'rb') as f:
-                reader = PdfReader(f)
-                for page in reader.pages:
-                    extracted = page.extract_text()
-                    if extracted:
-                        text += extracted + "\n"
-        except Exception as e:
-            logger.warning(f"Standard extraction failed: {e}")
+        timings = []
+        cache_key = ocr_cache_key(filepath, NOTAM_TEXT_PIPELINE)
+        text = load_cached_ocr(cache_key, 'notam_pdf', metrics)
+        if text is None:
+            text, failure = _extract_text(filepath, timings, metrics)
+            logger.info("PDF stage timings: " + ", ".join(f"p{t['page']}:{t['stage']}={t['ms']}ms" for t in timings))
+            if failure:
+                failure["timings"] = timings
+                failure["metrics"] = metrics
+                return failure
+            if len(text) >= 10:
+                store_cached_ocr(cache_key, text)
+        else:
+            logger.info("Using cached text for identical PDF.")
+        
+        if not text or len(text) < 10:
+             return {
+                "success": False, 
+                "error": "PDF Parsing Failed: Text is still empty after OCR processing.",
+                "metrics": metrics
+            }
+
+        items = extract_notams(text)
+        first = items[0]
+
+        return {
+            "success": True,
+            "formatted_text": "\n".join(item["formatted_text"] for item in items),
+            "valid_until": first["valid_until"],
+            "items": items,
+            "raw_data": {
+                "equipment": first["equipment"],
+                "status": first["status"],
+                "runways": first["runways"],
+                "validity_str": first["validity_str"]
+            },
+            "timings": timings,
+            "metrics": metrics
+        }
 
-        text = text.replace('\n', ' ').strip()
+    except Exception as e:
+        logger.error(f"PDF Parsing Error: {e}")
+        return {"success": False, "error": str(e), "metrics": metrics}
+
+def _timed(timings, page, stage, start):
+    timings.append({"page": page, "stage": stage, "ms": round((time.perf_counter() - start) * 1000, 1)})
+
+def _extract_text(filepath, timings, metrics):
+    """
+    Text layer first; OCR fallback when the PDF has no usable text.
+    Uses PyMuPDF for both, opening the file once.
+    Returns (text, None), or (None, failure result) when OCR is needed but unavailable.
+    """
+    with fitz.open(filepath) as doc:
+        text = ""
+        for page_num in range(len(doc)):
+            start = time.perf_counter()
+            extracted = doc.load_page(page_num).get_text()
+            _timed(timings, page_num, "text_layer", start)
+            if extracted:
+                text += extracted + "\n"
+
+        text = normalize_text(text)
         logger.info(f"Initial text extraction length: {len(text)}")
 
         if not text or len(text) < 20:
@@ -58,7 +122,7 @@ def parse_notam_pdf(filepath):
             
             if not tess_cmd:
                 logger.error("Tesseract-OCR not found on system.")
-                return {
+                return None, {
                     "success": False, 
                     "error": "PDF Parsing Failed: This looks like a scanned PDF, but Tesseract-OCR is NOT installed or found on the server. Please install Tesseract-OCR to enable scanning."
                 }
@@ -67,157 +131,54 @@ def parse_notam_pdf(filepath):
             logger.info(f"Using Tesseract at: {tess_cmd}. Starting OCR...")
             
             try:
-                text = _perform_ocr(filepath)
+                with collect_ocr_duration(metrics, 'notam_pdf'):
+                    text = _perform_ocr(doc, timings)
                 logger.info("OCR Processing Complete.")
             except Exception as e:
                 logger.error(f"OCR Runtime Error: {e}")
-                return {
+                return None, {
                     "success": False, 
                     "error": f"OCR Failed: {str(e)}"
                 }
 
-        text = text.replace('\n', ' ').strip()
-        
-        if not text or len(text) < 10:
-             return {
-                "success": False, 
-                "error": "PDF Parsing Failed: Text is still empty after OCR processing."
-            }
-
-        if "UNSERVICEABLE" in text.upper() or "U/S" in text.upper() or "OUT OF SERVICE" in text.upper():
-            status = "UNSERVICEABLE"
-        else:
-            status = "STATUS UNKNOWN" 
-
-        if "DRISHTI" in text.upper() or "RVR" in text.upper():
-            equipment = "DRISHTI (RVR)"
-        elif "ILS" in text.upper():
-            equipment = "ILS"
-        else:
-            equipment = "EQUIPMENT" 
-
-        rwys = []
-
-        metpark_matches = re.findall(r'Metpark[\s-]*(\d{2})', text, re.IGNORECASE)
-        for m in metpark_matches:
-            rwys.append(m)
-
-        std_matches = re.findall(r'(?:RWY|RUNWAY)[\s-]*(\d{2}[LR]?)', text, re.IGNORECASE)
-        for m in std_matches:
-            rwys.append(m)
-
-        rwy_str = ""
-        if rwys:
-            unique_rwys = sorted(list(set(rwys)))
-            rwy_str = " ".join([f"RWY {r}" for r in unique_rwys])
-        
-        if not rwy_str: rwy_str = ""
-
-        validity_end = None
-        validity_str = ""
-
-        date_pattern = re.search(r'(\d{4})(?:Z|UTC)?\s+(\d{1,2})\s*([A-Za-z]{3})\s*(\d{4})', text)
-
-        numeric_date_pattern = re.search(r'till\s+(\d{4})\s*UTC\s+of\s+(\d{2})/(\d{2})/(\d{4})', text, re.IGNORECASE)
-
-        if date_pattern:
-            time_raw = date_pattern.group(1) 
-            day_raw = date_pattern.group(2) 
-            month_raw = date_pattern.group(3) 
-            year_raw = date_pattern.group(4) 
-            
-            validity_str = f"{time_raw}Z {day_raw}{month_raw.upper()}{year_raw}"
-            
-            try:
-                dt_str = f"{day_raw} {month_raw} {year_raw} {time_raw}"
-                validity_end = datetime.strptime(dt_str, "%d %b %Y %H%M")
-            except:
-                pass
-        
-        elif numeric_date_pattern:
-             time_raw = numeric_date_pattern.group(1)
-             day_raw = numeric_date_pattern.group(2)
-             month_num = int(numeric_date_pattern.group(3))
-             year_raw = numeric_date_pattern.group(4)
-
-             month_abbr = datetime(2000, month_num, 1).strftime('%b').upper()
-             
-             validity_str = f"{time_raw}Z {day_raw}{month_abbr}{year_raw}"
-             try:
-                 dt_str = f"{day_raw} {month_num} {year_raw} {time_raw}"
-                 validity_end = datetime.strptime(dt_str, "%d %m %Y %H%M")
-             except:
-                 pass
-        
-        if not validity_end:
-             
-             validity_end = datetime.utcnow() + timedelta(hours=24)
-             validity_str = validity_end.strftime("%H%MZ %d%b%Y").upper()
-
-        if status == "UNSERVICEABLE" and "DRISHTI" in equipment and not rwy_str:
-             
-             final_text = f"NOTAM {status} {equipment} {rwy_str} TILL {validity_str}".strip()
-        else:
-             
-             final_text = f"NOTAM {status} {equipment} {rwy_str} TILL {validity_str}".strip()
-
-        final_text = re.sub(r'\s+', ' ', final_text)
-
-        return {
-            "success": True,
-            "formatted_text": final_text,
-            "valid_until": validity_end,
-            "raw_data": {
-                "equipment": equipment,
-                "status": status,
-                "runways": list(set(rwys)) if rwys else [],
-                "validity_str": validity_str
-            }
-        }
-
-    except Exception as e:
-        logger.error(f"PDF Parsing Error: {e}")
-        return {"success": False, "error": str(e)}
+    return normalize_text(text), None
+
+def _render_page(doc, page_num, timings):
+    """Renders a page at OCR_DPI straight into a grayscale NumPy array (no PNG round-trip)."""
+    start = time.perf_counter()
+    pix = doc.load_page(page_num).get_pixmap(dpi=OCR_DPI, colorspace=fitz.csGRAY, alpha=False)
+    # Copy out of the pixmap buffer so the array outlives it.
+    gray = np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.stride)[:, :pix.width].copy()
+    _timed(timings, page_num, "render", start)
+    return gray
+
+def _ocr_page(page_num, gray, timings):
+    """Blur + Otsu, then Tesseract. Runs on a worker thread; both steps release the GIL."""
+    start = time.perf_counter()
+    blur = cv2.GaussianBlur(gray, (5, 5), 0)
+    _, thresh = cv2.threshold(blur, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    _timed(timings, page_num, "preprocess", start)
+
+    start = time.perf_counter()
+    text = pytesseract.image_to_string(Image.fromarray(thresh), config=r'--oem 3 --psm 6', timeout=10)
+    _timed(timings, page_num, "ocr", start)
+    return text
 
-def _perform_ocr(filepath):
+def _perform_ocr(doc, timings):
     """
-    Renders PDF pages to images and runs Tesseract OCR.
-    Preprocesses images with OpenCV (Grayscale + Otsu) for better accuracy on scans.
+    Renders the first OCR_MAX_PAGES pages and OCRs them in parallel.
+    Rendering stays on the calling thread (a PyMuPDF document is not
+    thread-safe); each page is handed to the pool as soon as it is rendered.
     """
-    import cv2
-    import numpy as np
-
-    text = ""
-    doc = None
-    try:
-        doc = fitz.open(filepath)
-        
-        for page_num in range(min(len(doc), 2)):
-            page = doc.load_page(page_num)
-            pix = page.get_pixmap(dpi=300) 
-            img_bytes = pix.tobytes("png")
+    pages = range(min(len(doc), OCR_MAX_PAGES))
+    if not pages:
+        return ""
 
-            nparr = np.frombuffer(img_bytes, np.uint8)
-            img_cv = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-
-            if img_cv is not None:
-                gray = cv2.cvtColor(img_cv, cv2.COLOR_BGR2GRAY)
-
-                blur = cv2.GaussianBlur(gray, (5,5), 0)
-                _, thresh = cv2.threshold(blur, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-
-                pil_img = Image.fromarray(thresh)
-            else:
-                 
-                 pil_img = Image.open(io.BytesIO(img_bytes))
-
-            custom_config = r'--oem 3 --psm 6' 
-            text += pytesseract.image_to_string(pil_img, config=custom_config, timeout=10) + "\n"
-    except Exception as e:
-        logger.error(f"Error in OCR loop: {e}")
-        raise e
-    finally:
-        if doc:
-            doc.close()
-        
-    return text
+    with ThreadPoolExecutor(max_workers=len(pages)) as pool:
+        futures = [pool.submit(_ocr_page, page_num, _render_page(doc, page_num, timings), timings)
+                   for page_num in pages]
+        try:
+            return "\n".join(future.result() for future in futures) + "\n"
+        except Exception as e:
+            logger.error(f"Error in OCR loop: {e}")
+            raise e
@@ -4,10 +4,14 @@ import os
 from datetime import datetime
 from core.extensions import logger
 from core.config import UPLOAD_FOLDER
-from database import (create_notam_draft, update_notam_status, update_notam_text, 
-                     delete_notam, get_notams_by_status, get_public_active_notam)
+from core.metrics import observe_pdf_timings, observe_ocr_run
+from database import (update_notam_status, update_notam_text, 
+                     delete_notam, get_notams_page, NOTAM_LISTING)
 from database import track_admin_upload
+from features.common.ocr_jobs import ocr_jobs
+from features.common.pagination import page_args, page_response
 from .parser import parse_notam_pdf
+from .services import active_notams
 
 notam_bp = Blueprint('notam', __name__)
 
@@ -32,52 +36,46 @@ def upload_notam():
         file.save(filepath)
         upload_id = track_admin_upload(filename, 'pdf', f"notams/{filename}", session.get('user'))
         
-        result = parse_notam_pdf(filepath)
-        
-        if result['success']:
-            notam_id = create_notam_draft(
-                filename, 
-                result.get('raw_data', {}).get('raw_text', ''),
-                result['formatted_text'],
-                result['valid_until'],
-                session.get('user'),
-                upload_id
-            )
-            
-            if notam_id:
-                return jsonify({
-                    'success': True, 
-                    'id': notam_id,
-                    'text': result['formatted_text'],
-                    'status': 'DRAFT'
-                })
-            else:
-                 return jsonify({'success': False, 'error': 'Database Save Failed'}), 500
+        job_id = ocr_jobs.submit('notam', filename, filepath, upload_id, session.get('user'))
+        if job_id:
+            return jsonify({
+                'success': True,
+                'job_id': job_id,
+                'status': 'QUEUED'
+            }), 202
         else:
-            return jsonify({'success': False, 'error': 'Failed to parse PDF content'}), 500
+            return jsonify({'success': False, 'error': 'Database Save Failed'}), 500
             
     except Exception as e:
         logger.error(f"NOTAM Upload Error: {e}")
         return jsonify({'success': False, 'error': 'Internal server error'}), 500
 
+NOTAM_LISTS = {'drafts': 'DRAFT', 'active': 'ACTIVE', 'archived': 'ARCHIVED'}
+
 @notam_bp.route('/api/notam/list', methods=['GET'])
 def list_notams():
+    """
+    First page of drafts, active and archived NOTAMs, or with ?status= a
+    single list continued from ?before=. ocr_text only with ?fields=ocr_text.
+    """
     if session.get('role') != 'admin':
         return jsonify({'error': 'Unauthorized'}), 403
-        
-    drafts = get_notams_by_status('DRAFT')
-    active = get_notams_by_status('ACTIVE')
-    archived = get_notams_by_status('ARCHIVED')
-    
-    return jsonify({
-        'drafts': drafts,
-        'active': active,
-        'archived': archived
-    })
+
+    before, limit, fields = page_args(NOTAM_LISTING)
+    status = request.args.get('status', '').upper()
+    if status:
+        if status not in NOTAM_LISTS.values():
+            return jsonify({'error': 'Unknown status'}), 400
+        return page_response(*get_notams_page(status, before, limit, fields))
+
+    response = {'next': {}}
+    for key, list_status in NOTAM_LISTS.items():
+        response[key], response['next'][key] = get_notams_page(list_status, None, limit, fields)
+    return jsonify(response)
 
 @notam_bp.route('/api/notam/active')
 def get_public_notam():
-    notam = get_public_active_notam()
+    notam = active_notams.get()
     if notam:
         return jsonify({
             'active': True,
@@ -85,12 +83,28 @@ def get_public_notam():
         })
     return jsonify({'active': False})
 
+@notam_bp.route('/api/notam/feed')
+def get_notam_feed():
+    """All currently valid NOTAMs, filterable with ?runway= and ?equipment=."""
+    notams = active_notams.feed(request.args.get('runway'), request.args.get('equipment'))
+    return jsonify({
+        'count': len(notams),
+        'notams': [{
+            'id': n['id'],
+            'text': n['final_notam_text'],
+            'valid_till_utc': n['valid_till_utc'],
+            'equipment': n['equipment'],
+            'runways': n['runways']
+        } for n in notams]
+    })
+
 @notam_bp.route('/api/notam/publish/<int:notam_id>', methods=['POST'])
 def publish_notam(notam_id):
     if session.get('role') != 'admin':
         return jsonify({'error': 'Unauthorized'}), 403
     
     if update_notam_status(notam_id, 'ACTIVE'):
+        active_notams.reload()
         return jsonify({'success': True})
     return jsonify({'success': False, 'error': 'Update Failed'})
 
@@ -107,6 +121,7 @@ def edit_notam(notam_id):
          return jsonify({'success': False, 'error': 'No text provided'})
 
     if update_notam_text(notam_id, new_text, new_date):
+        active_notams.reload()
         return jsonify({'success': True})
     return jsonify({'success': False, 'error': 'Update Failed'})
 
@@ -116,6 +131,7 @@ def archive_notam(notam_id):
         return jsonify({'error': 'Unauthorized'}), 403
         
     if update_notam_status(notam_id, 'ARCHIVED'):
+        active_notams.reload()
         return jsonify({'success': True})
     return jsonify({'success': False, 'error': 'Update Failed'})
 
@@ -125,6 +141,7 @@ def delete_notam_route(notam_id):
         return jsonify({'error': 'Unauthorized'}), 403
     
     if delete_notam(notam_id):
+        active_notams.reload()
         return jsonify({'success': True})
     return jsonify({'success': False, 'error': 'Database Error'}), 500
 
@@ -145,6 +162,8 @@ def generate_notam_text():
     try:
         file.save(filepath)
         result = parse_notam_pdf(filepath)
+        observe_pdf_timings(result.get('timings'))
+        observe_ocr_run(result.get('metrics'))
         try: os.remove(filepath)
         except: pass
             
@@ -1,10 +1,12 @@
-from database import auto_expire_notams
 from core.extensions import logger
+from .active_cache import ActiveNotamCache
+
+active_notams = ActiveNotamCache()
 
 def check_expired_notams():
-    """Check for expired NOTAMs and archive them."""
+    """Archive expired NOTAMs and resync the active cache with the database."""
     try:
-        auto_expire_notams()
+        active_notams.reload()
         
     except Exception as e:
         logger.error(f"Error checking expired NOTAMs: {e}")
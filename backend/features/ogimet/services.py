@@ -1,15 +1,14 @@
-import requests
 from datetime import datetime, timedelta
 import re
-from core.extensions import logger, scheduler
-from core.config import STATIONS
+from core.extensions import logger, scheduler, http_session
+from core.stations import station_registry
 from database import save_observation, save_sigmet_status
 from .parser import decode_metar
 
 def fetch_metar_data():
     logger.info("Starting METAR data fetch...")
     
-    for icao in STATIONS.keys():
+    for icao in station_registry.icaos:
         try:
             fetch_station_data(icao)
         except Exception as e:
@@ -36,7 +35,7 @@ def fetch_station_data(icao, hours=None, start_dt=None, end_dt=None):
         'User-Agent': 'IMD-Dashboard/1.0'
     }
     
-    response = requests.get(url, params=params, headers=headers, timeout=60)
+    response = http_session.get(url, params=params, headers=headers, timeout=60)
     if response.status_code != 200:
         logger.error(f"AWC returned {response.status_code} for {icao}")
         return
@@ -89,7 +88,7 @@ def fetch_today_data():
     now = datetime.utcnow()
     start_dt = datetime(now.year, now.month, now.day, 0, 0, 0)
     
-    for icao in STATIONS.keys():
+    for icao in station_registry.icaos:
         try:
             fetch_station_data(icao, start_dt=start_dt, end_dt=now)
         except Exception as e:
@@ -110,7 +109,7 @@ def fetch_sigmet_data():
     }
     
     try:
-        response = requests.get(url, params=params, headers=headers, timeout=30)
+        response = http_session.get(url, params=params, headers=headers, timeout=30)
         if response.status_code != 200:
             logger.error(f"SIGMET fetch failed: {response.status_code}")
             return
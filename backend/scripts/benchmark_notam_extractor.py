@@ -0,0 +1,62 @@
+"""
+Times the rule-table NOTAM extractor in features/notam/extractor.py and
+checks its output against a labelled corpus.
+
+Run from backend/:
+    python scripts/benchmark_notam_extractor.py [CORPUS_JSON] [--repeat N]
+
+CORPUS_JSON defaults to scripts/notam_corpus.json: a list of
+{"name", "text", "expected": [{equipment, status, runways, validity_str}, ...]}.
+Each text is normalised as parser._extract_text normalises PDF text first.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from features.notam.extractor import extract_notams, normalize_text
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'notam_corpus.json')
+FIELDS = ('equipment', 'status', 'runways', 'validity_str')
+
+def mismatches(items, expected):
+    problems = []
+    if len(items) != len(expected):
+        problems.append(f"expected {len(expected)} items, got {len(items)}")
+    for index, (item, want) in enumerate(zip(items, expected)):
+        for field in FIELDS:
+            if field in want and item[field] != want[field]:
+                problems.append(f"item {index} {field}: expected {want[field]!r}, got {item[field]!r}")
+    return problems
+
+def run(corpus_path, repeat):
+    with open(corpus_path) as f:
+        samples = json.load(f)
+
+    total_ms, failed = 0.0, 0
+    for sample in samples:
+        text = normalize_text(sample['text'])
+        start = time.perf_counter()
+        for _ in range(repeat):
+            items = extract_notams(text)
+        elapsed_ms = (time.perf_counter() - start) / repeat * 1000
+        total_ms += elapsed_ms
+
+        problems = mismatches(items, sample.get('expected', []))
+        failed += bool(problems)
+        print(f"{sample['name']:<32} {len(items):2d} items {elapsed_ms:8.3f} ms  {'FAIL' if problems else 'ok'}")
+        for problem in problems:
+            print(f"    {problem}")
+
+    print(f"\n{len(samples) - failed}/{len(samples)} samples correct, {total_ms:.3f} ms total per pass")
+    return failed == 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('corpus', nargs='?', default=DEFAULT_CORPUS)
+    parser.add_argument('--repeat', type=int, default=1000)
+    args = parser.parse_args()
+    sys.exit(0 if run(args.corpus, args.repeat) else 1)
@@ -0,0 +1,88 @@
+"""
+Compares the old full-resolution NL-means preprocessing with the adaptive
+pipeline in features/common/ocr.py on a corpus of uploaded images.
+
+Run from backend/:
+    python scripts/benchmark_ocr_preprocess.py CORPUS_DIR [--repeat N] [--no-ocr]
+
+Every PNG/JPEG in CORPUS_DIR is processed. If <name>.txt exists next to an
+image it is used as ground truth and a character-level similarity is shown.
+"""
+import os
+import re
+import sys
+import glob
+import time
+import argparse
+import difflib
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import cv2
+import pytesseract
+from PIL import Image
+from features.common.ocr import preprocess_image, estimate_noise, downscale_for_ocr
+
+OCR_CONFIG = r'--oem 3 --psm 3'
+
+def legacy_preprocess(filepath):
+    """The pipeline used before adaptive preprocessing."""
+    img = cv2.imread(filepath)
+    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    denoised = cv2.fastNlMeansDenoising(gray, None, 10, 7, 21)
+    _, thresh = cv2.threshold(denoised, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    return Image.fromarray(thresh)
+
+def similarity(text, truth):
+    normalize = lambda t: re.sub(r'\s+', ' ', t).strip().lower()
+    return difflib.SequenceMatcher(None, normalize(text), normalize(truth)).ratio()
+
+def measure(preprocess, path, repeat, run_ocr):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        image = preprocess(path)
+    prep_ms = (time.perf_counter() - start) / repeat * 1000
+
+    text, ocr_ms = None, None
+    if run_ocr:
+        start = time.perf_counter()
+        text = pytesseract.image_to_string(image, config=OCR_CONFIG)
+        ocr_ms = (time.perf_counter() - start) * 1000
+    return prep_ms, ocr_ms, text
+
+def run(corpus, repeat, run_ocr):
+    paths = sorted(p for ext in ('png', 'jpg', 'jpeg') for p in glob.glob(os.path.join(corpus, f'*.{ext}')))
+    if not paths:
+        print(f"No images found in {corpus}")
+        return
+
+    totals = {'legacy': [0.0, 0.0], 'adaptive': [0.0, 0.0]}
+    for path in paths:
+        gray = cv2.imread(path, cv2.IMREAD_GRAYSCALE)
+        sigma = estimate_noise(downscale_for_ocr(gray))
+        truth_path = os.path.splitext(path)[0] + '.txt'
+        truth = open(truth_path).read() if os.path.exists(truth_path) else None
+
+        print(f"\n{os.path.basename(path)} ({gray.shape[1]}x{gray.shape[0]}, noise sigma {sigma:.1f})")
+        for name, preprocess in (('legacy', legacy_preprocess), ('adaptive', preprocess_image)):
+            prep_ms, ocr_ms, text = measure(preprocess, path, repeat, run_ocr)
+            totals[name][0] += prep_ms
+            line = f"  {name:<9} preprocess {prep_ms:9.1f} ms"
+            if ocr_ms is not None:
+                totals[name][1] += ocr_ms
+                line += f"  ocr {ocr_ms:9.1f} ms"
+                if truth is not None:
+                    line += f"  accuracy {similarity(text, truth):.1%}"
+            print(line)
+
+    print("\nTotal")
+    for name, (prep_ms, ocr_ms) in totals.items():
+        print(f"  {name:<9} preprocess {prep_ms:9.1f} ms" + (f"  ocr {ocr_ms:9.1f} ms" if run_ocr else ""))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('corpus')
+    parser.add_argument('--repeat', type=int, default=1)
+    parser.add_argument('--no-ocr', action='store_true', help="time preprocessing only")
+    args = parser.parse_args()
+    run(args.corpus, args.repeat, not args.no_ocr)
@@ -0,0 +1,88 @@
+"""
+Compares full-table and per-cell RVR OCR on stored screenshots.
+
+Run from backend/:
+    python scripts/benchmark_rvr_ocr.py [image.png ...] [--repeat N]
+
+Defaults to every PNG in frontend/static/rvr. If an image has a sidecar
+<name>.expected.json (a list of {"runway", "value", "modifier"} records),
+accuracy against it is reported as well.
+"""
+import os
+import sys
+import glob
+import json
+import time
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from PIL import Image, ImageOps, ImageStat
+from features.dashboard.rvr_ocr import RvrCellReader, TABLE_OCR_CONFIG
+from features.dashboard.rvr_screenshot import _parse_ocr_output, _parse_rvr_row
+import pytesseract
+
+DEFAULT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'frontend', 'static', 'rvr')
+
+def binarise(path):
+    """Same preprocessing as fetch_rvr_screenshot, with dark-theme captures inverted first."""
+    image = Image.open(path).convert('L')
+    if ImageStat.Stat(image).mean[0] < 128:
+        image = ImageOps.invert(image)
+    return image.point(lambda x: 0 if x < 140 else 255, '1')
+
+def full_table(image):
+    return _parse_ocr_output(pytesseract.image_to_string(image, config=TABLE_OCR_CONFIG))
+
+def per_cell(reader):
+    return lambda image: reader.read(image, _parse_rvr_row)
+
+def accuracy(found, expected):
+    key = lambda r: (r['runway'], r['value'], r['modifier'])
+    wanted = {key(r) for r in expected}
+    if not wanted:
+        return None
+    return len(wanted & {key(r) for r in found}) / len(wanted)
+
+def run(paths, repeat):
+    reader = RvrCellReader()
+    methods = [("full-table", full_table), ("per-cell", per_cell(reader))]
+
+    for path in paths:
+        image = binarise(path)
+        expected_path = os.path.splitext(path)[0] + '.expected.json'
+        expected = None
+        if os.path.exists(expected_path):
+            with open(expected_path) as f:
+                expected = json.load(f)
+
+        print(f"\n{os.path.basename(path)} ({image.width}x{image.height})")
+        for name, method in methods:
+            try:
+                start = time.perf_counter()
+                for _ in range(repeat):
+                    data = method(image)
+                elapsed = (time.perf_counter() - start) / repeat
+            except Exception as e:
+                print(f"  {name:<10} failed: {e}")
+                continue
+
+            line = f"  {name:<10} {elapsed * 1000:8.1f} ms  {len(data)} readings"
+            if expected is not None:
+                score = accuracy(data, expected)
+                line += f"  accuracy {score:.0%}" if score is not None else ""
+            print(line)
+            for row in data:
+                print(f"      {row['runway']:<10} {row['modifier'] or '':1}{row['value'] if row['value'] is not None else '---'}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('images', nargs='*')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    paths = args.images or sorted(glob.glob(os.path.join(DEFAULT_DIR, '*.png')))
+    if not paths:
+        print("No screenshots found.")
+        sys.exit(1)
+    run(paths, args.repeat)
@@ -0,0 +1,321 @@
+"""
+Builds the map boundary assets served by /api/map/geo/<file>.
+
+Each GeoJSON source is converted to quantised TopoJSON (delta-encoded
+integer arcs, read on the client with topojson.feature) and written as
+    <name>.<hash>.topojson      identity
+    <name>.<hash>.topojson.gz   gzip -9
+    <name>.<hash>.topojson.br   brotli q11
+where <hash> is taken from the TopoJSON bytes, so the files can be cached
+forever. manifest.json maps each logical name (the source file stem) to its
+current file; files from earlier builds of the same name are removed.
+
+With --lod, each source also gets Visvalingam-simplified levels named
+<name>-lod0 (coarsest) ... <name>-lodN; /api/map/lod/<name> picks one for the
+client's resolution and the full-resolution asset is the finest level.
+
+Run from backend/:
+    python scripts/build_geo_assets.py [SOURCE.geojson ...] [--quantization N] [--out DIR] [--lod [TOL ...]]
+
+SOURCES default to the boundary files named in core/stations.json that exist
+in frontend/static/geojson, i.e. the assets the pages actually load.
+"""
+import os
+import sys
+import glob
+import gzip
+import json
+import heapq
+import hashlib
+import argparse
+
+import brotli
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from core.config import GEOJSON_DIR, GEO_ASSET_DIR, GEO_ASSET_MANIFEST
+from core.stations import station_registry
+
+DEFAULT_QUANTIZATION = 100000
+# Simplified levels are snapped to a coarser grid; their tolerances are far above its step
+LOD_QUANTIZATION = 10000
+# Visvalingam tolerances in degrees, coarsest first (0.02 deg is about 2 km)
+DEFAULT_LOD_TOLERANCES = (0.02, 0.005, 0.001)
+
+class TopologyEncoder:
+    """
+    Minimal GeoJSON -> TopoJSON encoder: one arc per ring or line, no arc
+    sharing. Coordinates are snapped to a quantization x quantization grid
+    over the bounding box and consecutive duplicate points are dropped.
+    """
+
+    def __init__(self, bbox, quantization):
+        x0, y0, x1, y1 = bbox
+        self.kx = (x1 - x0) / (quantization - 1) or 1
+        self.ky = (y1 - y0) / (quantization - 1) or 1
+        self.x0, self.y0 = x0, y0
+        self.arcs = []
+
+    @property
+    def transform(self):
+        return {'scale': [self.kx, self.ky], 'translate': [self.x0, self.y0]}
+
+    def quantize(self, point):
+        return [round((point[0] - self.x0) / self.kx), round((point[1] - self.y0) / self.ky)]
+
+    def arc(self, points):
+        arc, last = [], None
+        for point in points:
+            x, y = self.quantize(point)
+            if last is None:
+                arc.append([x, y])
+            elif (x, y) != last:
+                arc.append([x - last[0], y - last[1]])
+            else:
+                continue
+            last = (x, y)
+        self.arcs.append(arc)
+        return len(self.arcs) - 1
+
+    def geometry(self, geometry):
+        kind = geometry['type']
+        coords = geometry.get('coordinates')
+        if kind == 'GeometryCollection':
+            out = {'type': kind, 'geometries': [self.geometry(g) for g in geometry['geometries']]}
+        elif kind == 'Point':
+            out = {'type': kind, 'coordinates': self.quantize(coords)}
+        elif kind == 'MultiPoint':
+            out = {'type': kind, 'coordinates': [self.quantize(p) for p in coords]}
+        elif kind == 'LineString':
+            out = {'type': kind, 'arcs': [self.arc(coords)]}
+        elif kind == 'MultiLineString':
+            out = {'type': kind, 'arcs': [self.arc(line) for line in coords]}
+        elif kind == 'Polygon':
+            out = {'type': kind, 'arcs': [[self.arc(ring)] for ring in coords]}
+        elif kind == 'MultiPolygon':
+            out = {'type': kind, 'arcs': [[[self.arc(ring)] for ring in polygon] for polygon in coords]}
+        else:
+            raise ValueError(f"Unsupported geometry type: {kind}")
+        return out
+
+def _triangle_area(a, b, c):
+    return abs((b[0] - a[0]) * (c[1] - a[1]) - (c[0] - a[0]) * (b[1] - a[1])) / 2
+
+def _ring_area(ring):
+    return abs(sum(a[0] * b[1] - b[0] * a[1] for a, b in zip(ring, ring[1:]))) / 2
+
+def visvalingam(points, min_area, closed=False):
+    """
+    points without the vertices whose effective area is below min_area
+    (Visvalingam-Whyatt). The end points are always kept, and a closed ring
+    keeps at least four points so it stays a valid ring.
+    """
+    minimum = 4 if closed else 2
+    n = len(points)
+    if n <= minimum:
+        return points
+
+    prev = list(range(-1, n - 1))
+    nxt = list(range(1, n + 1))
+    areas = [float('inf')] * n
+    for i in range(1, n - 1):
+        areas[i] = _triangle_area(points[i - 1], points[i], points[i + 1])
+    heap = [(areas[i], i) for i in range(1, n - 1)]
+    heapq.heapify(heap)
+
+    removed = [False] * n
+    remaining = n
+    while heap and remaining > minimum:
+        area, i = heapq.heappop(heap)
+        if removed[i] or area != areas[i]:
+            continue
+        if area >= min_area:
+            break
+        removed[i] = True
+        remaining -= 1
+        before, after = prev[i], nxt[i]
+        nxt[before], prev[after] = after, before
+        for j in (before, after):
+            if 0 < j < n - 1:
+                # Never below the area just removed, so removal order follows effective area
+                areas[j] = max(_triangle_area(points[prev[j]], points[j], points[nxt[j]]), area)
+                heapq.heappush(heap, (areas[j], j))
+
+    return [point for point, dropped in zip(points, removed) if not dropped]
+
+def _simplify_polygon(rings, min_area):
+    """Outer ring always kept; holes smaller than min_area are dropped."""
+    outer = visvalingam(rings[0], min_area, closed=True)
+    holes = [visvalingam(ring, min_area, closed=True) for ring in rings[1:] if _ring_area(ring) >= min_area]
+    return [outer] + holes
+
+def simplify_geometry(geometry, tolerance):
+    """
+    geometry simplified with min_area = tolerance ** 2 (tolerance in degrees).
+    MultiPolygon parts smaller than that are dropped, keeping at least the largest.
+    """
+    min_area = tolerance ** 2
+    kind = geometry['type']
+    coords = geometry.get('coordinates')
+    if kind == 'GeometryCollection':
+        return {'type': kind, 'geometries': [simplify_geometry(g, tolerance) for g in geometry['geometries']]}
+    if kind == 'LineString':
+        return {'type': kind, 'coordinates': visvalingam(coords, min_area)}
+    if kind == 'MultiLineString':
+        return {'type': kind, 'coordinates': [visvalingam(line, min_area) for line in coords]}
+    if kind == 'Polygon':
+        return {'type': kind, 'coordinates': _simplify_polygon(coords, min_area)}
+    if kind == 'MultiPolygon':
+        parts = [polygon for polygon in coords if _ring_area(polygon[0]) >= min_area]
+        if not parts:
+            parts = [max(coords, key=lambda polygon: _ring_area(polygon[0]))]
+        return {'type': kind, 'coordinates': [_simplify_polygon(polygon, min_area) for polygon in parts]}
+    return geometry
+
+def simplify(geojson, tolerance):
+    """Copy of geojson (any of FeatureCollection, Feature, geometry) with every geometry simplified."""
+    features = [dict(f, geometry=simplify_geometry(f['geometry'], tolerance)) if f.get('geometry') else f
+                for f in _features(geojson)]
+    return {'type': 'FeatureCollection', 'features': features}
+
+def _points(geometry):
+    if geometry['type'] == 'GeometryCollection':
+        for child in geometry['geometries']:
+            yield from _points(child)
+        return
+
+    def walk(coords):
+        if coords and isinstance(coords[0], (int, float)):
+            yield coords
+        else:
+            for child in coords:
+                yield from walk(child)
+    yield from walk(geometry['coordinates'])
+
+def _features(geojson):
+    if geojson['type'] == 'FeatureCollection':
+        return geojson['features']
+    if geojson['type'] == 'Feature':
+        return [geojson]
+    return [{'type': 'Feature', 'properties': {}, 'geometry': geojson}]
+
+def to_topology(name, geojson, quantization=DEFAULT_QUANTIZATION):
+    """TopoJSON dict with a single GeometryCollection object called name."""
+    features = [f for f in _features(geojson) if f.get('geometry')]
+    xs, ys = [], []
+    for feature in features:
+        for point in _points(feature['geometry']):
+            xs.append(point[0])
+            ys.append(point[1])
+    bbox = [min(xs), min(ys), max(xs), max(ys)]
+
+    encoder = TopologyEncoder(bbox, quantization)
+    geometries = []
+    for feature in features:
+        geometry = encoder.geometry(feature['geometry'])
+        if feature.get('id') is not None:
+            geometry['id'] = feature['id']
+        if feature.get('properties'):
+            geometry['properties'] = feature['properties']
+        geometries.append(geometry)
+
+    return {
+        'type': 'Topology',
+        'bbox': bbox,
+        'transform': encoder.transform,
+        'objects': {name: {'type': 'GeometryCollection', 'geometries': geometries}},
+        'arcs': encoder.arcs
+    }
+
+def write_asset(out_dir, name, payload):
+    """Writes the identity, gzip and brotli variants of payload; returns its manifest entry."""
+    digest = hashlib.sha256(payload).hexdigest()[:10]
+    filename = f"{name}.{digest}.topojson"
+    variants = {
+        filename: payload,
+        filename + '.gz': gzip.compress(payload, compresslevel=9, mtime=0),
+        filename + '.br': brotli.compress(payload, quality=11)
+    }
+    for variant, data in variants.items():
+        with open(os.path.join(out_dir, variant), 'wb') as f:
+            f.write(data)
+
+    return {
+        'file': filename,
+        'bytes': len(payload),
+        'gzip_bytes': len(variants[filename + '.gz']),
+        'br_bytes': len(variants[filename + '.br'])
+    }
+
+def remove_stale(out_dir, name, keep=None):
+    """Removes the files built for name, except those of the file keep."""
+    for path in glob.glob(os.path.join(out_dir, f"{glob.escape(name)}.*.topojson*")):
+        if keep is None or not os.path.basename(path).startswith(keep):
+            os.remove(path)
+
+def _write_topology(out_dir, manifest, name, asset_name, geojson, quantization, source):
+    topology = to_topology(name, geojson, quantization)
+    payload = json.dumps(topology, separators=(',', ':')).encode('utf-8')
+    entry = write_asset(out_dir, asset_name, payload)
+    entry['source'] = os.path.basename(source)
+    remove_stale(out_dir, asset_name, entry['file'])
+    manifest[asset_name] = entry
+
+    print(f"{asset_name:<28} {os.path.getsize(source) / 1024:9.1f} KB geojson -> "
+          f"{entry['bytes'] / 1024:8.1f} KB topojson, {entry['gzip_bytes'] / 1024:7.1f} KB gz, "
+          f"{entry['br_bytes'] / 1024:7.1f} KB br  ({entry['file']})")
+    return entry
+
+def build_levels(out_dir, manifest, name, geojson, tolerances, source):
+    """
+    Writes <name>-lod<i> for each tolerance (coarsest first) and marks the
+    full-resolution <name> entry as the finest level. Levels left over from a
+    build with more tolerances are removed.
+    """
+    tolerances = sorted(tolerances, reverse=True)
+    for level, tolerance in enumerate(tolerances):
+        entry = _write_topology(out_dir, manifest, name, f"{name}-lod{level}",
+                                simplify(geojson, tolerance), LOD_QUANTIZATION, source)
+        entry.update(lod_of=name, level=level, tolerance=tolerance)
+    manifest[name].update(lod_of=name, level=len(tolerances), tolerance=0)
+
+    for asset_name, entry in list(manifest.items()):
+        if entry.get('lod_of') == name and asset_name != name and entry['level'] >= len(tolerances):
+            remove_stale(out_dir, asset_name)
+            del manifest[asset_name]
+
+def build(sources, out_dir, quantization, tolerances=()):
+    os.makedirs(out_dir, exist_ok=True)
+    manifest_path = os.path.join(out_dir, os.path.basename(GEO_ASSET_MANIFEST))
+    manifest = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+
+    for source in sources:
+        name = os.path.splitext(os.path.basename(source))[0]
+        with open(source) as f:
+            geojson = json.load(f)
+
+        _write_topology(out_dir, manifest, name, name, geojson, quantization, source)
+        if tolerances:
+            build_levels(out_dir, manifest, name, geojson, tolerances, source)
+
+    with open(manifest_path, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    print(f"Wrote {manifest_path}")
+
+def default_sources():
+    paths = {os.path.join(GEOJSON_DIR, os.path.basename(boundary)) for boundary in station_registry.state_boundaries.values()}
+    return sorted(path for path in paths if os.path.exists(path))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('sources', nargs='*')
+    parser.add_argument('--quantization', type=int, default=DEFAULT_QUANTIZATION)
+    parser.add_argument('--out', default=GEO_ASSET_DIR)
+    parser.add_argument('--lod', nargs='*', type=float, metavar='TOL',
+                        help=f"build simplified levels (default tolerances: {' '.join(map(str, DEFAULT_LOD_TOLERANCES))})")
+    args = parser.parse_args()
+    tolerances = (args.lod or DEFAULT_LOD_TOLERANCES) if args.lod is not None else ()
+    build(args.sources or default_sources(), args.out, args.quantization, tolerances)
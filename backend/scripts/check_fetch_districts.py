@@ -0,0 +1,85 @@
+"""
+Checks the streaming district extraction in scripts/fetch_districts.py
+against local GeoJSON files.
+
+Run from backend/:
+    python scripts/check_fetch_districts.py [GEOJSON ...]
+
+GEOJSON defaults to every scripts/fixtures/districts_*.geojson. Each file is
+streamed with FeatureStream at several chunk sizes (down to one character,
+so numbers, strings and keys are split at every position) and must give the
+same features as json.load. extract_districts is then run on the file for
+every state it names plus one it does not, and each written file must hold
+exactly that state's features.
+"""
+import os
+import sys
+import glob
+import json
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from fetch_districts import FeatureStream, read_chunks, extract_districts, state_output_path, STATE_PROPERTY
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+CHUNK_SIZES = (1, 2, 3, 7, 64, 64 * 1024)
+ABSENT_STATE = "No Such State"
+
+def _state(feature):
+    value = (feature.get('properties') or {}).get(STATE_PROPERTY)
+    return value.strip().lower() if isinstance(value, str) else None
+
+def check(path):
+    with open(path, encoding='utf-8') as f:
+        expected = json.load(f)['features']
+
+    problems = []
+    for size in CHUNK_SIZES:
+        try:
+            found = list(FeatureStream(read_chunks(path, size)))
+        except ValueError as e:
+            problems.append(f"chunk size {size}: {e}")
+            continue
+        if found != expected:
+            problems.append(f"chunk size {size}: expected {len(expected)} features, got {len(found)}")
+
+    states = sorted({feature['properties'][STATE_PROPERTY].strip()
+                     for feature in expected if _state(feature)})
+    out_dir = tempfile.mkdtemp()
+    try:
+        written = extract_districts(path, states + [ABSENT_STATE], output_dir=out_dir)
+        for state in states:
+            want = [feature for feature in expected if _state(feature) == state.lower()]
+            if state not in written:
+                problems.append(f"{state}: no file written, expected {len(want)} features")
+                continue
+            with open(written[state]) as f:
+                got = json.load(f)['features']
+            if got != want:
+                problems.append(f"{state}: expected {len(want)} features, got {len(got)}")
+        if ABSENT_STATE in written or os.path.exists(state_output_path(ABSENT_STATE, out_dir)):
+            problems.append(f"a file was written for {ABSENT_STATE!r}, which has no features")
+    finally:
+        shutil.rmtree(out_dir)
+    return problems
+
+def run(paths):
+    failed = 0
+    for path in paths:
+        problems = check(path)
+        failed += bool(problems)
+        print(f"{os.path.basename(path):<32} {'FAIL' if problems else 'ok'}")
+        for problem in problems:
+            print(f"    {problem}")
+
+    print(f"\n{len(paths) - failed}/{len(paths)} files correct")
+    return failed == 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('files', nargs='*')
+    args = parser.parse_args()
+    sys.exit(0 if run(args.files or sorted(glob.glob(os.path.join(FIXTURE_DIR, 'districts_*.geojson')))) else 1)
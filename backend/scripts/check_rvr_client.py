@@ -0,0 +1,68 @@
+"""
+Checks the HTTP RVR parser in features/dashboard/rvr_client.py against saved
+copies of the live RVR page.
+
+Run from backend/:
+    python scripts/check_rvr_client.py [PAGE.html ...]
+
+PAGES default to every scripts/fixtures/rvr_*.html. Each page needs a sidecar
+<name>.expected.json with the records expected for RVR_AIRPORT_FILTER. Every
+page is also parsed with a filter that names no airport on it, which must
+give no records so fetch_live_rvr falls through to the screenshot tier.
+"""
+import os
+import sys
+import glob
+import json
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from features.dashboard import rvr_client
+from features.dashboard.rvr_client import _rows_from_html, parse_rvr_rows
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+ABSENT_AIRPORT = "No Such Airport"
+
+def check(path):
+    with open(path) as f:
+        rows = _rows_from_html(f.read())
+    with open(os.path.splitext(path)[0] + '.expected.json') as f:
+        expected = json.load(f)
+
+    problems = []
+    found = parse_rvr_rows(rows)
+    if found != expected:
+        problems.append(f"expected {len(expected)} records, got {len(found)}")
+        for want, got in zip(expected, found):
+            if want != got:
+                problems.append(f"first difference: expected {want}, got {got}")
+                break
+
+    default_filter = rvr_client.RVR_AIRPORT_FILTER
+    rvr_client.RVR_AIRPORT_FILTER = ABSENT_AIRPORT
+    try:
+        other = parse_rvr_rows(rows)
+    finally:
+        rvr_client.RVR_AIRPORT_FILTER = default_filter
+    if other:
+        problems.append(f"{len(other)} records for an airport not on the page; expected none")
+    return problems
+
+def run(paths):
+    failed = 0
+    for path in paths:
+        problems = check(path)
+        failed += bool(problems)
+        print(f"{os.path.basename(path):<32} {'FAIL' if problems else 'ok'}")
+        for problem in problems:
+            print(f"    {problem}")
+
+    print(f"\n{len(paths) - failed}/{len(paths)} pages correct")
+    return failed == 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('pages', nargs='*')
+    args = parser.parse_args()
+    sys.exit(0 if run(args.pages or sorted(glob.glob(os.path.join(FIXTURE_DIR, 'rvr_*.html')))) else 1)
@@ -1,60 +1,233 @@
+"""
+Extracts the districts of each state the stations need from the all-India
+district GeoJSON and builds the map assets for them: the full-resolution
+TopoJSON plus Visvalingam-simplified levels of detail (see build_geo_assets.py).
+
+The source is parsed one feature at a time and every state is written in the
+same pass, so memory stays at about one feature whatever the source size.
+Features are matched on an explicit state property (NAME_1 in the geohacker
+data), not on any property that happens to contain the state name.
+
+Run from backend/:
+    python scripts/fetch_districts.py [--source URL_OR_PATH] [--states NAME ...]
+                                      [--state-property KEY] [--output-dir DIR] [--asset-dir DIR]
+                                      [--lod TOL ...] [--no-lod]
+
+States default to those in core/stations.json; each is written to
+frontend/static/geojson/<state>_districts.geojson (e.g. madhya_pradesh_districts.geojson).
+"""
 import requests
+import codecs
 import json
 import os
+import re
+import sys
+import argparse
 
-def download_and_extract_districts():
-    url = "https://raw.githubusercontent.com/geohacker/india/master/district/india_district.geojson"
-    print(f"Downloading from {url}...")
-    
-    try:
-        response = requests.get(url)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from core.config import GEOJSON_DIR, GEO_ASSET_DIR
+from core.stations import station_registry
+from build_geo_assets import build, DEFAULT_QUANTIZATION, DEFAULT_LOD_TOLERANCES
+
+DISTRICTS_URL = "https://raw.githubusercontent.com/geohacker/india/master/district/india_district.geojson"
+STATE_PROPERTY = 'NAME_1'
+CHUNK_SIZE = 64 * 1024
+
+def read_chunks(source, chunk_size=CHUNK_SIZE):
+    """Text chunks of a local file or a URL, without holding the whole body."""
+    if os.path.exists(source):
+        print(f"Reading {source}...")
+        with open(source, encoding='utf-8') as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+
+    print(f"Downloading from {source}...")
+    with requests.get(source, stream=True) as response:
         response.raise_for_status()
-        data = response.json()
-        
-        print("Download complete. Analyzing data...")
-        
-        if 'features' not in data:
-            print("Error: No 'features' key in GeoJSON")
-            return
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        for block in response.iter_content(chunk_size):
+            yield decoder.decode(block)
+        yield decoder.decode(b'', final=True)
+
+class FeatureStream:
+    """
+    Yields the members of a FeatureCollection's "features" array one at a
+    time. Only the current feature (and any top-level value before the array)
+    is ever buffered; everything after the array is not read.
+    """
+
+    WHITESPACE = re.compile(r'\s*')
+    # What may follow a complete number; anything else may be the rest of it in the next chunk
+    NUMBER_DELIMITERS = frozenset(',}] \t\r\n')
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._decoder = json.JSONDecoder()
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self):
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def _skip_whitespace(self):
+        while True:
+            self._pos = self.WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer) or not self._fill():
+                return
+
+    def _peek(self):
+        self._skip_whitespace()
+        if self._pos >= len(self._buffer):
+            raise ValueError("Unexpected end of GeoJSON")
+        return self._buffer[self._pos]
+
+    def _expect(self, char):
+        if self._peek() != char:
+            raise ValueError(f"Expected {char!r} at {self._buffer[self._pos:self._pos + 40]!r}")
+        self._pos += 1
 
-        if len(data['features']) > 0:
-            print("First feature properties:", data['features'][0]['properties'])
-        
-        maharashtra_features = []
-
-        for feature in data['features']:
-            props = feature['properties']
-            
-            is_maharashtra = False
-            for key, value in props.items():
-                if isinstance(value, str) and 'Maharashtra' in value:
-                    is_maharashtra = True
-                    break
-            
-            if is_maharashtra:
-                maharashtra_features.append(feature)
-        
-        print(f"Found {len(maharashtra_features)} district features for Maharashtra.")
-        
-        if len(maharashtra_features) == 0:
-            print("Error: No Maharashtra features found.")
+    def _complete(self, value, end):
+        """
+        Whether a decoded value cannot continue in the next chunk. Only a number
+        can: "-1.5e3" split after "-1." decodes as -1, so a number counts only
+        when a delimiter follows it (or the input has ended).
+        """
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return True
+        if end < len(self._buffer):
+            return self._buffer[end] in self.NUMBER_DELIMITERS
+        return self._eof
+
+    def _value(self):
+        """
+        The next complete JSON value. Until it parses, the pending text is at
+        least doubled before each retry, so a large feature costs a few parses
+        rather than one per chunk.
+        """
+        self._skip_whitespace()
+        while True:
+            tried = len(self._buffer) - self._pos
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+                if self._complete(value, end) or self._eof:
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            while self._fill() and len(self._buffer) - self._pos < 2 * tried:
+                pass
+
+    def __iter__(self):
+        self._expect('{')
+        while self._peek() != '}':
+            key = self._value()
+            self._expect(':')
+            if key != 'features':
+                self._value()
+                if self._peek() == ',':
+                    self._pos += 1
+                continue
+
+            self._expect('[')
+            while self._peek() != ']':
+                yield self._value()
+                if self._peek() == ',':
+                    self._pos += 1
             return
+        raise ValueError("No 'features' key in GeoJSON")
+
+class StateWriter:
+    """A FeatureCollection written one feature at a time; the file is created on the first feature."""
+
+    def __init__(self, path):
+        self.path = path
+        self.count = 0
+        self._file = None
+
+    def write(self, feature):
+        if self._file is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._file = open(self.path, 'w')
+            self._file.write('{"type": "FeatureCollection", "features": [')
+        elif self.count:
+            self._file.write(', ')
+        self._file.write(json.dumps(feature))
+        self.count += 1
+
+    def close(self):
+        if self._file is not None:
+            self._file.write(']}')
+            self._file.close()
+
+def state_output_path(state, output_dir=GEOJSON_DIR):
+    slug = re.sub(r'[^a-z0-9]+', '_', state.lower()).strip('_')
+    return os.path.join(output_dir, f"{slug}_districts.geojson")
 
-        output_geojson = {
-            "type": "FeatureCollection",
-            "features": maharashtra_features
-        }
-        
-        output_path = "static/geojson/maharashtra_districts.geojson"
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
-        
-        with open(output_path, 'w') as f:
-            json.dump(output_geojson, f)
-            
-        print(f"Saved extracted Maharashtra districts to {output_path}")
+def extract_districts(source=DISTRICTS_URL, states=None, state_property=STATE_PROPERTY, output_dir=GEOJSON_DIR):
+    """
+    Writes the features of each state in states (matched case-insensitively on
+    state_property) to its own file in a single pass over source.
+    Returns {state: path} for the states that had features.
+    """
+    states = sorted(states or station_registry.required_states)
+    writers = {state.strip().lower(): StateWriter(state_output_path(state, output_dir)) for state in states}
 
+    try:
+        seen = 0
+        for feature in FeatureStream(read_chunks(source)):
+            if seen == 0:
+                print("First feature properties:", feature.get('properties'))
+            seen += 1
+            value = (feature.get('properties') or {}).get(state_property)
+            writer = writers.get(value.strip().lower()) if isinstance(value, str) else None
+            if writer is not None:
+                writer.write(feature)
+    finally:
+        for writer in writers.values():
+            writer.close()
+
+    print(f"Read {seen} features.")
+    written = {}
+    for state in states:
+        writer = writers[state.strip().lower()]
+        if writer.count:
+            print(f"Saved {writer.count} district features for {state} to {writer.path}")
+            written[state] = writer.path
+        else:
+            print(f"Warning: no features with {state_property} == {state!r}")
+    return written
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--source', default=DISTRICTS_URL, help="URL or local path of the all-India district GeoJSON")
+    parser.add_argument('--states', nargs='+', help="state names (default: the states in core/stations.json)")
+    parser.add_argument('--state-property', default=STATE_PROPERTY, help="feature property holding the state name")
+    parser.add_argument('--output-dir', default=GEOJSON_DIR)
+    parser.add_argument('--asset-dir', default=GEO_ASSET_DIR, help="where the TopoJSON assets and manifest go")
+    parser.add_argument('--lod', nargs='+', type=float, default=DEFAULT_LOD_TOLERANCES, metavar='TOL',
+                        help="Visvalingam tolerances in degrees, any order")
+    parser.add_argument('--no-lod', action='store_true', help="only build the full-resolution assets")
+    args = parser.parse_args()
+
+    try:
+        written = extract_districts(args.source, args.states, args.state_property, args.output_dir)
     except Exception as e:
         print(f"An error occurred: {e}")
+        sys.exit(1)
 
-if __name__ == "__main__":
-    download_and_extract_districts()
+    if not written:
+        print("Error: No district features found.")
+        sys.exit(1)
+    build(list(written.values()), args.asset_dir, DEFAULT_QUANTIZATION, () if args.no_lod else args.lod)
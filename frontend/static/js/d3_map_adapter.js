@@ -20,6 +20,7 @@
         if (window.D3MapCore && typeof window.D3MapCore.init === 'function') {
             window.D3MapCore.init('#d3-map-svg', airportData, {
                 geojsonUrl: window.IMD_GEOJSON_URL || '/static/geojson/india_state.geojson',
+                lodUrl: window.IMD_GEO_LOD_URL,
                 showFIR: true,
 
                 onAirportClick: function (airport) {
@@ -17,6 +17,11 @@ window.D3MapCore = (function () {
     let cachedPath2D = null;
     let currentTransform = d3.zoomIdentity;
 
+    // Levels of detail from config.lodUrl, coarsest first; each level is fetched once.
+    let boundaryLayer, boundaryPath;
+    let lodLevels = null, lodCurrent = null;
+    const geometryCache = {};
+
     const FIR_DATA = {
         mumbai: {
             type: "Feature",
@@ -67,12 +72,20 @@ window.D3MapCore = (function () {
 
         const path = d3.geoPath().projection(mainProjection);
 
+        const initialZoom = 2.5;
+
         try {
-            const url = config.geojsonUrl || '/static/geojson/india_state.geojson';
+            let url = config.geojsonUrl || '/static/geojson/india_state.geojson';
+            if (config.lodUrl) {
+                // First paint only needs the coarsest level fine enough for the initial zoom
+                lodLevels = await loadLevels(config.lodUrl);
+                if (lodLevels) {
+                    lodCurrent = pickLevel(initialZoom);
+                    url = lodCurrent.url;
+                }
+            }
             console.log('[D3 Map] Fetching GeoJSON from:', url);
-            const response = await fetch(url);
-            if (!response.ok) throw new Error(`GeoJSON fetch failed: ${response.status}`);
-            const geoData = await response.json();
+            const geoData = await loadGeometry(url);
             console.log('[D3 Map] GeoJSON loaded, features:', geoData.features ? geoData.features.length : 0);
 
             const zoomLayer = mainSvg.append("g").attr("id", "zoom-container");
@@ -103,14 +116,14 @@ window.D3MapCore = (function () {
 
                     scheduleDraw();
                 })
-                .on("end", () => {
+                .on("end", (event) => {
                     d3.select(".d3-map-scoped").classed("is-zooming", false);
+                    if (lodLevels) switchLevel(event.transform.k);
                 });
 
             canvas.call(zoom);
             console.log('[D3 Map] Zoom behavior attached to Canvas');
 
-            const initialZoom = 2.5;
             const centerX = width / 2;
             const centerY = height / 2;
             const transform = d3.zoomIdentity
@@ -155,6 +168,64 @@ window.D3MapCore = (function () {
         }
     }
 
+    // The built assets are TopoJSON (scripts/build_geo_assets.py); plain GeoJSON passes through.
+    function toFeatureCollection(data) {
+        if (data.type !== 'Topology') return data;
+        const name = Object.keys(data.objects)[0];
+        return topojson.feature(data, data.objects[name]);
+    }
+
+    async function loadLevels(url) {
+        try {
+            const response = await fetch(url);
+            if (!response.ok) throw new Error(`Level list fetch failed: ${response.status}`);
+            const levels = (await response.json()).levels;
+            return levels && levels.length ? levels : null;
+        } catch (error) {
+            console.warn('[D3 Map] Levels of detail unavailable, using the full geometry:', error);
+            return null;
+        }
+    }
+
+    function loadGeometry(url) {
+        if (!geometryCache[url]) {
+            geometryCache[url] = fetch(url)
+                .then(response => {
+                    if (!response.ok) throw new Error(`GeoJSON fetch failed: ${response.status}`);
+                    return response.json();
+                })
+                .then(toFeatureCollection)
+                .catch(error => {
+                    delete geometryCache[url];
+                    throw error;
+                });
+        }
+        return geometryCache[url];
+    }
+
+    // Degrees of longitude per device pixel at zoom k (the API's "resolution")
+    function degreesPerPixel(k) {
+        return 180 / Math.PI / (mainProjection.scale() * k * (window.devicePixelRatio || 1));
+    }
+
+    function pickLevel(k) {
+        const resolution = degreesPerPixel(k);
+        return lodLevels.find(level => level.tolerance <= resolution) || lodLevels[lodLevels.length - 1];
+    }
+
+    async function switchLevel(k) {
+        const level = pickLevel(k);
+        if (level === lodCurrent) return;
+        lodCurrent = level;
+        try {
+            const geoData = await loadGeometry(level.url);
+            // A later zoom may have picked another level while this one loaded
+            if (level === lodCurrent) renderBoundaries(geoData);
+        } catch (error) {
+            console.error('[D3 Map] Level switch failed:', error);
+        }
+    }
+
     function setupCanvasLayer(w, h) {
         const container = d3.select(mainSvg.node().parentNode);
 
@@ -377,12 +448,9 @@ window.D3MapCore = (function () {
     }
 
     function renderLayer(target, geoData, geoPath) {
-        target.selectAll(".state-color")
-            .data(geoData.features)
-            .enter()
-            .append("path")
-            .attr("d", geoPath)
-            .attr("class", "state-color muted");
+        boundaryLayer = target.append("g").attr("class", "boundary-layer");
+        boundaryPath = geoPath;
+        renderBoundaries(geoData);
 
         if (config.showFIR !== false) {
             target.append("path")
@@ -398,6 +466,15 @@ window.D3MapCore = (function () {
             .attr("d", geoPath);
     }
 
+    function renderBoundaries(geoData) {
+        if (!boundaryLayer) return;
+        boundaryLayer.selectAll(".state-color")
+            .data(geoData.features)
+            .join("path")
+            .attr("d", boundaryPath)
+            .attr("class", "state-color muted");
+    }
+
     function handleAirportClick(airport) {
         console.log('Airport clicked:', airport.code);
         selectedAirportCode = airport.code;
@@ -467,7 +544,7 @@ window.D3MapCore = (function () {
 
     async function fetchActiveWarnings() {
         try {
-            const response = await fetch('/api/warnings/active');
+            const response = await fetch('/api/warnings/latest');
             const result = await response.json();
 
             if (result.success) {
@@ -0,0 +1,51 @@
+// Lazy-loads further pages of a server-rendered list as it scrolls into view.
+// Markup: <div class="lazy-list-more" data-url="/api/news" data-target="news-list" data-next="CURSOR"></div>
+// The endpoint answers ?before=CURSOR&format=html with {html, next}; html is appended to #data-target.
+
+function initLazyLists(root) {
+    (root || document).querySelectorAll('.lazy-list-more').forEach(sentinel => {
+        if (!sentinel.dataset.next) {
+            sentinel.remove();
+            return;
+        }
+
+        let loading = false;
+        const observer = new IntersectionObserver(async entries => {
+            if (loading || !entries.some(entry => entry.isIntersecting)) return;
+            loading = true;
+            try {
+                const url = new URL(sentinel.dataset.url, window.location.origin);
+                url.searchParams.set('format', 'html');
+                url.searchParams.set('before', sentinel.dataset.next);
+
+                const response = await fetch(url);
+                if (!response.ok) {
+                    // A rejected cursor or server error will not succeed on retry; stop loading.
+                    console.error(`Lazy list load failed: HTTP ${response.status}`);
+                    observer.disconnect();
+                    sentinel.remove();
+                    return;
+                }
+                const data = await response.json();
+                document.getElementById(sentinel.dataset.target).insertAdjacentHTML('beforeend', data.html);
+
+                if (data.next) {
+                    sentinel.dataset.next = data.next;
+                    // Re-observe so a sentinel that is still visible triggers the next page.
+                    observer.unobserve(sentinel);
+                    observer.observe(sentinel);
+                } else {
+                    observer.disconnect();
+                    sentinel.remove();
+                }
+            } catch (err) {
+                console.error('Lazy list load failed', err);
+            }
+            loading = false;
+        }, { rootMargin: '200px' });
+
+        observer.observe(sentinel);
+    });
+}
+
+document.addEventListener('DOMContentLoaded', () => initLazyLists());